@@ -0,0 +1,62 @@
+"""normalized task assignees
+
+Revision ID: 3c8f1d52a6b7
+Revises: 9a41c6e8d275
+Create Date: 2025-06-12 10:21:44.083617
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c8f1d52a6b7'
+down_revision: Union[str, None] = '9a41c6e8d275'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'task_assignees',
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('role', sa.String(length=32), nullable=True),
+        sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('task_id', 'user_id'),
+    )
+    op.create_index('ix_task_assignees_user_id', 'task_assignees', ['user_id', 'task_id'], unique=False)
+
+    # Заполнение из tasks.assignees: элементы с целым user_id существующего пользователя
+    # (как clean_assignees); при повторе user_id в задаче берётся первая роль.
+    # Приведения — только внутри CASE: порядок проверок в WHERE/JOIN планировщик не гарантирует,
+    # и ::int или jsonb_array_elements на неподходящем значении оборвали бы миграцию
+    op.execute("""
+        WITH elements AS (
+            SELECT t.id AS task_id, e.n, left(e.a ->> 'role', 32) AS role,
+                   CASE WHEN jsonb_typeof(e.a) = 'object'
+                         AND jsonb_typeof(e.a -> 'user_id') = 'number'
+                         AND (e.a ->> 'user_id') ~ '^[0-9]{1,9}$'
+                        THEN (e.a ->> 'user_id')::int
+                   END AS user_id
+            FROM tasks AS t
+            CROSS JOIN LATERAL jsonb_array_elements(
+                CASE WHEN jsonb_typeof(t.assignees) = 'array' THEN t.assignees ELSE '[]'::jsonb END
+            ) WITH ORDINALITY AS e(a, n)
+        )
+        INSERT INTO task_assignees (task_id, user_id, role)
+        SELECT DISTINCT ON (el.task_id, el.user_id) el.task_id, el.user_id, el.role
+        FROM elements AS el
+        JOIN users AS u ON u.id = el.user_id
+        ORDER BY el.task_id, el.user_id, el.n
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_assignees_user_id', table_name='task_assignees')
+    op.drop_table('task_assignees')
@@ -0,0 +1,43 @@
+"""indexes for the remaining list sort keys
+
+Revision ID: 4f6a0d2c8e15
+Revises: 7e2a4c9b15d3
+Create Date: 2025-06-19 11:42:08.530217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f6a0d2c8e15'
+down_revision: Union[str, None] = '7e2a4c9b15d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+LIVE = sa.text('is_deleted = false')
+CREATED_AT_DESC = [sa.text('created_at DESC NULLS LAST'), sa.text('id DESC')]
+
+# name: (table, columns, только живые строки) — порядок колонок как в FilterSpec.order_by
+SORT_INDEXES = {
+    'ix_projects_live_priority': ('projects', ['priority', 'id'], True),
+    'ix_templates_created_at': ('templates', CREATED_AT_DESC, False),
+    'ix_users_created_at': ('users', CREATED_AT_DESC, False),
+    # Список ai_contexts не отсекает is_deleted — индекс полный
+    'ix_ai_contexts_created_at': ('ai_contexts', CREATED_AT_DESC, False),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, (table, columns, live_only) in SORT_INDEXES.items():
+        op.create_index(name, table, columns, unique=False, postgresql_where=LIVE if live_only else None)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, (table, _, _) in reversed(list(SORT_INDEXES.items())):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,53 @@
+"""unique external ids for upsert
+
+Revision ID: 5b7e2c91d4a3
+Revises: 09d45f7b1801
+Create Date: 2025-06-02 10:12:41.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e2c91d4a3'
+down_revision: Union[str, None] = '09d45f7b1801'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _check_duplicates(table: str) -> None:
+    # Уникальный индекс не создастся поверх дублей — останавливаемся с понятным сообщением
+    # до DDL; какую из строк оставить связанной с внешней системой, решает человек
+    rows = op.get_bind().execute(sa.text(
+        f"SELECT external_id, count(*) FROM {table} WHERE external_id IS NOT NULL "
+        f"GROUP BY external_id HAVING count(*) > 1 ORDER BY external_id LIMIT 20"
+    )).all()
+    if rows:
+        listed = ', '.join(f"'{external_id}' x{count}" for external_id, count in rows)
+        raise RuntimeError(
+            f"{table}.external_id has duplicates: {listed}. "
+            f"Clear or change them (UPDATE {table} SET external_id = NULL WHERE id = ...) and rerun the migration."
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # INSERT ... ON CONFLICT (external_id) требует уникального индекса.
+    # NULL в уникальном индексе допускается многократно.
+    _check_duplicates('tasks')
+    _check_duplicates('projects')
+    op.drop_index('ix_tasks_external_id', table_name='tasks')
+    op.create_index('ix_tasks_external_id', 'tasks', ['external_id'], unique=True)
+    op.drop_index('ix_projects_external_id', table_name='projects')
+    op.create_index('ix_projects_external_id', 'projects', ['external_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_projects_external_id', table_name='projects')
+    op.create_index('ix_projects_external_id', 'projects', ['external_id'], unique=False)
+    op.drop_index('ix_tasks_external_id', table_name='tasks')
+    op.create_index('ix_tasks_external_id', 'tasks', ['external_id'], unique=False)
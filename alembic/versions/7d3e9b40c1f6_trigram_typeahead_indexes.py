@@ -0,0 +1,44 @@
+"""pg_trgm indexes for typeahead
+
+Revision ID: 7d3e9b40c1f6
+Revises: f2c7a5d1e903
+Create Date: 2025-06-10 09:15:03.774120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d3e9b40c1f6'
+down_revision: Union[str, None] = 'f2c7a5d1e903'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index, table, column, только живые строки)
+TRGM_INDEXES = [
+    ('ix_tasks_live_title_trgm', 'tasks', 'title', True),
+    ('ix_projects_live_name_trgm', 'projects', 'name', True),
+    ('ix_users_username_trgm', 'users', 'username', False),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, table, column, live_only in TRGM_INDEXES:
+        op.create_index(
+            name, table, [column], unique=False,
+            postgresql_using='gin',
+            postgresql_ops={column: 'gin_trgm_ops'},
+            postgresql_where=sa.text('is_deleted = false') if live_only else None,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _, _ in reversed(TRGM_INDEXES):
+        op.drop_index(name, table_name=table)
+    # Расширение не удаляем: им могут пользоваться другие объекты
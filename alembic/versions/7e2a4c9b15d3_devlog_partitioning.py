@@ -0,0 +1,150 @@
+"""monthly partitioning of devlog_entries
+
+Revision ID: 7e2a4c9b15d3
+Revises: d58a2e1c7b94
+Create Date: 2025-06-17 09:26:44.118032
+
+"""
+from datetime import date, datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e2a4c9b15d3'
+down_revision: Union[str, None] = 'd58a2e1c7b94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Копия app.services.devlog_partitions на момент миграции
+ENTRY_TYPES = ('action', 'note', 'decision', 'meeting')
+OTHER_TYPE = 'other'
+PRECREATE_MONTHS = 3
+ARCHIVE_SCHEMA = 'devlog_archive'
+
+COLUMNS = (
+    'id', 'project_id', 'task_id', 'entry_type', 'content', 'author', 'tags', 'custom_fields',
+    'edited_by', 'edit_reason', 'attachments', 'ai_notes', 'created_at', 'updated_at', 'is_deleted',
+)
+LIVE = sa.text('is_deleted = false')
+
+# Индексы devlog_entries (init, a3f19c6e2b80, c81d4e07f5a2, f2c7a5d1e903): name -> (columns, kwargs)
+INDEXES = {
+    'ix_devlog_entries_created_at': (['created_at'], {}),
+    'ix_devlog_entries_project_id': (['project_id'], {}),
+    'ix_devlog_entries_task_id': (['task_id'], {}),
+    'ix_devlog_entries_tags_gin': (
+        ['tags'], {'postgresql_using': 'gin', 'postgresql_ops': {'tags': 'jsonb_path_ops'}},
+    ),
+    'ix_devlog_entries_custom_fields_gin': (
+        ['custom_fields'], {'postgresql_using': 'gin', 'postgresql_ops': {'custom_fields': 'jsonb_path_ops'}},
+    ),
+    'ix_devlog_entries_live_project_created_at': (
+        ['project_id', sa.text('created_at DESC'), sa.text('id DESC')], {'postgresql_where': LIVE},
+    ),
+    'ix_devlog_entries_live_created_at': (
+        [sa.text('created_at DESC'), sa.text('id DESC')], {'postgresql_where': LIVE},
+    ),
+    'ix_devlog_entries_search_vector': (['search_vector'], {'postgresql_using': 'gin'}),
+}
+
+SEARCH_VECTOR = "setweight(to_tsvector('simple', coalesce(content, '')), 'A')"
+
+
+def _add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _columns(partitioned: bool) -> list:
+    return [
+        sa.Column('id', sa.Integer(), server_default=sa.text("nextval('devlog_entries_id_seq'::regclass)"), nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=True),
+        sa.Column('task_id', sa.Integer(), nullable=True),
+        sa.Column('entry_type', sa.String(length=24), nullable=False),
+        sa.Column('content', sa.String(length=5000), nullable=False),
+        sa.Column('author', sa.String(length=64), nullable=False),
+        sa.Column('tags', postgresql.JSONB(), nullable=True),
+        sa.Column('custom_fields', postgresql.JSONB(), nullable=True),
+        sa.Column('edited_by', sa.String(length=64), nullable=True),
+        sa.Column('edit_reason', sa.String(length=256), nullable=True),
+        sa.Column('attachments', postgresql.JSONB(), nullable=True),
+        sa.Column('ai_notes', sa.String(length=2000), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('is_deleted', sa.Boolean(), nullable=False),
+        sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(SEARCH_VECTOR, persisted=True), nullable=True),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+        sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ),
+        # Ключ партиционирования обязан входить в PK
+        sa.PrimaryKeyConstraint('id', 'created_at') if partitioned else sa.PrimaryKeyConstraint('id'),
+    ]
+
+
+def _replace_table(partitioned: bool) -> None:
+    """
+    devlog_entries -> devlog_entries_previous, новая таблица, перенос строк, старая удаляется.
+    Последовательность id переходит к новой таблице (OWNED BY), значения id сохраняются.
+    """
+    op.execute('ALTER SEQUENCE devlog_entries_id_seq OWNED BY NONE')
+    op.rename_table('devlog_entries', 'devlog_entries_previous')
+    op.execute('ALTER TABLE devlog_entries_previous RENAME CONSTRAINT devlog_entries_pkey TO devlog_entries_previous_pkey')
+    for name in INDEXES:
+        op.drop_index(name, table_name='devlog_entries_previous')
+
+    kwargs = {'postgresql_partition_by': 'RANGE (created_at)'} if partitioned else {}
+    op.create_table('devlog_entries', *_columns(partitioned), **kwargs)
+    if partitioned:
+        _create_partitions()
+
+    columns = ', '.join(COLUMNS)
+    op.execute(f'INSERT INTO devlog_entries ({columns}) SELECT {columns} FROM devlog_entries_previous')
+    op.drop_table('devlog_entries_previous')
+    op.execute('ALTER SEQUENCE devlog_entries_id_seq OWNED BY devlog_entries.id')
+
+    # Индексы — после загрузки: на партиционированной таблице создаются в каждой партиции
+    for name, (columns, index_kwargs) in INDEXES.items():
+        op.create_index(name, 'devlog_entries', columns, unique=False, **index_kwargs)
+    op.execute('ANALYZE devlog_entries')
+
+
+def _create_partitions() -> None:
+    # Месяцы от самой старой записи до текущего + PRECREATE_MONTHS; прочее — DEFAULT-партиция
+    oldest = op.get_bind().execute(sa.text('SELECT min(created_at) FROM devlog_entries_previous')).scalar()
+    today = datetime.utcnow().date()
+    month = date((oldest or today).year, (oldest or today).month, 1)
+    last = _add_months(date(today.year, today.month, 1), PRECREATE_MONTHS)
+    while month <= last:
+        name = f'devlog_entries_y{month.year:04d}m{month.month:02d}'
+        op.execute(
+            f"CREATE TABLE {name} PARTITION OF devlog_entries "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{_add_months(month, 1):%Y-%m-%d}') "
+            f"PARTITION BY LIST (entry_type)"
+        )
+        for entry_type in ENTRY_TYPES:
+            op.execute(f"CREATE TABLE {name}_{entry_type} PARTITION OF {name} FOR VALUES IN ('{entry_type}')")
+        op.execute(f'CREATE TABLE {name}_{OTHER_TYPE} PARTITION OF {name} DEFAULT')
+        month = _add_months(month, 1)
+    op.execute('CREATE TABLE devlog_entries_default PARTITION OF devlog_entries DEFAULT')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # FK на партиционированную таблицу должен включать created_at — связь тегов остаётся без FK
+    op.drop_constraint('devlog_entry_tags_entry_id_fkey', 'devlog_entry_tags', type_='foreignkey')
+    _replace_table(partitioned=True)
+    op.execute(f'CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Подпартиции, уже перенесённые в ARCHIVE_SCHEMA, не возвращаются (схема остаётся как есть)
+    _replace_table(partitioned=False)
+    op.execute('DELETE FROM devlog_entry_tags WHERE entry_id NOT IN (SELECT id FROM devlog_entries)')
+    op.create_foreign_key(
+        'devlog_entry_tags_entry_id_fkey', 'devlog_entry_tags', 'devlog_entries',
+        ['entry_id'], ['id'], ondelete='CASCADE',
+    )
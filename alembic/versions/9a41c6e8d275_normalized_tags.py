@@ -0,0 +1,73 @@
+"""normalized tags and per-entity link tables
+
+Revision ID: 9a41c6e8d275
+Revises: 7d3e9b40c1f6
+Create Date: 2025-06-11 14:03:37.512908
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a41c6e8d275'
+down_revision: Union[str, None] = '7d3e9b40c1f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (link table, entity table, entity column)
+LINKS = [
+    ('task_tags', 'tasks', 'task_id'),
+    ('project_tags', 'projects', 'project_id'),
+    ('devlog_entry_tags', 'devlog_entries', 'entry_id'),
+    ('template_tags', 'templates', 'template_id'),
+    ('plugin_tags', 'plugins', 'plugin_id'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'tags',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('name', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name'),
+    )
+    for link, entity, column in LINKS:
+        op.create_table(
+            link,
+            sa.Column(column, sa.Integer(), nullable=False),
+            sa.Column('tag_id', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint([column], [f'{entity}.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['tag_id'], ['tags.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint(column, 'tag_id'),
+        )
+        op.create_index(f'ix_{link}_tag_id', link, ['tag_id', column], unique=False)
+
+    # Заполнение из JSON-массивов: только строковые непустые элементы (как clean_tags)
+    for link, entity, column in LINKS:
+        elements = f"""
+            SELECT e.id AS entity_id, v #>> '{{}}' AS name
+            FROM {entity} AS e
+            CROSS JOIN LATERAL jsonb_array_elements(e.tags) AS v
+            WHERE jsonb_typeof(e.tags) = 'array' AND jsonb_typeof(v) = 'string' AND v #>> '{{}}' <> ''
+        """
+        op.execute(f"INSERT INTO tags (name) SELECT DISTINCT name FROM ({elements}) AS s ON CONFLICT (name) DO NOTHING")
+        op.execute(f"""
+            INSERT INTO {link} ({column}, tag_id)
+            SELECT DISTINCT s.entity_id, t.id
+            FROM ({elements}) AS s
+            JOIN tags AS t ON t.name = s.name
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for link, _, _ in reversed(LINKS):
+        op.drop_index(f'ix_{link}_tag_id', table_name=link)
+        op.drop_table(link)
+    op.drop_table('tags')
@@ -0,0 +1,73 @@
+"""json columns to jsonb with gin indexes
+
+Revision ID: a3f19c6e2b80
+Revises: 5b7e2c91d4a3
+Create Date: 2025-06-03 09:41:07.532816
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f19c6e2b80'
+down_revision: Union[str, None] = '5b7e2c91d4a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+JSONB_COLUMNS = {
+    'tasks': ['assignees', 'tags', 'custom_fields', 'attachments'],
+    'projects': ['participants', 'tags', 'custom_fields', 'attachments'],
+    'devlog_entries': ['tags', 'custom_fields', 'attachments'],
+    'templates': ['tags', 'structure'],
+    'plugins': ['config_json', 'tags'],
+}
+
+# (table, column): GIN jsonb_path_ops — обслуживает только оператор @>
+GIN_INDEXES = [
+    ('tasks', 'tags'),
+    ('tasks', 'assignees'),
+    ('tasks', 'custom_fields'),
+    ('projects', 'tags'),
+    ('projects', 'custom_fields'),
+    ('devlog_entries', 'tags'),
+    ('devlog_entries', 'custom_fields'),
+    ('templates', 'tags'),
+    ('plugins', 'tags'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, columns in JSONB_COLUMNS.items():
+        for column in columns:
+            op.alter_column(
+                table, column,
+                type_=postgresql.JSONB(),
+                existing_type=sa.JSON(),
+                postgresql_using=f'{column}::jsonb',
+            )
+    for table, column in GIN_INDEXES:
+        op.create_index(
+            f'ix_{table}_{column}_gin', table, [column], unique=False,
+            postgresql_using='gin',
+            postgresql_ops={column: 'jsonb_path_ops'},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column in reversed(GIN_INDEXES):
+        op.drop_index(f'ix_{table}_{column}_gin', table_name=table)
+    for table, columns in JSONB_COLUMNS.items():
+        for column in columns:
+            op.alter_column(
+                table, column,
+                type_=sa.JSON(),
+                existing_type=postgresql.JSONB(),
+                postgresql_using=f'{column}::json',
+            )
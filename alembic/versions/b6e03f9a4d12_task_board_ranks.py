@@ -0,0 +1,58 @@
+"""task board ranks
+
+Revision ID: b6e03f9a4d12
+Revises: 3c8f1d52a6b7
+Create Date: 2025-06-13 15:07:29.512904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e03f9a4d12'
+down_revision: Union[str, None] = '3c8f1d52a6b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # COLLATE "C": ранги сравниваются побайтно, как в app/core/lexorank.py
+    op.add_column('tasks', sa.Column('rank', sa.String(length=64, collation='C'), nullable=True))
+
+    # Начальные ранги живых задач — в прежнем порядке доски (priority, deadline, id).
+    # Значения base36 фиксированной ширины 6 с шагом 36^2 (как rank_sequence), без хвостовых нулей.
+    op.execute("""
+        WITH ordered AS (
+            SELECT id, row_number() OVER (
+                PARTITION BY project_id, status
+                ORDER BY priority NULLS LAST, deadline NULLS LAST, id
+            ) * 1296 AS value
+            FROM tasks
+            WHERE is_deleted = false
+        ), digits AS (
+            SELECT o.id, string_agg(
+                substr('0123456789abcdefghijklmnopqrstuvwxyz', (o.value / (36 ^ p)::bigint % 36)::int + 1, 1),
+                '' ORDER BY p DESC
+            ) AS rank
+            FROM ordered AS o
+            CROSS JOIN generate_series(0, 5) AS p
+            GROUP BY o.id
+        )
+        UPDATE tasks SET rank = rtrim(digits.rank, '0')
+        FROM digits
+        WHERE tasks.id = digits.id
+    """)
+    op.create_index(
+        'ix_tasks_live_project_status_rank', 'tasks', ['project_id', 'status', 'rank'],
+        unique=False, postgresql_where=sa.text('is_deleted = false'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_live_project_status_rank', table_name='tasks')
+    op.drop_column('tasks', 'rank')
@@ -0,0 +1,67 @@
+"""partial composite indexes for soft-delete list queries
+
+Revision ID: c81d4e07f5a2
+Revises: a3f19c6e2b80
+Create Date: 2025-06-04 16:05:52.904117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c81d4e07f5a2'
+down_revision: Union[str, None] = 'a3f19c6e2b80'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+LIVE = sa.text('is_deleted = false')
+
+# name: (table, columns) — все индексы частичные WHERE is_deleted = false
+PARTIAL_INDEXES = {
+    'ix_tasks_live_project_status_deadline': (
+        'tasks', ['project_id', 'status', sa.text('deadline DESC NULLS LAST'), sa.text('id DESC')],
+    ),
+    'ix_tasks_live_project_status_priority': (
+        'tasks', ['project_id', 'status', 'priority', 'id'],
+    ),
+    'ix_tasks_live_project_deadline': (
+        'tasks', ['project_id', sa.text('deadline DESC NULLS LAST'), sa.text('id DESC')],
+    ),
+    'ix_tasks_live_project_priority': (
+        'tasks', ['project_id', 'priority', 'id'],
+    ),
+    'ix_tasks_live_project_created_at': (
+        'tasks', ['project_id', sa.text('created_at DESC'), sa.text('id DESC')],
+    ),
+    'ix_projects_live_created_at': (
+        'projects', [sa.text('created_at DESC')],
+    ),
+    'ix_projects_live_status_created_at': (
+        'projects', ['status', sa.text('created_at DESC')],
+    ),
+    'ix_devlog_entries_live_project_created_at': (
+        'devlog_entries', ['project_id', sa.text('created_at DESC'), sa.text('id DESC')],
+    ),
+    'ix_devlog_entries_live_created_at': (
+        'devlog_entries', [sa.text('created_at DESC'), sa.text('id DESC')],
+    ),
+    'ix_chat_messages_live_project_timestamp': (
+        'chat_messages', ['project_id', 'timestamp'],
+    ),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, (table, columns) in PARTIAL_INDEXES.items():
+        op.create_index(name, table, columns, unique=False, postgresql_where=LIVE)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, (table, _) in reversed(list(PARTIAL_INDEXES.items())):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,41 @@
+"""project plugin bindings
+
+Revision ID: d58a2e1c7b94
+Revises: b6e03f9a4d12
+Create Date: 2025-06-16 11:42:08.730215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd58a2e1c7b94'
+down_revision: Union[str, None] = 'b6e03f9a4d12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'project_plugins',
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('plugin_id', sa.Integer(), nullable=False),
+        sa.Column('config', postgresql.JSONB(), nullable=False),
+        sa.Column('is_enabled', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['plugin_id'], ['plugins.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('project_id', 'plugin_id'),
+    )
+    op.create_index('ix_project_plugins_plugin_id', 'project_plugins', ['plugin_id', 'project_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_project_plugins_plugin_id', table_name='project_plugins')
+    op.drop_table('project_plugins')
@@ -0,0 +1,44 @@
+"""denormalized project progress counters
+
+Revision ID: e4b2a9170c6d
+Revises: c81d4e07f5a2
+Create Date: 2025-06-06 11:27:19.640351
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b2a9170c6d'
+down_revision: Union[str, None] = 'c81d4e07f5a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('projects', sa.Column('tasks_total', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('projects', sa.Column('tasks_done', sa.Integer(), server_default='0', nullable=False))
+    # Начальное заполнение одним проходом по tasks
+    op.execute("""
+        UPDATE projects AS p
+        SET tasks_total = s.total, tasks_done = s.done
+        FROM (
+            SELECT project_id,
+                   count(*) AS total,
+                   count(*) FILTER (WHERE status = 'done') AS done
+            FROM tasks
+            WHERE is_deleted = false
+            GROUP BY project_id
+        ) AS s
+        WHERE s.project_id = p.id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('projects', 'tasks_done')
+    op.drop_column('projects', 'tasks_total')
@@ -0,0 +1,54 @@
+"""full-text search vectors
+
+Revision ID: f2c7a5d1e903
+Revises: e4b2a9170c6d
+Create Date: 2025-06-09 10:42:51.218406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c7a5d1e903'
+down_revision: Union[str, None] = 'e4b2a9170c6d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Копия app.core.fulltext.FTS_SOURCES на момент миграции
+SOURCES = {
+    'tasks': ('title', 'description'),
+    'projects': ('name', 'description'),
+    'devlog_entries': ('content',),
+    'chat_messages': ('content',),
+}
+
+
+def _vector_sql(columns) -> str:
+    weighted = [
+        f"setweight(to_tsvector('simple', coalesce({column}, '')), '{'A' if i == 0 else 'B'}')"
+        for i, column in enumerate(columns)
+    ]
+    return " || ".join(weighted)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # STORED generated column: Postgres сам пересчитывает вектор при INSERT/UPDATE
+    for table, columns in SOURCES.items():
+        op.execute(
+            f"ALTER TABLE {table} ADD COLUMN search_vector tsvector "
+            f"GENERATED ALWAYS AS ({_vector_sql(columns)}) STORED"
+        )
+        op.create_index(
+            f'ix_{table}_search_vector', table, ['search_vector'], unique=False, postgresql_using='gin'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(list(SOURCES)):
+        op.drop_index(f'ix_{table}_search_vector', table_name=table, postgresql_using='gin')
+        op.drop_column(table, 'search_vector')
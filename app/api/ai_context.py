@@ -13,6 +13,7 @@ from app.crud.ai_context import (
     delete_ai_context,
     get_latest_ai_context,
 )
+from app.core.exceptions import ProjectValidationError
 from app.dependencies import get_db, get_current_active_user
 from app.schemas.response import SuccessResponse, ErrorResponse
 
@@ -89,7 +90,10 @@ def list_ai_contexts(
     if request_id: filters["request_id"] = request_id
     if created_after: filters["created_after"] = created_after
     if created_before: filters["created_before"] = created_before
-    return get_ai_contexts(db, filters=filters, limit=limit, offset=offset)
+    try:
+        return get_ai_contexts(db, filters=filters, limit=limit, offset=offset)
+    except ProjectValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.patch("/{ai_context_id}", response_model=SuccessResponse)
 def patch_ai_context(
@@ -1,9 +1,10 @@
 #app/api/devlog.py
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any
 from app.schemas.devlog import (
-    DevLogCreate, DevLogRead, DevLogUpdate, DevLogShort
+    DevLogCreate, DevLogRead, DevLogUpdate, DevLogShort, DevLogPage
 )
 from app.crud.devlog import (
     create_entry,
@@ -11,10 +12,15 @@ from app.crud.devlog import (
     update_entry,
     soft_delete_entry,
     restore_entry,
-    get_entries,
+    maintain_devlog_partitions,
     summarize_entry,
     get_ai_context,
 )
+from app.crud.readers import read_entries, read_entries_page
+from app.core.exceptions import DevLogValidationError
+from app.core.fieldsets import split_fields
+from app.core.security import ensure_superuser
+from app.core.serialization import orm_list_response, orm_rows
 from app.dependencies import get_db, get_current_active_user
 from app.schemas.response import SuccessResponse
 
@@ -32,6 +38,72 @@ def create_devlog_entry(
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.get("/feed", response_model=DevLogPage)
+def devlog_feed(
+    project_id: Optional[int] = Query(None),
+    task_id: Optional[int] = Query(None),
+    entry_type: Optional[str] = Query(None),
+    author: Optional[str] = Query(None),
+    tag: Optional[str] = Query(None),
+    date_from: Optional[str] = Query(None),
+    date_to: Optional[str] = Query(None),
+    search: Optional[str] = Query(None),
+    show_archived: Optional[bool] = Query(False),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    count: str = Query("none", description="total_count on the first page: exact, estimated or none"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. content,author (default: short view)"),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_active_user)
+):
+    """
+    Лента devlog для бесконечной прокрутки: keyset по (created_at, id), новые сверху.
+    """
+    filters = {
+        "project_id": project_id,
+        "task_id": task_id,
+        "entry_type": entry_type,
+        "author": author,
+        "tag": tag,
+        "date_from": date_from,
+        "date_to": date_to,
+        "search": search,
+        "show_archived": show_archived
+    }
+    filters = {k: v for k, v in filters.items() if v is not None}
+    field_list = split_fields(fields)
+    try:
+        page = read_entries_page(db, filters, limit=limit, cursor=cursor, fields=field_list, count=count)
+    except DevLogValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if field_list:
+        results = orm_rows(page["entries"], DevLogRead, fields=field_list)
+    else:
+        results = orm_rows(page["entries"], DevLogShort)
+    return ORJSONResponse({
+        "results": results,
+        "next_cursor": page["next_cursor"],
+        "total_count": page["total_count"],
+        "count": page["count"],
+    })
+
+@router.post("/partitions/maintain", response_model=SuccessResponse)
+def maintain_partitions(
+    drop: bool = Query(False, description="Drop expired partitions instead of moving them to the archive schema"),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_active_user)
+):
+    """
+    Создать партиции devlog на следующие месяцы и отключить просроченные (retention по entry_type).
+    Вызывается периодически (cron); только суперпользователь.
+    """
+    ensure_superuser(user)
+    try:
+        result = maintain_devlog_partitions(db, drop=drop)
+    except DevLogValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return SuccessResponse(result=result, detail="DevLog partitions maintained")
+
 @router.get("/{entry_id}", response_model=DevLogRead)
 def read_devlog_entry(
     entry_id: int,
@@ -84,6 +156,7 @@ def list_devlog_entries(
     show_archived: Optional[bool] = Query(False),
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. title,status (default: short view)"),
     db: Session = Depends(get_db),
     user=Depends(get_current_active_user)
 ):
@@ -99,8 +172,15 @@ def list_devlog_entries(
         "show_archived": show_archived
     }
     filters = {k: v for k, v in filters.items() if v is not None}
-    result = get_entries(db, filters, page, per_page)
-    return result["entries"]
+    field_list = split_fields(fields)
+    try:
+        # Ответ — список без total_count: не считаем
+        result = read_entries(db, filters, page, per_page, fields=field_list, count="none")
+    except DevLogValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if field_list:
+        return orm_list_response(result["entries"], DevLogRead, fields=field_list)
+    return orm_list_response(result["entries"], DevLogShort)
 
 @router.get("/{entry_id}/ai_context", response_model=Dict[str, Any])
 def get_entry_ai_context(
@@ -5,9 +5,10 @@ from typing import List, Optional, Dict, Any
 from app.schemas.jarvis import ChatMessageCreate, ChatMessageRead, ChatMessageUpdate, ChatMessageShort
 from app.crud.jarvis import (
     save_message,
-    get_history,
     delete_history_for_project
 )
+from app.crud.readers import read_history
+from app.core.serialization import orm_list_response
 from app.dependencies import get_db, get_current_active_user
 from app.schemas.response import SuccessResponse
 
@@ -40,8 +41,8 @@ def chat_history(
     db: Session = Depends(get_db),
     user=Depends(get_current_active_user)
 ):
-    history = get_history(db, project_id, limit=limit, offset=offset)
-    return history
+    history = read_history(db, project_id, limit=limit, offset=offset)
+    return orm_list_response(history, ChatMessageRead)
 
 @router.delete("/history/{project_id}", response_model=SuccessResponse)
 def delete_chat_history(
@@ -60,6 +61,6 @@ def last_messages(
     db: Session = Depends(get_db),
     user=Depends(get_current_active_user)
 ):
-    history = get_history(db, project_id, limit=n)
+    history = read_history(db, project_id, limit=n)
     # Можно вернуть короткую схему (ChatMessageShort)
-    return [ChatMessageShort.from_orm(msg) for msg in history[-n:]]
+    return orm_list_response(history[-n:], ChatMessageShort)
@@ -0,0 +1,37 @@
+#app/api/me.py
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.schemas.task import TaskPage, TaskRead
+from app.crud.readers import MY_TASK_FIELDS, read_tasks_page
+from app.core.exceptions import TaskValidationError
+from app.core.fieldsets import split_fields
+from app.core.serialization import orm_rows
+from app.dependencies import get_db, get_current_active_user
+
+router = APIRouter(prefix="/me", tags=["Me"])
+
+@router.get("/tasks", response_model=TaskPage)
+def list_my_tasks(
+    status: Optional[str] = Query(None),
+    project_id: Optional[int] = Query(None),
+    sort_by: Optional[str] = Query("due", description="due (nearest deadline first), deadline, priority or created_at"),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return (default: title,status,priority,deadline,project_id)"),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_active_user)
+):
+    """
+    Задачи текущего пользователя во всех проектах (индекс task_assignees по user_id).
+    """
+    filters = {"assignee_id": user.id, "status": status, "project_id": project_id}
+    filters = {k: v for k, v in filters.items() if v is not None}
+    field_list = split_fields(fields) or list(MY_TASK_FIELDS)
+    try:
+        page = read_tasks_page(db, filters=filters, sort_by=sort_by, limit=limit, cursor=cursor, fields=field_list)
+    except TaskValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    results = orm_rows(page["tasks"], TaskRead, fields=field_list)
+    return ORJSONResponse({"results": results, "next_cursor": page["next_cursor"]})
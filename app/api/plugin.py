@@ -16,6 +16,9 @@ from app.crud.plugin import (
     get_active_plugins_summary,
     run_plugin_action,
 )
+from app.core.exceptions import PluginValidationError
+from app.core.fieldsets import split_fields
+from app.core.serialization import orm_list_response
 from app.dependencies import get_db, get_current_active_user
 from app.schemas.response import SuccessResponse
 
@@ -47,13 +50,21 @@ def get_one_plugin(
 @router.get("/", response_model=List[PluginShort])
 def list_plugins(
     is_active: Optional[bool] = Query(None),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. title,status (default: short view)"),
     db: Session = Depends(get_db),
     user=Depends(get_current_active_user)
 ):
     filters = {}
     if is_active is not None:
         filters["is_active"] = is_active
-    return get_all_plugins(db, filters=filters)
+    field_list = split_fields(fields)
+    try:
+        plugins = get_all_plugins(db, filters=filters, fields=field_list)
+    except PluginValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if field_list:
+        return orm_list_response(plugins, PluginRead, fields=field_list)
+    return orm_list_response(plugins, PluginShort)
 
 @router.patch("/{plugin_id}", response_model=PluginRead)
 def update_one_plugin(
@@ -3,20 +3,33 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any
 from app.schemas.project import (
-    ProjectCreate, ProjectRead, ProjectUpdate, ProjectShort
+    ProjectCreate, ProjectRead, ProjectUpdate, ProjectShort, ProjectBatchUpsert, ProjectBoard,
+    ProjectStats, ProjectClone, ProjectToTemplate,
 )
+from app.schemas.template import TemplateRead
+
 from app.crud.project import (
     create_project,
+    upsert_projects,
     get_project,
     get_all_projects,
     update_project,
     soft_delete_project,
     restore_project,
+    clone_project,
     get_ai_context,
+    get_project_stats,
+    repair_counters,
     summarize_project,
 )
+from app.crud.task import get_board
+from app.crud.template import create_template_from_project
+from app.core.exceptions import DuplicateProjectName, ProjectNotFound, ProjectValidationError
+from app.core.fieldsets import split_fields
+from app.core.security import ensure_superuser
+from app.core.serialization import orm_list_response
 from app.dependencies import get_db, get_current_active_user
-from app.schemas.response import SuccessResponse
+from app.schemas.response import SuccessResponse, UpsertResponse
 
 router = APIRouter(prefix="/projects", tags=["Projects"])
 
@@ -35,6 +48,32 @@ def create_new_project(
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/upsert", response_model=UpsertResponse)
+def upsert_projects_batch(
+    data: ProjectBatchUpsert,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_active_user)
+):
+    """
+    Идемпотентно создать/обновить проекты по external_id (для синхронизаций).
+    """
+    try:
+        return upsert_projects(db, [item.dict() for item in data.items])
+    except ProjectValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/counters/repair", response_model=SuccessResponse)
+def repair_project_progress_counters(
+    db: Session = Depends(get_db),
+    user=Depends(get_current_active_user)
+):
+    """
+    Пересчитать счётчики прогресса всех проектов с нуля (сервисная операция, только суперпользователь).
+    """
+    ensure_superuser(user)
+    repair_counters(db)
+    return SuccessResponse(result=True, detail="Project counters recomputed")
+
 @router.get("/{project_id}", response_model=ProjectRead)
 def get_one_project(
     project_id: int,
@@ -61,6 +100,7 @@ def list_projects(
     custom_fields: Optional[Dict[str, Any]] = None,
     show_archived: bool = Query(False),
     sort_by: Optional[str] = Query("created_at"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. title,status (default: short view)"),
     db: Session = Depends(get_db),
     user=Depends(get_current_active_user)
 ):
@@ -79,7 +119,14 @@ def list_projects(
         "show_archived": show_archived,
     }
     filters = {k: v for k, v in filters.items() if v is not None}
-    return get_all_projects(db, filters=filters, sort_by=sort_by)
+    field_list = split_fields(fields)
+    try:
+        projects = get_all_projects(db, filters=filters, sort_by=sort_by, fields=field_list)
+    except ProjectValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if field_list:
+        return orm_list_response(projects, ProjectRead, fields=field_list)
+    return orm_list_response(projects, ProjectShort)
 
 @router.patch("/{project_id}", response_model=ProjectRead)
 def update_one_project(
@@ -121,6 +168,74 @@ def restore_deleted_project(
     restore_project(db, project_id)
     return SuccessResponse(result=project_id, detail="Project restored")
 
+@router.post("/{project_id}/clone", response_model=SuccessResponse)
+def clone_existing_project(
+    project_id: int,
+    data: ProjectClone,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_active_user)
+):
+    """
+    Скопировать проект вместе с задачами, подзадачами и (опционально) devlog внутри БД.
+    """
+    try:
+        result = clone_project(db, project_id, data.dict())
+    except ProjectNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except (DuplicateProjectName, ProjectValidationError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return SuccessResponse(
+        result=result["id"],
+        detail=f"Project cloned: {result['tasks']} tasks, {result['devlog']} devlog entries",
+    )
+
+@router.post("/{project_id}/to-template", response_model=TemplateRead)
+def capture_project_as_template(
+    project_id: int,
+    data: ProjectToTemplate,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_active_user)
+):
+    """
+    Сохранить проект как шаблон: дерево задач, теги, custom fields и плагины.
+    """
+    try:
+        return create_template_from_project(db, project_id, data.dict())
+    except ProjectNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except (DuplicateProjectName, ProjectValidationError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/{project_id}/board", response_model=ProjectBoard)
+def get_project_board(
+    project_id: int,
+    per_column: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_active_user)
+):
+    """
+    Kanban-доска проекта: задачи по статусам, top-N в каждой колонке.
+    """
+    try:
+        get_project(db, project_id)
+    except ProjectNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return get_board(db, project_id, per_column=per_column)
+
+@router.get("/{project_id}/stats", response_model=ProjectStats)
+def get_project_dashboard_stats(
+    project_id: int,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_active_user)
+):
+    """
+    Сводная статистика проекта для дашборда (только агрегаты).
+    """
+    try:
+        return get_project_stats(db, project_id)
+    except ProjectNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
 @router.get("/{project_id}/ai_context", response_model=Dict[str, Any])
 def get_project_ai_context(
     project_id: int,
@@ -0,0 +1,28 @@
+#app/api/search.py
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.schemas.search import SearchResults
+from app.services.search import SearchQueryError, search
+from app.core.fieldsets import split_fields
+from app.dependencies import get_db, get_current_active_user
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+@router.get("/", response_model=SearchResults)
+def search_everything(
+    q: str = Query(..., min_length=1, max_length=200),
+    types: Optional[str] = Query(None, description="task,project,devlog,chat"),
+    limit: int = Query(10, ge=1, le=50, description="Максимум хитов на каждый тип"),
+    project_id: Optional[int] = Query(None),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_active_user)
+):
+    """
+    Полнотекстовый поиск по задачам, проектам, devlog и чату (по префиксам слов).
+    """
+    try:
+        hits = search(db, q, kinds=split_fields(types), limit=limit, project_id=project_id)
+    except SearchQueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return SearchResults(query=q, hits=hits)
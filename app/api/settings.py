@@ -12,6 +12,7 @@ from app.crud.settings import (
     delete_setting,
     get_all_settings
 )
+from app.core.serialization import orm_list_response
 from app.dependencies import get_db, get_current_active_user
 from app.schemas.response import SuccessResponse
 
@@ -41,7 +42,7 @@ def list_settings(
     """
     Получить список всех настроек (глобальных или пользователя).
     """
-    return get_all_settings(db, user_id=user_id)
+    return orm_list_response(get_all_settings(db, user_id=user_id), SettingRead)
 
 @router.get("/{key}", response_model=SettingRead)
 def get_one_setting(
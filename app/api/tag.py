@@ -0,0 +1,22 @@
+#app/api/tag.py
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.schemas.tag import TagUsage
+from app.services.tag_index import tag_usage
+from app.dependencies import get_db, get_current_active_user
+
+router = APIRouter(prefix="/tags", tags=["Tags"])
+
+@router.get("/", response_model=List[TagUsage])
+def list_tags(
+    project_id: Optional[int] = Query(None, description="Счётчики в пределах проекта"),
+    prefix: Optional[str] = Query(None, max_length=100),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_active_user)
+):
+    """
+    Облако тегов: сколько живых задач/проектов/devlog-записей/шаблонов/плагинов несут тег.
+    """
+    return tag_usage(db, project_id=project_id, prefix=prefix, limit=limit)
@@ -1,22 +1,39 @@
 #app/api/task.py
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
-from typing import List, Optional, Dict, Any
+from typing import Optional, Dict, Any
 from app.schemas.task import (
-    TaskCreate, TaskRead, TaskUpdate, TaskShort
+    TaskCreate, TaskRead, TaskUpdate, TaskShort, TaskPage, TaskTreeNode,
+    TaskBulkCreate, TaskBulkUpdate, TaskBatchUpsert, TaskMove, TaskBulkAction, TaskBulkActionResult,
+    TaskReparent,
 )
 from app.crud.tasks import (
     create_task,
-    get_task,
-    get_all_tasks,
+    bulk_create_tasks,
+    bulk_update_tasks,
+    bulk_task_action,
+    upsert_tasks,
+    get_task_tree,
     update_task,
+    move_task,
+    rebalance_ranks,
     soft_delete_task,
     restore_task,
+    archive_subtree,
+    restore_subtree,
+    reparent_subtree,
     get_ai_context,
     summarize_task,
 )
+from app.crud.readers import read_task, read_tasks_page
+from app.core.exceptions import TaskNotFound, TaskValidationError
+from app.core.fieldsets import split_fields
+from app.core.security import ensure_superuser
+from app.core.serialization import orm_rows
 from app.dependencies import get_db, get_current_active_user
-from app.schemas.response import SuccessResponse
+from app.schemas.response import SuccessResponse, BulkResponse, UpsertResponse
+from app.services.task_ranking import rebalance_column_job
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
@@ -35,6 +52,72 @@ def create_new_task(
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/bulk", response_model=BulkResponse)
+def create_tasks_bulk(
+    data: TaskBulkCreate,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_active_user)
+):
+    """
+    Массово создать задачи (ошибки возвращаются по индексу элемента).
+    """
+    return bulk_create_tasks(db, [item.dict() for item in data.items])
+
+@router.patch("/bulk", response_model=BulkResponse)
+def update_tasks_bulk(
+    data: TaskBulkUpdate,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_active_user)
+):
+    """
+    Массово обновить задачи по id (ошибки возвращаются по индексу элемента).
+    """
+    return bulk_update_tasks(db, [item.dict(exclude_unset=True) for item in data.items])
+
+@router.post("/bulk-action", response_model=TaskBulkActionResult)
+def apply_bulk_action(
+    data: TaskBulkAction,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_active_user)
+):
+    """
+    Применить одно действие ко всем задачам по фильтру (один UPDATE); dry_run — только подсчёт.
+    """
+    try:
+        return bulk_task_action(db, data.filters, data.action, data.value, dry_run=data.dry_run)
+    except TaskValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/upsert", response_model=UpsertResponse)
+def upsert_tasks_batch(
+    data: TaskBatchUpsert,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_active_user)
+):
+    """
+    Идемпотентно создать/обновить задачи по external_id (для синхронизаций).
+    """
+    try:
+        return upsert_tasks(db, [item.dict() for item in data.items])
+    except TaskValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/ranks/rebalance", response_model=SuccessResponse)
+def rebalance_task_ranks(
+    project_id: Optional[int] = Query(None),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_active_user)
+):
+    """
+    Перенумеровать колонки досок с длинными рангами или задачами без ранга (только суперпользователь).
+    """
+    ensure_superuser(user)
+    try:
+        result = rebalance_ranks(db, [project_id] if project_id is not None else None)
+    except TaskValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return SuccessResponse(result=result, detail="Task ranks rebalanced")
+
 @router.get("/{task_id}", response_model=TaskRead)
 def get_one_task(
     task_id: int,
@@ -44,12 +127,28 @@ def get_one_task(
     """
     Получить задачу по ID.
     """
-    task = get_task(db, task_id)
+    task = read_task(db, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
-    return task
+    return ORJSONResponse(orm_rows([task], TaskRead)[0])
+
+@router.get("/{task_id}/tree", response_model=TaskTreeNode)
+def get_task_subtree(
+    task_id: int,
+    max_depth: Optional[int] = Query(None, ge=0, le=100),
+    show_archived: bool = Query(False),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_active_user)
+):
+    """
+    Получить дерево подзадач (один рекурсивный запрос).
+    """
+    try:
+        return get_task_tree(db, task_id, max_depth=max_depth, include_archived=show_archived)
+    except TaskNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
 
-@router.get("/", response_model=List[TaskShort])
+@router.get("/", response_model=TaskPage)
 def list_tasks(
     project_id: Optional[int] = Query(None),
     status: Optional[str] = Query(None),
@@ -62,12 +161,15 @@ def list_tasks(
     custom_fields: Optional[Dict[str, Any]] = None,
     assignee_id: Optional[int] = Query(None),
     show_archived: bool = Query(False),
-    sort_by: Optional[str] = Query("deadline"),
+    sort_by: Optional[str] = Query("deadline", description="deadline, due, priority or created_at"),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. title,status (default: short view)"),
     db: Session = Depends(get_db),
     user=Depends(get_current_active_user)
 ):
     """
-    Получить список задач с фильтрацией и поиском.
+    Получить список задач с фильтрацией и поиском (keyset-пагинация по cursor).
     """
     filters = {
         "project_id": project_id,
@@ -83,7 +185,13 @@ def list_tasks(
         "show_archived": show_archived,
     }
     filters = {k: v for k, v in filters.items() if v is not None}
-    return get_all_tasks(db, filters=filters, sort_by=sort_by)
+    field_list = split_fields(fields)
+    try:
+        page = read_tasks_page(db, filters=filters, sort_by=sort_by, limit=limit, cursor=cursor, fields=field_list)
+    except TaskValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    results = orm_rows(page["tasks"], TaskRead, fields=field_list) if field_list else orm_rows(page["tasks"], TaskShort)
+    return ORJSONResponse({"results": results, "next_cursor": page["next_cursor"]})
 
 @router.patch("/{task_id}", response_model=TaskRead)
 def update_one_task(
@@ -113,6 +221,28 @@ def delete_task(
     soft_delete_task(db, task_id)
     return SuccessResponse(result=task_id, detail="Task archived")
 
+@router.post("/{task_id}/move", response_model=TaskRead)
+def move_one_task(
+    task_id: int,
+    data: TaskMove,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_active_user)
+):
+    """
+    Переместить задачу на доске: между prev_id и next_id в колонке status.
+    """
+    try:
+        result = move_task(db, task_id, **data.dict())
+    except TaskNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except TaskValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    task = result["task"]
+    if result["rebalance"]:
+        background_tasks.add_task(rebalance_column_job, db.get_bind(), task.project_id, task.status)
+    return task
+
 @router.post("/{task_id}/restore", response_model=SuccessResponse)
 def restore_deleted_task(
     task_id: int,
@@ -125,6 +255,58 @@ def restore_deleted_task(
     restore_task(db, task_id)
     return SuccessResponse(result=task_id, detail="Task restored")
 
+@router.post("/{task_id}/subtree/archive", response_model=SuccessResponse)
+def archive_task_subtree(
+    task_id: int,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_active_user)
+):
+    """
+    Архивировать задачу со всеми подзадачами (один запрос).
+    """
+    try:
+        ids = archive_subtree(db, task_id)
+    except TaskNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except TaskValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return SuccessResponse(result=ids, detail=f"{len(ids)} tasks archived")
+
+@router.post("/{task_id}/subtree/restore", response_model=SuccessResponse)
+def restore_task_subtree(
+    task_id: int,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_active_user)
+):
+    """
+    Восстановить архивированную задачу со всеми подзадачами (один запрос).
+    """
+    try:
+        ids = restore_subtree(db, task_id)
+    except TaskNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except TaskValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return SuccessResponse(result=ids, detail=f"{len(ids)} tasks restored")
+
+@router.post("/{task_id}/subtree/reparent", response_model=SuccessResponse)
+def reparent_task_subtree(
+    task_id: int,
+    data: TaskReparent,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_active_user)
+):
+    """
+    Перенести задачу с подзадачами под другого родителя (в т.ч. в другой проект).
+    """
+    try:
+        ids = reparent_subtree(db, task_id, data.parent_task_id)
+    except TaskNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except TaskValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return SuccessResponse(result=ids, detail=f"{len(ids)} tasks moved")
+
 @router.get("/{task_id}/ai_context", response_model=Dict[str, Any])
 def get_task_ai_context(
     task_id: int,
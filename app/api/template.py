@@ -13,6 +13,9 @@ from app.crud.template import (
     delete_template,
     clone_template_to_project,
 )
+from app.core.exceptions import ProjectValidationError
+from app.core.fieldsets import split_fields
+from app.core.serialization import orm_list_response
 from app.dependencies import get_db, get_current_active_user
 from app.schemas.response import SuccessResponse
 
@@ -52,6 +55,7 @@ def list_templates(
     is_active: Optional[bool] = Query(None),
     subscription_level: Optional[str] = Query(None),
     tag: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. title,status (default: short view)"),
     db: Session = Depends(get_db),
     user=Depends(get_current_active_user)
 ):
@@ -64,8 +68,15 @@ def list_templates(
     if subscription_level:
         filters["subscription_level"] = subscription_level
     if tag:
-        filters["tags"] = [tag]
-    return get_all_templates(db, filters=filters)
+        filters["tag"] = tag
+    field_list = split_fields(fields)
+    try:
+        templates = get_all_templates(db, filters=filters, fields=field_list)
+    except ProjectValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if field_list:
+        return orm_list_response(templates, TemplateRead, fields=field_list)
+    return orm_list_response(templates, TemplateShort)
 
 @router.patch("/{template_id}", response_model=TemplateRead)
 def update_one_template(
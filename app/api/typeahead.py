@@ -0,0 +1,27 @@
+#app/api/typeahead.py
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.schemas.typeahead import TypeaheadResults
+from app.services.typeahead import TypeaheadQueryError, typeahead
+from app.core.fieldsets import split_fields
+from app.dependencies import get_db, get_current_active_user
+
+router = APIRouter(prefix="/typeahead", tags=["Search"])
+
+@router.get("/", response_model=TypeaheadResults)
+def quick_switcher(
+    q: str = Query(..., min_length=1, max_length=100),
+    types: Optional[str] = Query(None, description="task,project,tag,user"),
+    limit: int = Query(10, ge=1, le=10),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_active_user)
+):
+    """
+    Подсказки для quick-switcher: префиксное совпадение + опечатки (pg_trgm / trie).
+    """
+    try:
+        hits = typeahead(db, q, kinds=split_fields(types), limit=limit)
+    except TypeaheadQueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return TypeaheadResults(query=q, hits=hits)
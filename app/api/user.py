@@ -12,6 +12,8 @@ from app.crud.user import (
     get_users,
     soft_delete_user,
 )
+from app.core.exceptions import ProjectValidationError
+from app.core.serialization import orm_list_response
 from app.dependencies import get_db, get_current_active_user
 from app.schemas.response import SuccessResponse
 
@@ -64,7 +66,11 @@ def list_users(
         filters["role"] = role
     if search:
         filters["search"] = search
-    return get_users(db, filters=filters)
+    try:
+        users = get_users(db, filters=filters)
+    except ProjectValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return orm_list_response(users, UserRead)
 
 @router.patch("/{user_id}", response_model=UserRead)
 def patch_user(
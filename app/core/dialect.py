@@ -0,0 +1,12 @@
+#app/core/dialect.py
+from sqlalchemy.orm import Session
+
+def dialect_name(db: Session) -> str:
+    return db.get_bind().dialect.name
+
+def is_postgres(db: Session) -> bool:
+    """
+    Postgres-специфичные пути (ON CONFLICT, JSONB, tsvector) включаются только здесь,
+    остальные диалекты (SQLite в локальных тестах) идут по переносимому fallback.
+    """
+    return dialect_name(db) == "postgresql"
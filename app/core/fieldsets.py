@@ -0,0 +1,59 @@
+#app/core/fieldsets.py
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import defer, load_only
+
+class InvalidFieldset(ValueError):
+    """В fields= запрошено поле, которого нет у ресурса."""
+    pass
+
+def check_fields(schema, fields: Sequence[str]) -> None:
+    """
+    fields= допускает только поля схемы ответа: orm_rows отдаёт строки мимо
+    response_model, и колонка вне схемы (rank, tasks_total, ...) иначе ушла бы клиенту.
+    """
+    allowed = schema.model_fields
+    unknown = [name for name in fields if name not in allowed]
+    if unknown:
+        raise InvalidFieldset(f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(sorted(allowed))}.")
+
+def split_fields(raw: Optional[str]) -> Optional[List[str]]:
+    """
+    "title,status, deadline" -> ["title", "status", "deadline"]; пусто -> None (вид по умолчанию).
+    """
+    if not raw:
+        return None
+    names = [name.strip() for name in raw.split(",") if name.strip()]
+    return list(dict.fromkeys(names)) or None
+
+def fieldset_options(
+    model,
+    schema,
+    fields: Optional[Sequence[str]],
+    heavy: Iterable[str],
+    required: Sequence[str] = ("id",),
+    derived: Optional[Dict[str, Tuple[str, ...]]] = None,
+) -> list:
+    """
+    Loader-опции для списка:
+      fields=None -> все колонки, кроме тяжёлых (heavy — defer);
+      fields=[...] -> load_only(required + запрошенные колонки); поля — из schema (check_fields).
+    derived — вычисляемые свойства модели и колонки, из которых они считаются.
+    """
+    if fields is None:
+        return [defer(getattr(model, name)) for name in heavy]
+
+    check_fields(schema, fields)
+    derived = derived or {}
+    columns = {attr.key for attr in sa_inspect(model).column_attrs}
+    unknown = [name for name in fields if name not in columns and name not in derived]
+    if unknown:
+        raise InvalidFieldset(
+            f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(sorted(columns | set(derived)))}."
+        )
+
+    load = dict.fromkeys(required)
+    for name in fields:
+        load.update(dict.fromkeys(derived.get(name, (name,))))
+    return [load_only(*(getattr(model, name) for name in load))]
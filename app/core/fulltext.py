@@ -0,0 +1,105 @@
+#app/core/fulltext.py
+"""
+Полнотекстовый поиск в двух диалектах:
+  Postgres — generated-колонки search_vector (tsvector, конфиг 'simple') + GIN.
+             Они создаются только миграцией f2c7a5d1e903 и не описаны в моделях,
+             чтобы create_all продолжал работать на SQLite.
+  SQLite   — FTS5 external-content таблицы <table>_fts + триггеры синхронизации,
+             создаются после Base.metadata.create_all (локальные тесты).
+"""
+import re
+from typing import List
+
+from sqlalchemy import Boolean, String, event, inspect as sa_inspect, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.sql.visitors import InternalTraversal
+from sqlalchemy.types import TypeDecorator
+
+from app.models.base import Base
+
+SEARCH_CONFIG = "simple"
+MAX_SEARCH_TERMS = 8
+
+# Таблица -> колонки документа (в Postgres первая получает вес A, остальные — B)
+FTS_SOURCES = {
+    "tasks": ("title", "description"),
+    "projects": ("name", "description"),
+    "devlog_entries": ("content",),
+    "chat_messages": ("content",),
+}
+
+def search_terms(raw: str) -> List[str]:
+    """Слова запроса без операторов — пользовательский ввод не ломает синтаксис tsquery/MATCH."""
+    return re.findall(r"\w+", (raw or "").lower())[:MAX_SEARCH_TERMS]
+
+class FtsQuery(TypeDecorator):
+    """
+    Bind-тип поискового запроса: все слова обязательны, последнее — и каждое — по префиксу.
+    Postgres: 'foo:* & bar:*' (для to_tsquery); SQLite: '"foo"* "bar"*' (для MATCH).
+    """
+    impl = String
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        terms = search_terms(value)
+        if dialect.name == "sqlite":
+            return " ".join(f'"{term}"*' for term in terms)
+        return " & ".join(f"{term}:*" for term in terms)
+
+class FullTextMatch(ColumnElement):
+    """
+    WHERE-условие "строка table_name совпадает с query"; SQL зависит от диалекта.
+    """
+    type = Boolean()
+    inherit_cache = True
+    _traverse_internals = [
+        ("table_name", InternalTraversal.dp_string),
+        ("id_column", InternalTraversal.dp_clauseelement),
+        ("query", InternalTraversal.dp_clauseelement),
+    ]
+
+    def __init__(self, table_name: str, id_column, query):
+        self.table_name = table_name
+        self.id_column = id_column
+        self.query = query
+
+@compiles(FullTextMatch)
+def _match_postgres(element, compiler, **kw):
+    query = compiler.process(element.query, **kw)
+    return f"{element.table_name}.search_vector @@ to_tsquery('{SEARCH_CONFIG}', {query})"
+
+@compiles(FullTextMatch, "sqlite")
+def _match_sqlite(element, compiler, **kw):
+    fts = f"{element.table_name}_fts"
+    return (
+        f"{compiler.process(element.id_column, **kw)} IN "
+        f"(SELECT rowid FROM {fts} WHERE {fts} MATCH {compiler.process(element.query, **kw)})"
+    )
+
+def _sqlite_fts_ddl(table: str, columns) -> List[str]:
+    fts = f"{table}_fts"
+    cols = ", ".join(columns)
+    new_values = ", ".join(f"new.{c}" for c in columns)
+    old_values = ", ".join(f"old.{c}" for c in columns)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({cols}, content='{table}', content_rowid='id')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_values}); END",
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+@event.listens_for(Base.metadata, "after_create")
+def install_sqlite_fts(target, connection, **kw):
+    if connection.dialect.name != "sqlite":
+        return
+    existing = set(sa_inspect(connection).get_table_names())
+    for table, columns in FTS_SOURCES.items():
+        if table in existing:
+            for statement in _sqlite_fts_ddl(table, columns):
+                connection.execute(text(statement))
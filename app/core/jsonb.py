@@ -0,0 +1,101 @@
+#app/core/jsonb.py
+from typing import Any, List
+
+from sqlalchemy import Boolean, Text, cast, func, literal, literal_column, or_, select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.sql.visitors import InternalTraversal
+from sqlalchemy.dialects.postgresql import JSONB
+
+class JsonContains(ColumnElement):
+    """
+    "JSON column содержит value"; SQL зависит от диалекта (как FullTextMatch в app/core/fulltext.py).
+    Условия фильтров кешируются без привязки к диалекту, поэтому выбор — при компиляции.
+    """
+    type = Boolean()
+    inherit_cache = True
+    _traverse_internals = [
+        ("column", InternalTraversal.dp_clauseelement),
+        ("value", InternalTraversal.dp_clauseelement),
+    ]
+
+    def __init__(self, column, value):
+        self.column = column
+        self.value = value
+
+@compiles(JsonContains)
+def _contains_postgres(element, compiler, **kw):
+    # column @> value::jsonb — форма, которую обслуживают GIN-индексы с jsonb_path_ops.
+    # Колонка обычного JSON (users.roles) приводится к jsonb
+    column = element.column
+    if not isinstance(column.type.dialect_impl(compiler.dialect), JSONB):
+        column = cast(column, JSONB)
+    return f"{compiler.process(column, **kw)} @> {compiler.process(element.value, **kw)}"
+
+@compiles(JsonContains, "sqlite")
+def _contains_sqlite(element, compiler, **kw):
+    # Каждый элемент value есть в column: для объекта — с тем же ключом, для массива — где угодно.
+    # Один уровень вложенности (custom_fields, массивы тегов/ролей); тип JSON учитывается: "5" != 5
+    column = compiler.process(element.column, **kw)
+    value = compiler.process(element.value, **kw)
+    return (
+        f"NOT EXISTS (SELECT 1 FROM json_each({value}) AS p WHERE NOT EXISTS ("
+        f"SELECT 1 FROM json_each({column}) AS c WHERE c.type = p.type AND c.value IS p.value "
+        f"AND (json_type({value}) = 'array' OR c.key = p.key)))"
+    )
+
+def json_contains(column, value: Any):
+    """
+    column @> value::jsonb (в SQLite — эквивалент через json_each).
+    value — python-значение или готовый bindparam(type_=JSONB) (app/crud/filters.py).
+    """
+    if not isinstance(value, ColumnElement):
+        value = literal(value, JSONB)
+    return JsonContains(column, value)
+
+def _value_variants(value: Any) -> List[Any]:
+    # Раньше сравнивали custom_fields[key].astext == str(value): "5" и 5 совпадали.
+    # Сохраняем это поведение, перебирая JSON-представления значения.
+    variants = [value]
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in ("true", "false"):
+            variants.append(lowered == "true")
+        else:
+            for cast_to in (int, float):
+                try:
+                    variants.append(cast_to(value))
+                    break
+                except ValueError:
+                    continue
+    elif value is not None:
+        variants.append(str(value).lower() if isinstance(value, bool) else str(value))
+    return variants
+
+def json_field_equals(column, key: str, value: Any):
+    """
+    custom_fields->key = value через containment (OR по вариантам — BitmapOr по GIN).
+    """
+    return or_(*[json_contains(column, {key: variant}) for variant in _value_variants(value)])
+
+def json_array_append(column, value: Any, postgres: bool):
+    """
+    SQL-выражение "JSON-массив column + value" для SET в set-based UPDATE.
+    NULL считается пустым массивом; проверка "уже есть" — на вызывающем (WHERE).
+    """
+    if postgres:
+        return func.coalesce(column, literal([], JSONB)).op("||", return_type=JSONB())(func.jsonb_build_array(cast(value, Text)))
+    return func.json_insert(func.coalesce(column, func.json_array()), "$[#]", value)
+
+def json_array_remove(column, value: str, postgres: bool):
+    """SQL-выражение "JSON-массив column без строковых элементов value" (jsonb - text / json_each)."""
+    if postgres:
+        # Явный text: у jsonb есть и "- integer", и "- text[]"
+        return column.op("-", return_type=JSONB())(cast(value, Text))
+    element = literal_column("value")
+    return (
+        select(func.json_group_array(element))
+        .select_from(func.json_each(column))
+        .where(element != value)
+        .scalar_subquery()
+    )
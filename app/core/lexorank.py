@@ -0,0 +1,89 @@
+#app/core/lexorank.py
+"""
+Дробные лексикографические ранги (LexoRank-подобные) для ручного порядка задач.
+
+Ранг — строка из DIGITS (base36), сравнивается побайтно (в Postgres — COLLATE "C").
+Между любыми двумя рангами всегда есть третий, поэтому перемещение карточки —
+запись одной строки. Ранги не заканчиваются на "0": иначе между "a" и "a0" ничего нет.
+Добавление в конец колонки — фиксированный шаг (rank_after), длина не растёт.
+Длина растёт только при многократной вставке в одно место — тогда колонку
+перенумеровывает rank_sequence() (app/services/task_ranking.py).
+"""
+import re
+from typing import List, Optional
+
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+MAX_RANK_LENGTH = 64          # размер колонки tasks.rank
+APPEND_WIDTH = 6              # ширина рангов, добавляемых в конец колонки
+APPEND_STEP = BASE ** 2       # шаг между ними (как spacing в rank_sequence)
+_VALID = re.compile(r"^[0-9a-z]*[1-9a-z]$")
+
+class InvalidRank(ValueError):
+    pass
+
+def is_valid_rank(rank: str) -> bool:
+    return bool(rank) and bool(_VALID.match(rank))
+
+def _midpoint(a: str, b: Optional[str]) -> str:
+    # a < b (b=None — "бесконечность"), оба без хвостовых нулей; a может быть ""
+    if b is not None:
+        # Общий префикс (a дополняется нулями) переносится как есть
+        n = 0
+        while n < len(b) and (a[n] if n < len(a) else "0") == b[n]:
+            n += 1
+        if n:
+            return b[:n] + _midpoint(a[n:], b[n:])
+    digit_a = DIGITS.index(a[0]) if a else 0
+    digit_b = DIGITS.index(b[0]) if b is not None else BASE
+    if digit_b - digit_a > 1:
+        return DIGITS[(digit_a + digit_b) // 2]
+    # Соседние цифры: b[0] с хвостом уже больше a; иначе — a[0] + середина хвоста a
+    if b is not None and len(b) > 1:
+        return b[:1]
+    return DIGITS[digit_a] + _midpoint(a[1:], None)
+
+def _digits(value: int, width: int) -> str:
+    digits = []
+    for _ in range(width):
+        value, digit = divmod(value, BASE)
+        digits.append(DIGITS[digit])
+    return "".join(reversed(digits)).rstrip("0")
+
+def rank_after(before: str) -> str:
+    """
+    Ранг в конце колонки: before + APPEND_STEP в ширине max(len(before), APPEND_WIDTH).
+    Середина между before и "бесконечностью" удлиняла бы ранг на символ каждые ~5 добавлений;
+    фиксированный шаг — нет (ширина растёт, только когда before упирается в "zzz...").
+    """
+    width = max(len(before), APPEND_WIDTH)
+    value = int(before.ljust(width, "0"), BASE)
+    while value + APPEND_STEP >= BASE ** width:
+        width += 1
+        value *= BASE
+    return _digits(value + APPEND_STEP, width)
+
+def rank_between(before: Optional[str], after: Optional[str]) -> str:
+    """
+    Ранг строго между before и after (None — начало/конец колонки).
+    rank_between(None, None) — первый ранг пустой колонки.
+    """
+    for rank in (before, after):
+        if rank is not None and not is_valid_rank(rank):
+            raise InvalidRank(f"Invalid rank {rank!r}.")
+    if before is not None and after is not None and before >= after:
+        raise InvalidRank(f"Rank {before!r} must be less than {after!r}.")
+    if before is not None and after is None:
+        return rank_after(before)
+    return _midpoint(before or "", after)
+
+def rank_sequence(count: int, spacing: int = BASE ** 2) -> List[str]:
+    """
+    count равномерно разнесённых возрастающих рангов одинаковой ширины
+    (между соседними ~spacing свободных позиций) — для перенумерации колонки.
+    """
+    width = 1
+    while BASE ** width < (count + 1) * spacing:
+        width += 1
+    step = BASE ** width // (count + 1)
+    return [_digits(i * step, width) for i in range(1, count + 1)]
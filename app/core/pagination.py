@@ -0,0 +1,73 @@
+#app/core/pagination.py
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Optional, Tuple
+
+from sqlalchemy import and_, or_
+
+class InvalidCursor(ValueError):
+    """Курсор повреждён или выдан для другой сортировки."""
+    pass
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+def _load_value(raw: Any, value_type: type) -> Any:
+    if raw is None:
+        return None
+    if value_type is datetime:
+        return datetime.fromisoformat(raw)
+    if value_type is date:
+        return date.fromisoformat(raw)
+    return value_type(raw)
+
+def encode_cursor(sort_by: str, value: Any, row_id: int) -> str:
+    """
+    Непрозрачный курсор: base64url(JSON [sort_by, значение ключа, id]).
+    """
+    payload = json.dumps([sort_by, _dump_value(value), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, sort_by: str, value_type: type) -> Tuple[Any, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, raw_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if cursor_sort != sort_by:
+            raise InvalidCursor(f"Cursor was issued for sort_by='{cursor_sort}', not '{sort_by}'.")
+        return _load_value(raw_value, value_type), int(row_id)
+    except InvalidCursor:
+        raise
+    except Exception:
+        raise InvalidCursor("Invalid pagination cursor.")
+
+def keyset_order_by(column, id_column, descending: bool) -> tuple:
+    """
+    ORDER BY для keyset-пагинации: NULL всегда в конце, id — tie-breaker.
+    """
+    if descending:
+        return column.desc().nulls_last(), id_column.desc()
+    return column.asc().nulls_last(), id_column.asc()
+
+def keyset_clause(column, id_column, descending: bool, value: Any, row_id: int):
+    """
+    WHERE для строк строго после (value, row_id) в порядке keyset_order_by.
+    """
+    after_id = id_column < row_id if descending else id_column > row_id
+    if value is None:
+        # Уже в хвосте из NULL — идём только по id
+        return and_(column.is_(None), after_id)
+    after_value = column < value if descending else column > value
+    return or_(after_value, and_(column == value, after_id), column.is_(None))
+
+def next_cursor_for(rows: list, limit: int, sort_by: str, value_getter) -> Tuple[list, Optional[str]]:
+    """
+    rows выбраны с limit + 1: лишняя строка означает, что есть следующая страница.
+    """
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(sort_by, value_getter(last), last.id)
@@ -0,0 +1,55 @@
+#app/core/row_counts.py
+"""
+Подсчёт строк для total_count списков.
+
+COUNT(*) по фильтру читает все подходящие строки — на большой ленте это дороже
+самой страницы. Поэтому режим выбирает вызывающий:
+- "exact"     — SELECT count(*) FROM (statement);
+- "estimated" — оценка планировщика Postgres (EXPLAIN, статистика pg_class/pg_stats):
+                стоит одного планирования запроса, точность — как у ANALYZE;
+                в остальных диалектах (SQLite в локальных тестах) — точный подсчёт;
+- "none"      — не считать (бесконечная прокрутка по курсору).
+"""
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from app.core.dialect import is_postgres
+
+COUNT_MODES = ("exact", "estimated", "none")
+
+class _Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) <statement>: параметры привязываются как у самого запроса."""
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+def exact_count(db: Session, statement, params: Optional[Dict[str, Any]] = None) -> int:
+    return db.execute(select(func.count()).select_from(statement.subquery()), params or {}).scalar_one()
+
+def estimated_count(db: Session, statement, params: Optional[Dict[str, Any]] = None) -> int:
+    """Plan Rows верхнего узла плана; только Postgres."""
+    plan = db.execute(_Explain(statement.order_by(None).limit(None).offset(None)), params or {}).scalar_one()
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+def count_rows(db: Session, statement, params: Optional[Dict[str, Any]] = None,
+               mode: str = "exact") -> Tuple[Optional[int], str]:
+    """
+    (total_count, фактический режим): "estimated" вне Postgres считается точно,
+    "none" -> (None, "none"). Неизвестный режим — ValueError.
+    """
+    if mode not in COUNT_MODES:
+        raise ValueError(f"Unknown count mode '{mode}'. Available: {', '.join(COUNT_MODES)}.")
+    if mode == "none":
+        return None, mode
+    if mode == "estimated" and is_postgres(db):
+        return estimated_count(db, statement, params), mode
+    return exact_count(db, statement, params), "exact"
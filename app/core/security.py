@@ -65,3 +65,9 @@ def get_current_user(token: str = Depends(oauth2_scheme)) -> dict:
             headers={"WWW-Authenticate": "Bearer"},
         )
     return payload
+
+def ensure_superuser(user) -> None:
+    """Сервисные операции (пересчёты, обслуживание партиций) — только для суперпользователя."""
+    is_superuser = user.get("is_superuser") if isinstance(user, dict) else getattr(user, "is_superuser", False)
+    if not is_superuser:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Superuser privileges required")
@@ -0,0 +1,51 @@
+#app/core/serialization.py
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from fastapi.responses import ORJSONResponse
+
+# Быстрый путь для списков: ORM -> dict по полям схемы -> orjson, без построения
+# pydantic-моделей на каждую строку. datetime/date/Enum orjson кодирует сам,
+# JSON-колонки уже являются dict/list.
+
+@lru_cache(maxsize=None)
+def _plan(schema: type, attrs: Tuple[Tuple[str, str], ...],
+          fields: Optional[Tuple[str, ...]] = None) -> Tuple[Tuple[str, str, Any], ...]:
+    """
+    (имя поля, атрибут ORM, default) для схемы — считается один раз на схему.
+    fields — sparse fieldset: id + запрошенные поля в порядке запроса.
+    """
+    renamed = dict(attrs)
+    schema_fields = schema.model_fields
+    names = list(schema_fields) if fields is None else list(dict.fromkeys(("id", *fields)))
+    plan = []
+    for name in names:
+        field = schema_fields.get(name)
+        if field is None:
+            # Вне схемы ответа — не отдаётся (fields= проверяет app.core.fieldsets.check_fields)
+            continue
+        default = None if field.is_required() else field.get_default(call_default_factory=True)
+        plan.append((name, renamed.get(name, name), default))
+    return tuple(plan)
+
+def orm_rows(objs: Iterable[Any], schema: type, attrs: Optional[Dict[str, str]] = None,
+             fields: Optional[Sequence[str]] = None) -> List[dict]:
+    """
+    Строки для ответа в форме schema; attrs — поле схемы -> атрибут ORM,
+    если они называются по-разному (metadata -> metadata_).
+    NULL в колонке заменяется default-ом поля ([] / {} / False), как отдала бы схема;
+    JSON-колонки отдаются как сохранены (вложенные схемы не перепроверяются).
+    """
+    plan = _plan(schema, tuple(sorted((attrs or {}).items())), tuple(fields) if fields is not None else None)
+    rows = []
+    for obj in objs:
+        row = {}
+        for name, attr, default in plan:
+            value = getattr(obj, attr, None)
+            row[name] = default if value is None else value
+        rows.append(row)
+    return rows
+
+def orm_list_response(objs: Iterable[Any], schema: type, attrs: Optional[Dict[str, str]] = None,
+                      fields: Optional[Sequence[str]] = None) -> ORJSONResponse:
+    return ORJSONResponse(orm_rows(objs, schema, attrs, fields))
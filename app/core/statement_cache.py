@@ -0,0 +1,33 @@
+#app/core/statement_cache.py
+import threading
+from collections import Counter
+from typing import Dict
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Счётчики попаданий в кеш скомпилированного SQL по всем Engine процесса.
+# context.cache_hit: CACHE_HIT / CACHE_MISS / CACHING_DISABLED / NO_CACHE_KEY / NO_DIALECT_SUPPORT
+_counts: Counter = Counter()
+_lock = threading.Lock()
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _count_cache_hit(conn, cursor, statement, parameters, context, executemany):
+    cache_hit = getattr(context, "cache_hit", None)
+    if cache_hit is None:
+        return
+    with _lock:
+        _counts[cache_hit.name.lower()] += 1
+
+def compiled_cache_stats() -> Dict[str, object]:
+    with _lock:
+        counts = dict(_counts)
+    hits, misses = counts.get("cache_hit", 0), counts.get("cache_miss", 0)
+    return {
+        "counts": counts,
+        "hit_rate": round(hits / (hits + misses), 4) if hits + misses else None,
+    }
+
+def reset_compiled_cache_stats() -> None:
+    with _lock:
+        _counts.clear()
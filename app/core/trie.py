@@ -0,0 +1,147 @@
+#app/core/trie.py
+"""
+Префиксное дерево для typeahead в памяти процесса (теги, имена проектов).
+Каждый узел хранит top-K элементов своего поддерева, поэтому автодополнение —
+это спуск по префиксу (O(len(q))) плюс слияние нескольких готовых списков.
+Опечатки: поиск с расстоянием Дамерау-Левенштейна <= max_edits между запросом
+и префиксом ключа (строки DP пересчитываются по мере спуска, ветки без шанса отсекаются).
+"""
+import heapq
+import re
+from itertools import chain
+from typing import Any, Dict, Hashable, List, Tuple
+
+TOP_K = 10
+
+# (weight, label, payload): label — что показываем, payload — что отдаём (id и т.п.)
+Item = Tuple[float, str, Any]
+
+def trie_keys(label: str) -> List[str]:
+    """
+    "Rocket launcher" -> ["rocket launcher", "launcher"]: совпадение с начала любого слова.
+    """
+    lowered = label.lower().strip()
+    starts = [m.start() for m in re.finditer(r"\w+", lowered)]
+    return list(dict.fromkeys(lowered[i:] for i in starts)) or ([lowered] if lowered else [])
+
+class _Node:
+    __slots__ = ("children", "top")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.top: List[Item] = []
+
+class PrefixTrie:
+    """
+    trie = PrefixTrie(); trie.add("Rocket launcher", weight=12, payload=7); trie.freeze()
+    trie.complete("laun") / trie.complete("lanch", max_edits=1)
+    """
+
+    def __init__(self, top_k: int = TOP_K):
+        self.top_k = top_k
+        self.root = _Node()
+        self._items: Dict[Hashable, Item] = {}
+        self._frozen = False
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def add(self, label: str, weight: float = 1.0, payload: Any = None) -> None:
+        """Один и тот же (label, payload) суммирует вес (например, частоту тега)."""
+        if self._frozen:
+            raise RuntimeError("PrefixTrie is frozen")
+        key = (label, payload)
+        previous = self._items.get(key)
+        self._items[key] = ((previous[0] if previous else 0) + weight, label, payload)
+
+    def freeze(self) -> "PrefixTrie":
+        """Строит узлы и top-K по поддеревьям; после этого дерево только читается."""
+        terminals: Dict[int, List[Item]] = {}
+        for item in self._items.values():
+            for key in trie_keys(item[1]):
+                node = self.root
+                for char in key:
+                    child = node.children.get(char)
+                    if child is None:
+                        child = node.children[char] = _Node()
+                    node = child
+                terminals.setdefault(id(node), []).append(item)
+        # Снизу вверх: top узла = лучшие K из своих ключей и top детей
+        order = list(self._walk(self.root))
+        for node in reversed(order):
+            own = terminals.get(id(node))
+            if not own and len(node.children) == 1:
+                # Цепочка без ветвления — тот же список, что у единственного ребёнка
+                node.top = next(iter(node.children.values())).top
+                continue
+            candidates = chain(own or (), *(child.top for child in node.children.values()))
+            unique = {(item[1], item[2]): item for item in candidates}
+            node.top = heapq.nlargest(self.top_k, unique.values(), key=_rank)
+        self._frozen = True
+        return self
+
+    def _walk(self, node: _Node) -> List[_Node]:
+        # Прямой обход (родитель раньше детей)
+        order, stack = [], [node]
+        while stack:
+            current = stack.pop()
+            order.append(current)
+            stack.extend(current.children.values())
+        return order
+
+    def complete(self, prefix: str, limit: int = TOP_K, max_edits: int = 0) -> List[Tuple[int, Item]]:
+        """
+        [(edits, item)] — сначала точные совпадения префикса, затем с опечатками;
+        внутри группы — по весу.
+        """
+        query = prefix.lower().strip()
+        if not query:
+            return []
+        matches = self._exact(query) if max_edits <= 0 else self._fuzzy(query, max_edits)
+        best: Dict[Hashable, Tuple[int, Item]] = {}
+        for edits, node in sorted(matches, key=lambda match: match[0]):
+            for item in node.top:
+                key = (item[1], item[2])
+                if key not in best:
+                    best[key] = (edits, item)
+        ranked = sorted(best.values(), key=lambda hit: (hit[0], -hit[1][0], len(hit[1][1]), hit[1][1]))
+        return ranked[:limit]
+
+    def _exact(self, query: str) -> List[Tuple[int, _Node]]:
+        node = self.root
+        for char in query:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return [(0, node)]
+
+    def _fuzzy(self, query: str, max_edits: int) -> List[Tuple[int, _Node]]:
+        # Узлы, путь к которым отличается от query не более чем на max_edits правок
+        # (Дамерау-Левенштейн: перестановка соседних букв — одна правка)
+        matches: List[Tuple[int, _Node]] = []
+        first_row = list(range(len(query) + 1))
+        stack = [(self.root, "", None, first_row)]
+        while stack:
+            node, last_char, before, previous = stack.pop()
+            for char, child in node.children.items():
+                row = [previous[0] + 1]
+                for i, query_char in enumerate(query, start=1):
+                    cost = min(
+                        row[i - 1] + 1,
+                        previous[i] + 1,
+                        previous[i - 1] + (query_char != char),
+                    )
+                    if before is not None and i > 1 and query_char == last_char and query[i - 2] == char:
+                        cost = min(cost, before[i - 2] + 1)
+                    row.append(cost)
+                if row[-1] <= max_edits:
+                    # Поддерево уже совпадает: его top достаточно
+                    matches.append((row[-1], child))
+                    if row[-1] == 0:
+                        continue
+                if min(row) <= max_edits:
+                    stack.append((child, char, previous, row))
+        return matches
+
+def _rank(item: Item):
+    return (item[0], -len(item[1]))
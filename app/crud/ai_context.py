@@ -2,6 +2,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from app.models.ai_context import AIContext
 from app.core.exceptions import ProjectValidationError
+from app.crud.filters import AI_CONTEXT_FILTERS
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
@@ -62,21 +63,8 @@ def get_ai_contexts(
     limit: int = 50,
     offset: int = 0
 ) -> List[AIContext]:
-    filters = filters or {}
-    query = db.query(AIContext)
-    if "object_type" in filters:
-        query = query.filter(AIContext.object_type == filters["object_type"])
-    if "object_id" in filters:
-        query = query.filter(AIContext.object_id == filters["object_id"])
-    if "created_by" in filters:
-        query = query.filter(AIContext.created_by == filters["created_by"])
-    if "request_id" in filters:
-        query = query.filter(AIContext.request_id == filters["request_id"])
-    if "created_after" in filters:
-        query = query.filter(AIContext.created_at >= filters["created_after"])
-    if "created_before" in filters:
-        query = query.filter(AIContext.created_at <= filters["created_before"])
-    return query.order_by(AIContext.created_at.desc()).limit(limit).offset(offset).all()
+    query = AI_CONTEXT_FILTERS.apply(db.query(AIContext), filters)
+    return query.limit(limit).offset(offset).all()
 
 def update_ai_context(
     db: Session,
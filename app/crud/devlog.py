@@ -1,15 +1,23 @@
 #app/crud/devlog.py
 from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 from app.models.devlog import DevLogEntry
 from app.core.exceptions import DevLogNotFound, DevLogValidationError
 from app.core.custom_fields import CUSTOM_FIELDS_SCHEMA
+from app.core.fieldsets import InvalidFieldset, fieldset_options
+from app.core.pagination import InvalidCursor, decode_cursor, keyset_clause, keyset_order_by, next_cursor_for
+from app.core.row_counts import count_rows
+from app.crud.filters import DEVLOG_FILTERS
+from app.schemas.devlog import DevLogRead
+from app.services.devlog_partitions import maintain_partitions
 import logging
 
 logger = logging.getLogger("DevOS.DevLog")
 
-def validate_custom_fields_payload(custom_fields)
+def validate_custom_fields_payload(custom_fields):
     for key, value in custom_fields.items():
         schema = CUSTOM_FIELDS_SCHEMA.get(key)
         if not schema:
@@ -123,51 +131,31 @@ def restore_entry(db: Session, entry_id: int) -> bool:
         logger.error(f"Failed to restore DevLog entry: {e}")
         raise DevLogValidationError(f"DB error: {e}")
 
-def get_entries(db: Session, filters: dict = None, page: int = 1, per_page: int = 20) -> dict:
-    query = db.query(DevLogEntry)
-    filters = filters or {}
-
-    show_archived = filters.get("show_archived", False)
-    if not show_archived:
-        query = query.filter(DevLogEntry.is_deleted == False)
-
-    if "project_id" in filters:
-        query = query.filter(DevLogEntry.project_id == filters["project_id"])
-    if "task_id" in filters:
-        query = query.filter(DevLogEntry.task_id == filters["task_id"])
-    if "entry_type" in filters and filters["entry_type"] != "all":
-        query = query.filter(DevLogEntry.entry_type == filters["entry_type"])
-    if "author" in filters and filters["author"]:
-        query = query.filter(DevLogEntry.author.ilike(f"%{filters['author']}%"))
-    if "tag" in filters and filters["tag"]:
-        query = query.filter(DevLogEntry.tags.contains([filters["tag"]]))
-
-    if "date_from" in filters and filters["date_from"]:
-        try:
-            date_from_obj = datetime.strptime(str(filters["date_from"]), "%Y-%m-%d").date()
-            query = query.filter(DevLogEntry.created_at >= date_from_obj)
-        except ValueError:
-            logger.warning(f"Invalid date_from format: {filters['date_from']}. Expected YYYY-MM-DD.")
-
-    if "date_to" in filters and filters["date_to"]:
-        try:
-            date_to_obj = datetime.strptime(str(filters["date_to"]), "%Y-%m-%d").date()
-            end_of_day_to = datetime.combine(date_to_obj, datetime.max.time())
-            query = query.filter(DevLogEntry.created_at <= end_of_day_to)
-        except ValueError:
-            logger.warning(f"Invalid date_to format: {filters['date_to']}. Expected YYYY-MM-DD.")
+# content остаётся — он есть в DevLogShort
+DEVLOG_HEAVY_COLUMNS = ("custom_fields", "attachments", "ai_notes")
 
-    if "search" in filters and filters["search"]:
-        search_term = f"%{filters['search']}%"
-        query = query.filter(DevLogEntry.content.ilike(search_term))
+def count_entries(db: Session, filters: dict = None, count: str = "exact") -> Dict:
+    """
+    total_count ленты по filters: {"total_count": int | None, "count": фактический режим}.
+    count — "exact", "estimated" (оценка планировщика) или "none" (app/core/row_counts.py).
+    """
+    clauses, params = DEVLOG_FILTERS.where(filters)
+    try:
+        total_count, mode = count_rows(db, select(DevLogEntry.id).where(*clauses), params, count)
+    except ValueError as e:
+        raise DevLogValidationError(str(e))
+    return {"total_count": total_count, "count": mode}
 
-    if "custom_fields" in filters:
-        for key, value in filters["custom_fields"].items():
-            if key and value:
-                query = query.filter(DevLogEntry.custom_fields[key].astext.ilike(f"%{str(value)}%"))
+def get_entries(db: Session, filters: dict = None, page: int = 1, per_page: int = 20,
+                fields: Optional[List[str]] = None, count: str = "exact") -> dict:
+    try:
+        options = fieldset_options(DevLogEntry, DevLogRead, fields, DEVLOG_HEAVY_COLUMNS)
+    except InvalidFieldset as e:
+        raise DevLogValidationError(str(e))
+    query = DEVLOG_FILTERS.apply(db.query(DevLogEntry).options(*options), filters, ordered=False)
 
-    total_count = query.count()
-    query = query.order_by(DevLogEntry.created_at.desc())
+    total_count = count_entries(db, filters, count)["total_count"]
+    query = query.order_by(*DEVLOG_FILTERS.order_by())
 
     if page < 1: page = 1
     if per_page < 1: per_page = 1
@@ -176,6 +164,56 @@ def get_entries(db: Session, filters: dict = None, page: int = 1, per_page: int
     entries = query.limit(per_page).offset(offset).all()
     return {"entries": entries, "total_count": total_count}
 
+def get_entries_page(
+    db: Session,
+    filters: dict = None,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    count: str = "none",
+) -> Dict:
+    """
+    Лента для бесконечной прокрутки: keyset по (created_at, id), новые сверху.
+    {"entries", "next_cursor", "total_count", "count"}; total_count считается
+    только по запросу (count) и только на первой странице — дальше он у клиента есть.
+    """
+    try:
+        options = fieldset_options(DevLogEntry, DevLogRead, fields, DEVLOG_HEAVY_COLUMNS, required=("id", "created_at"))
+    except InvalidFieldset as e:
+        raise DevLogValidationError(str(e))
+    query = DEVLOG_FILTERS.apply(db.query(DevLogEntry).options(*options), filters, ordered=False)
+    rows = entries_page_query(query, limit, cursor).all()
+    entries, next_cursor = next_cursor_for(rows, limit, "created_at", lambda e: e.created_at)
+    counted = count_entries(db, filters, "none" if cursor else count)
+    return {"entries": entries, "next_cursor": next_cursor, **counted}
+
+def entries_page_query(query, limit: int, cursor: Optional[str] = None):
+    """
+    Курсор + ORDER BY created_at DESC, id DESC + LIMIT limit+1 поверх ORM Query или Core select().
+    Порядок совпадает с частичными индексами ix_devlog_entries_live_*created_at.
+    """
+    sort = DEVLOG_FILTERS.sort("created_at")
+    if limit < 1:
+        raise DevLogValidationError("Limit must be a positive integer.")
+    if cursor:
+        try:
+            value, last_id = decode_cursor(cursor, "created_at", sort.value_type)
+        except InvalidCursor as e:
+            raise DevLogValidationError(str(e))
+        query = query.filter(keyset_clause(sort.column, DevLogEntry.id, sort.descending, value, last_id))
+    return query.order_by(*keyset_order_by(sort.column, DevLogEntry.id, sort.descending)).limit(limit + 1)
+
+def maintain_devlog_partitions(db: Session, drop: bool = False) -> Dict[str, List[str]]:
+    """Будущие месячные партиции + retention по entry_type (только Postgres)."""
+    try:
+        result = maintain_partitions(db, drop=drop)
+        db.commit()
+        return result
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Failed to maintain DevLog partitions: {e}")
+        raise DevLogValidationError(f"Database error while maintaining partitions: {e}")
+
 def summarize_entry(db: Session, entry_id: int) -> str:
     entry = get_entry(db, entry_id)
     return (
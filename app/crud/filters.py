@@ -0,0 +1,412 @@
+#app/crud/filters.py
+"""
+Декларативные фильтры и сортировки списков — по одной FilterSpec на модель.
+
+Каждый фильтр строит WHERE из именованных bindparam, поэтому набор условий
+зависит только от того, КАКИЕ фильтры активны (сигнатура), а не от значений:
+условия кешируются по сигнатуре, значения уходят параметрами выполнения,
+а SQLAlchemy переиспользует скомпилированный SQL (см. app/core/statement_cache.py).
+"""
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam, false, or_, select
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.core.exceptions import DevLogValidationError, PluginValidationError, ProjectValidationError, TaskValidationError
+from app.core.fulltext import FtsQuery, FullTextMatch, search_terms
+from app.core.jsonb import _value_variants, json_contains
+from app.models.ai_context import AIContext
+from app.models.devlog import DevLogEntry
+from app.models.plugin import Plugin
+from app.models.project import Project
+from app.models.tag import Tag
+from app.models.task import Task
+from app.models.task_assignee import task_assignees
+from app.models.template import Template
+from app.models.user import User
+from app.services.tag_index import TAG_LINKS, entity_column
+
+# --- Приведение и проверка значений (ValueError/TypeError -> ошибка валидации спеки) ---
+
+def _as_str(value: Any) -> str:
+    if not isinstance(value, str):
+        raise TypeError("expected a string")
+    return value
+
+def _as_int(value: Any) -> int:
+    if isinstance(value, bool):
+        raise TypeError("expected an integer")
+    return int(value)
+
+def _as_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.lower() in ("true", "false", "1", "0"):
+        return value.lower() in ("true", "1")
+    raise TypeError("expected a boolean")
+
+def _as_date(value: Any) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value))
+
+def _as_datetime(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime.combine(value, datetime.min.time())
+    return datetime.fromisoformat(str(value))
+
+def _end_of_day(value: Any) -> datetime:
+    return datetime.combine(_as_date(value), datetime.max.time())
+
+def _as_dict(value: Any) -> dict:
+    if not isinstance(value, dict):
+        raise TypeError("expected an object")
+    return value
+
+# --- Фильтры ---
+
+@dataclass(frozen=True)
+class Filter:
+    """
+    build(param, shape) -> SQL-условие; param(key) -> bindparam этого фильтра.
+    params(value) -> значения bindparam; shape(value) — форма условия, если она
+    зависит от значения (ключи custom_fields), иначе None.
+    bind_type — SQL-тип bindparam (JSONB для list/dict, FtsQuery для поиска).
+    """
+    name: str
+    build: Callable[[Callable[[str], Any], Hashable], Any]
+    params: Callable[[Any], Dict[str, Any]] = lambda value: {"v": value}
+    coerce: Callable[[Any], Any] = lambda value: value
+    shape: Callable[[Any], Hashable] = lambda value: None
+    skip: Callable[[Any], bool] = lambda value: False
+    default: Any = None
+    bind_type: Any = None
+
+def equals(name: str, column, coerce=_as_str, all_value: Optional[str] = None) -> Filter:
+    """column = :v; all_value (например "all") отключает фильтр."""
+    return Filter(
+        name, lambda p, _: column == p("v"), coerce=coerce,
+        skip=(lambda value: value == all_value) if all_value is not None else (lambda value: False),
+    )
+
+def at_least(name: str, column, coerce) -> Filter:
+    return Filter(name, lambda p, _: column >= p("v"), coerce=coerce)
+
+def at_most(name: str, column, coerce) -> Filter:
+    return Filter(name, lambda p, _: column <= p("v"), coerce=coerce)
+
+def ilike(name: str, *columns) -> Filter:
+    """Подстрока без учёта регистра в любой из колонок."""
+    return Filter(
+        name, lambda p, _: or_(*[column.ilike(p("v")) for column in columns]),
+        params=lambda value: {"v": f"%{value}%"}, coerce=_as_str,
+    )
+
+def json_has(name: str, column, wrap: Callable[[Any], Any] = lambda value: [value], coerce=_as_str) -> Filter:
+    """column @> wrap(value) — обслуживается GIN jsonb_path_ops."""
+    return Filter(
+        name, lambda p, _: json_contains(column, p("v")),
+        params=lambda value: {"v": wrap(value)}, coerce=coerce, bind_type=JSONB(),
+    )
+
+def json_fields(name: str, column) -> Filter:
+    """
+    custom_fields: key = value для каждой пары (равенство через containment,
+    "5" и 5 совпадают — см. app.core.jsonb.json_field_equals).
+    """
+    def shape(value: dict) -> Hashable:
+        return tuple(len(_value_variants(v)) for _, v in sorted(value.items()))
+
+    def build(p, counts) -> Any:
+        return [
+            or_(*[json_contains(column, p(f"{i}_{j}")) for j in range(count)])
+            for i, count in enumerate(counts)
+        ] or None
+
+    def params(value: dict) -> Dict[str, Any]:
+        return {
+            f"{i}_{j}": {key: variant}
+            for i, (key, v) in enumerate(sorted(value.items()))
+            for j, variant in enumerate(_value_variants(v))
+        }
+
+    return Filter(name, build, params=params, coerce=_as_dict, shape=shape, bind_type=JSONB())
+
+def fulltext(name: str, table_name: str, id_column) -> Filter:
+    """
+    Полнотекстовый поиск по словам (префиксно): tsvector + GIN в Postgres, FTS5 в SQLite.
+    Заменяет ilike('%term%'), который не может использовать индекс.
+    """
+    return Filter(
+        name, lambda p, _: FullTextMatch(table_name, id_column, p("v")),
+        coerce=_as_str, skip=lambda value: not search_terms(value), bind_type=FtsQuery(),
+    )
+
+def tagged(name: str, model) -> Filter:
+    """
+    id IN (сущности с тегом :v) — индекс (tag_id, entity_id) таблицы связей вместо скана JSON.
+    """
+    link, column = TAG_LINKS[model], entity_column(model)
+    return Filter(
+        name,
+        lambda p, _: model.id.in_(select(column).join(Tag, Tag.id == link.c.tag_id).where(Tag.name == p("v"))),
+    )
+
+def assigned_to(name: str) -> Filter:
+    """id IN (задачи пользователя :v) — индекс (user_id, task_id) таблицы task_assignees."""
+    return Filter(
+        name,
+        lambda p, _: Task.id.in_(select(task_assignees.c.task_id).where(task_assignees.c.user_id == p("v"))),
+        coerce=_as_int,
+    )
+
+def live_only(column) -> Filter:
+    """show_archived=False (по умолчанию) -> только неархивные строки."""
+    return Filter(
+        "show_archived", lambda p, _: column == false(), params=lambda value: {},
+        coerce=_as_bool, skip=lambda value: value, default=False,
+    )
+
+# --- Сортировки ---
+
+@dataclass(frozen=True)
+class Sort:
+    column: Any
+    descending: bool = False
+    value_type: type = str   # тип значения ключа в keyset-курсоре
+
+# --- Спека модели ---
+
+@dataclass
+class FilterSpec:
+    name: str
+    model: Any
+    filters: Sequence[Filter]
+    sorts: Dict[str, Sort]
+    default_sort: str
+    error: type = ValueError
+    _by_name: Dict[str, Filter] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._by_name = {f.name: f for f in self.filters}
+        self._clauses = lru_cache(maxsize=256)(self._build_clauses)
+
+    def _param(self, f: Filter) -> Callable[[str], Any]:
+        def param(key: str):
+            return bindparam(f"{self.name}_{f.name}_{key}", type_=f.bind_type)
+        return param
+
+    def _build_clauses(self, signature: Tuple[Tuple[str, Hashable], ...]) -> tuple:
+        clauses = []
+        for name, shape in signature:
+            f = self._by_name[name]
+            built = f.build(self._param(f), shape)
+            if isinstance(built, list):
+                clauses.extend(built)
+            elif built is not None:
+                clauses.append(built)
+        return tuple(clauses)
+
+    def where(self, filters: Optional[dict]) -> Tuple[tuple, Dict[str, Any]]:
+        """
+        (условия WHERE, параметры) для filters; неизвестный фильтр или
+        некорректное значение -> self.error.
+        """
+        filters = filters or {}
+        unknown = [name for name in filters if name not in self._by_name]
+        if unknown:
+            raise self.error(
+                f"Unknown filter(s): {', '.join(unknown)}. Available: {', '.join(sorted(self._by_name))}."
+            )
+        signature, params = [], {}
+        for f in self.filters:
+            value = filters.get(f.name, f.default)
+            if value is None or value == "":
+                continue
+            try:
+                value = f.coerce(value)
+            except (TypeError, ValueError) as e:
+                raise self.error(f"Invalid value for filter '{f.name}': {e}")
+            if f.skip(value):
+                continue
+            signature.append((f.name, f.shape(value)))
+            params.update({f"{self.name}_{f.name}_{key}": v for key, v in f.params(value).items()})
+        return self._clauses(tuple(signature)), params
+
+    def sort(self, sort_by: Optional[str]) -> Sort:
+        sort_by = sort_by or self.default_sort
+        if sort_by not in self.sorts:
+            raise self.error(f"Unsupported sort_by '{sort_by}'. Use one of: {', '.join(self.sorts)}.")
+        return self.sorts[sort_by]
+
+    def order_by(self, sort_by: Optional[str] = None) -> tuple:
+        """ORDER BY по разрешённой (индексированной) колонке + id как tie-breaker."""
+        sort = self.sort(sort_by)
+        if sort.descending:
+            return sort.column.desc().nulls_last(), self.model.id.desc()
+        return sort.column.asc().nulls_last(), self.model.id.asc()
+
+    def apply(self, query, filters: Optional[dict], sort_by: Optional[str] = None, ordered: bool = True):
+        """
+        WHERE (+ ORDER BY) для ORM Query; для Core select() используйте where()
+        и передайте параметры в db.execute(statement, params).
+        """
+        clauses, params = self.where(filters)
+        query = query.filter(*clauses).params(params)
+        return query.order_by(*self.order_by(sort_by)) if ordered else query
+
+    def cache_info(self) -> Dict[str, int]:
+        info = self._clauses.cache_info()
+        return {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+
+# Сортировки ограничены колонками с индексами под (колонка, id) в порядке order_by():
+# миграции c81d4e07f5a2, b6e03f9a4d12, 4f6a0d2c8e15 (частичные is_deleted = false, где список их отсекает)
+TASK_FILTERS = FilterSpec(
+    name="tasks",
+    model=Task,
+    filters=[
+        live_only(Task.is_deleted),
+        equals("project_id", Task.project_id, coerce=_as_int),
+        equals("status", Task.status, all_value="all"),
+        fulltext("search", "tasks", Task.id),
+        at_most("deadline_before", Task.deadline, coerce=_as_date),
+        at_least("deadline_after", Task.deadline, coerce=_as_date),
+        equals("parent_task_id", Task.parent_task_id, coerce=_as_int),
+        equals("priority", Task.priority, coerce=_as_int),
+        tagged("tag", Task),
+        json_fields("custom_fields", Task.custom_fields),
+        assigned_to("assignee_id"),
+        equals("is_favorite", Task.is_favorite, coerce=_as_bool),
+        equals("external_id", Task.external_id),
+        equals("reviewed", Task.reviewed, coerce=_as_bool),
+    ],
+    sorts={
+        "deadline": Sort(Task.deadline, descending=True, value_type=date),
+        "due": Sort(Task.deadline, value_type=date),   # ближайший дедлайн первым (GET /me/tasks)
+        "rank": Sort(Task.rank),                        # ручной порядок доски (внутри project_id + status)
+        "priority": Sort(Task.priority, value_type=int),
+        "created_at": Sort(Task.created_at, descending=True, value_type=datetime),
+    },
+    default_sort="deadline",
+    error=TaskValidationError,
+)
+
+PROJECT_FILTERS = FilterSpec(
+    name="projects",
+    model=Project,
+    filters=[
+        live_only(Project.is_deleted),
+        equals("status", Project.status, all_value="all"),
+        fulltext("search", "projects", Project.id),
+        tagged("tag", Project),
+        equals("deadline", Project.deadline, coerce=_as_date),
+        at_least("deadline_from", Project.deadline, coerce=_as_date),
+        at_most("deadline_to", Project.deadline, coerce=_as_date),
+        equals("priority", Project.priority, coerce=_as_int),
+        json_fields("custom_fields", Project.custom_fields),
+        equals("is_favorite", Project.is_favorite, coerce=_as_bool),
+        equals("subscription_level", Project.subscription_level),
+        equals("external_id", Project.external_id),
+    ],
+    sorts={
+        "created_at": Sort(Project.created_at, descending=True, value_type=datetime),
+        "deadline": Sort(Project.deadline, descending=True, value_type=date),
+        "name": Sort(Project.name),
+        "priority": Sort(Project.priority, value_type=int),
+    },
+    default_sort="created_at",
+    error=ProjectValidationError,
+)
+
+DEVLOG_FILTERS = FilterSpec(
+    name="devlog",
+    model=DevLogEntry,
+    filters=[
+        live_only(DevLogEntry.is_deleted),
+        equals("project_id", DevLogEntry.project_id, coerce=_as_int),
+        equals("task_id", DevLogEntry.task_id, coerce=_as_int),
+        equals("entry_type", DevLogEntry.entry_type, all_value="all"),
+        ilike("author", DevLogEntry.author),
+        tagged("tag", DevLogEntry),
+        at_least("date_from", DevLogEntry.created_at, coerce=_as_datetime),
+        at_most("date_to", DevLogEntry.created_at, coerce=_end_of_day),
+        fulltext("search", "devlog_entries", DevLogEntry.id),
+        json_fields("custom_fields", DevLogEntry.custom_fields),
+    ],
+    sorts={"created_at": Sort(DevLogEntry.created_at, descending=True, value_type=datetime)},
+    default_sort="created_at",
+    error=DevLogValidationError,
+)
+
+TEMPLATE_FILTERS = FilterSpec(
+    name="templates",
+    model=Template,
+    filters=[
+        equals("is_active", Template.is_active, coerce=_as_bool),
+        ilike("name", Template.name),
+        tagged("tag", Template),
+        equals("subscription_level", Template.subscription_level),
+    ],
+    sorts={
+        "created_at": Sort(Template.created_at, descending=True, value_type=datetime),
+        "name": Sort(Template.name),
+    },
+    default_sort="created_at",
+    error=ProjectValidationError,
+)
+
+PLUGIN_FILTERS = FilterSpec(
+    name="plugins",
+    model=Plugin,
+    filters=[
+        equals("is_active", Plugin.is_active, coerce=_as_bool),
+        equals("subscription_level", Plugin.subscription_level),
+        equals("is_private", Plugin.is_private, coerce=_as_bool),
+        tagged("tag", Plugin),
+    ],
+    sorts={"name": Sort(Plugin.name)},
+    default_sort="name",
+    error=PluginValidationError,
+)
+
+USER_FILTERS = FilterSpec(
+    name="users",
+    model=User,
+    filters=[
+        equals("is_active", User.is_active, coerce=_as_bool),
+        # roles — обычный JSON: к jsonb приводит json_contains (в Postgres)
+        json_has("role", User.roles),
+        ilike("search", User.username, User.full_name),
+    ],
+    sorts={"created_at": Sort(User.created_at, descending=True, value_type=datetime)},
+    default_sort="created_at",
+    error=ProjectValidationError,
+)
+
+AI_CONTEXT_FILTERS = FilterSpec(
+    name="ai_contexts",
+    model=AIContext,
+    filters=[
+        equals("object_type", AIContext.object_type),
+        equals("object_id", AIContext.object_id, coerce=_as_int),
+        equals("created_by", AIContext.created_by),
+        equals("request_id", AIContext.request_id),
+        at_least("created_after", AIContext.created_at, coerce=_as_datetime),
+        at_most("created_before", AIContext.created_at, coerce=_as_datetime),
+    ],
+    sorts={"created_at": Sort(AIContext.created_at, descending=True, value_type=datetime)},
+    default_sort="created_at",
+    error=ProjectValidationError,
+)
+
+FILTER_SPECS: List[FilterSpec] = [
+    TASK_FILTERS, PROJECT_FILTERS, DEVLOG_FILTERS, TEMPLATE_FILTERS,
+    PLUGIN_FILTERS, USER_FILTERS, AI_CONTEXT_FILTERS,
+]
@@ -1,4 +1,5 @@
 #app/crud/jarvis.py
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from app.models.jarvis import ChatMessage
 import datetime
@@ -66,30 +67,34 @@ def get_history(
     include_deleted: bool = False,
 ) -> List[ChatMessage]:
     """Возвращает историю чата для проекта, старые сообщения первыми (ASC)."""
+    statement = history_statement(select(ChatMessage), project_id, limit, offset, include_deleted)
+    return db.execute(statement).scalars().all()
+
+def history_statement(statement, project_id: int, limit: Optional[int] = None,
+                      offset: Optional[int] = None, include_deleted: bool = False):
+    """
+    Фильтры/сортировка истории поверх select(ChatMessage) или select(колонки) —
+    общие для ORM-пути и Core-пути (app/crud/readers.py).
+    С limit возвращаются последние limit сообщений (offset тогда не применяется).
+    """
     if not project_id:
         raise ChatControllerError("Project ID is required to get chat history.")
 
-    query = db.query(ChatMessage).filter(ChatMessage.project_id == project_id)
-    if not include_deleted:
-        query = query.filter(ChatMessage.is_deleted == False)
-    query = query.order_by(ChatMessage.timestamp.asc())
-
-    if offset is not None:
-        query = query.offset(offset)
-
     if limit is not None:
-        subquery = db.query(ChatMessage.id)\
-            .filter(ChatMessage.project_id == project_id)\
+        last_ids = select(ChatMessage.id)\
+            .where(ChatMessage.project_id == project_id)\
             .order_by(ChatMessage.timestamp.desc())\
             .limit(limit)\
-            .subquery()
-        query = db.query(ChatMessage)\
-            .filter(ChatMessage.id.in_(subquery))
-        if not include_deleted:
-            query = query.filter(ChatMessage.is_deleted == False)
-        query = query.order_by(ChatMessage.timestamp.asc())
+            .scalar_subquery()
+        statement = statement.where(ChatMessage.id.in_(last_ids))
+    else:
+        statement = statement.where(ChatMessage.project_id == project_id)
+        if offset is not None:
+            statement = statement.offset(offset)
 
-    return query.all()
+    if not include_deleted:
+        statement = statement.where(ChatMessage.is_deleted == False)
+    return statement.order_by(ChatMessage.timestamp.asc())
 
 def soft_delete_message(db: Session, message_id: int) -> bool:
     """Архивирует (soft-delete) сообщение чата по id."""
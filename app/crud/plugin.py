@@ -3,6 +3,9 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from app.models.plugin import Plugin
 from app.core.exceptions import PluginNotFoundError, PluginValidationError
+from app.core.fieldsets import InvalidFieldset, fieldset_options
+from app.crud.filters import PLUGIN_FILTERS
+from app.schemas.plugin import PluginRead
 import json
 import logging
 from typing import List, Dict, Optional
@@ -64,19 +67,16 @@ def get_plugin(db: Session, plugin_id: int) -> Plugin:
 def get_plugin_by_name(db: Session, name: str) -> Optional[Plugin]:
     return db.query(Plugin).filter(Plugin.name == name).first()
 
-def get_all_plugins(db: Session, filters: Optional[Dict] = None) -> List[Plugin]:
-    query = db.query(Plugin)
-    if filters:
-        if "is_active" in filters:
-            query = query.filter(Plugin.is_active == filters["is_active"])
-        if "subscription_level" in filters:
-            query = query.filter(Plugin.subscription_level == filters["subscription_level"])
-        if "is_private" in filters:
-            query = query.filter(Plugin.is_private == filters["is_private"])
-        if "tag" in filters:
-            tag = filters["tag"]
-            query = query.filter(Plugin.tags.contains([tag]))
-    return query.order_by(Plugin.name).all()
+PLUGIN_HEAVY_COLUMNS = ("description", "config_json")
+
+def get_all_plugins(db: Session, filters: Optional[Dict] = None,
+                    fields: Optional[List[str]] = None) -> List[Plugin]:
+    try:
+        options = fieldset_options(Plugin, PluginRead, fields, PLUGIN_HEAVY_COLUMNS)
+    except InvalidFieldset as e:
+        raise PluginValidationError(str(e))
+    query = db.query(Plugin).options(*options)
+    return PLUGIN_FILTERS.apply(query, filters).all()
 
 def update_plugin(db: Session, plugin_id: int, data: Dict) -> Plugin:
     plugin = get_plugin(db, plugin_id)
@@ -1,13 +1,24 @@
 # app/crud/project.py
+from sqlalchemy import case, func, select
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
-from datetime import date, datetime
+from datetime import date, datetime, timedelta, timezone
 from app.models.project import Project
+from app.models.task import Task
+from app.models.devlog import DevLogEntry
+from app.models.jarvis import ChatMessage
 from app.core.exceptions import (
     ProjectNotFound,
     DuplicateProjectName,
     ProjectValidationError,
 )
 from app.core.custom_fields import CUSTOM_FIELDS_SCHEMA
+from app.core.fieldsets import InvalidFieldset, fieldset_options
+from app.crud.filters import PROJECT_FILTERS
+from app.crud.upsert import upsert_by_external_id
+from app.schemas.project import ProjectRead
+from app.services.project_clone import copy_project
+from app.services.project_counters import repair_project_counters
 import logging
 from typing import Optional, List, Dict
 
@@ -21,31 +32,23 @@ def validate_custom_fields_payload(custom_fields: dict):
         if not schema["validator"](value):
             raise ProjectValidationError(f"Invalid value for '{key}': {value} (expected {schema['type']})")
 
-def create_project(db: Session, data: dict) -> Project:
+def _prepare_project_row(data: dict, allow_past_deadline: bool = False) -> dict:
+    """
+    Валидация и нормализация данных нового проекта без обращения к БД.
+    allow_past_deadline — строка обновляет существующий проект (upsert).
+    """
     # Проверка обязательных полей
     if not data.get("name") or not data["name"].strip():
         raise ProjectValidationError("Project name is required.")
 
-    if db.query(Project).filter_by(name=data["name"]).first():
-        raise DuplicateProjectName(f"Project with name '{data['name']}' already exists.")
-
-    if data.get("deadline") and data["deadline"] < date.today():
+    if data.get("deadline") and data["deadline"] < date.today() and not allow_past_deadline:
         raise ProjectValidationError("Deadline cannot be in the past.")
 
     custom_fields = data.get("custom_fields", {})
     if custom_fields:
         validate_custom_fields_payload(custom_fields)
 
-    # Обработка новых возможных полей
-    attachments = data.get("attachments", [])
-    is_favorite = data.get("is_favorite", False)
-    ai_notes = data.get("ai_notes")
-    external_id = data.get("external_id")
-    subscription_level = data.get("subscription_level")
-    color = data.get("color")
-    parent_project_id = data.get("parent_project_id")
-
-    project = Project(
+    return dict(
         name=data["name"].strip(),
         description=data.get("description", ""),
         status=data.get("status", "active"),
@@ -53,20 +56,28 @@ def create_project(db: Session, data: dict) -> Project:
         priority=data.get("priority", 3),
         tags=data.get("tags", []),
         linked_repo=data.get("linked_repo"),
-        color=color,
+        color=data.get("color"),
         participants=data.get("participants", []),
         custom_fields=custom_fields,
         is_deleted=False,
-        attachments=attachments,
-        is_favorite=is_favorite,
-        ai_notes=ai_notes,
-        external_id=external_id,
-        subscription_level=subscription_level,
-        parent_project_id=parent_project_id,
+        # Обработка новых возможных полей
+        attachments=data.get("attachments", []),
+        is_favorite=data.get("is_favorite", False),
+        ai_notes=data.get("ai_notes"),
+        external_id=data.get("external_id"),
+        subscription_level=data.get("subscription_level"),
+        parent_project_id=data.get("parent_project_id"),
         created_at=data.get("created_at") or datetime.utcnow(),
         updated_at=data.get("updated_at") or datetime.utcnow(),
     )
 
+def create_project(db: Session, data: dict) -> Project:
+    row = _prepare_project_row(data)
+    if db.query(Project).filter_by(name=row["name"]).first():
+        raise DuplicateProjectName(f"Project with name '{data['name']}' already exists.")
+
+    project = Project(**row)
+
     db.add(project)
     try:
         db.commit()
@@ -77,57 +88,76 @@ def create_project(db: Session, data: dict) -> Project:
         logger.error(f"Exception during save: {e}")
         raise ProjectValidationError("Database error while creating project.")
 
-def get_all_projects(db: Session, filters: dict = None, sort_by: str = "created_at") -> List[Project]:
-    query = db.query(Project)
-    filters = filters or {}
+def upsert_projects(db: Session, items: List[dict]) -> Dict:
+    """
+    Идемпотентная синхронизация проектов по external_id.
+    Возвращает счётчики created/updated/unchanged и ошибки по индексу элемента.
+    """
+    errors, rows = [], []
+    external_ids, names = {}, {}
+    # Уже синхронизированные проекты: просроченный дедлайн у них не ошибка
+    existing = set(db.execute(
+        select(Project.external_id)
+        .where(Project.external_id.in_({data["external_id"] for data in items if data.get("external_id")}))
+    ).scalars())
+    for i, data in enumerate(items):
+        try:
+            if not data.get("external_id"):
+                raise ProjectValidationError("External ID is required for upsert.")
+            row = _prepare_project_row(data, allow_past_deadline=data["external_id"] in existing)
+        except ProjectValidationError as e:
+            errors.append({"index": i, "error": str(e)})
+            continue
+        if row["external_id"] in external_ids:
+            errors.append({"index": i, "error": "Duplicate external_id within the batch."})
+            continue
+        if row["name"] in names:
+            errors.append({"index": i, "error": f"Project with name '{row['name']}' already exists."})
+            continue
+        external_ids[row["external_id"]] = i
+        names[row["name"]] = row["external_id"]
+        rows.append(row)
 
-    if not filters.get("show_archived", False):
-        query = query.filter(Project.is_deleted == False)
+    if names:
+        holders = db.execute(
+            select(Project.name, Project.external_id).where(Project.name.in_(names))
+        ).all()
+        conflicts = {names[h.name] for h in holders if h.external_id != names[h.name]}
+        errors.extend(
+            {"index": external_ids[ext], "error": "Project with this name already exists."}
+            for ext in conflicts
+        )
+        rows = [row for row in rows if row["external_id"] not in conflicts]
 
-    if "status" in filters:
-        query = query.filter(Project.status == filters["status"])
+    try:
+        counts = upsert_by_external_id(db, Project, rows)
+    except SQLAlchemyError as e:
+        logger.error(f"Failed to upsert projects: {e}")
+        raise ProjectValidationError("Database error while upserting projects.")
+    return {**counts, "errors": sorted(errors, key=lambda e: e["index"])}
 
-    if "search" in filters:
-        search = f"%{filters['search']}%"
-        query = query.filter(
-            (Project.name.ilike(search)) | (Project.description.ilike(search))
-        )
+# Текст и JSON, которых нет в ProjectShort: в списках грузятся только по fields=
+PROJECT_HEAVY_COLUMNS = ("description", "ai_notes", "attachments", "custom_fields", "participants")
+PROJECT_DERIVED_FIELDS = {
+    "tasks_open": ("tasks_total", "tasks_done"),
+    "progress": ("tasks_total", "tasks_done"),
+}
 
-    if "tag" in filters:
-        tag = filters["tag"]
-        query = query.filter(Project.tags.contains([tag]))
-
-    if "deadline" in filters:
-        query = query.filter(Project.deadline == filters["deadline"])
-    if "deadline_from" in filters:
-        query = query.filter(Project.deadline >= filters["deadline_from"])
-    if "deadline_to" in filters:
-        query = query.filter(Project.deadline <= filters["deadline_to"])
-
-    if "priority" in filters:
-        query = query.filter(Project.priority == filters["priority"])
-
-    if "custom_fields" in filters:
-        for key, value in filters["custom_fields"].items():
-            query = query.filter(Project.custom_fields[key].astext == str(value))
-
-    # Доп. фильтры по новым полям
-    if "is_favorite" in filters:
-        query = query.filter(Project.is_favorite == filters["is_favorite"])
-    if "subscription_level" in filters:
-        query = query.filter(Project.subscription_level == filters["subscription_level"])
-    if "external_id" in filters:
-        query = query.filter(Project.external_id == filters["external_id"])
-
-    # Сортировка по любому полю, включая новые (безопасно)
-    if hasattr(Project, sort_by):
-        if sort_by == "priority":
-            query = query.order_by(getattr(Project, sort_by).asc())
-        else:
-            query = query.order_by(getattr(Project, sort_by).desc())
-    else:
-        query = query.order_by(Project.created_at.desc())
-    return query.all()
+def get_all_projects(db: Session, filters: dict = None, sort_by: str = "created_at",
+                     fields: Optional[List[str]] = None) -> List[Project]:
+    try:
+        options = fieldset_options(Project, ProjectRead, fields, PROJECT_HEAVY_COLUMNS, derived=PROJECT_DERIVED_FIELDS)
+    except InvalidFieldset as e:
+        raise ProjectValidationError(str(e))
+    query = db.query(Project).options(*options)
+    return PROJECT_FILTERS.apply(query, filters, sort_by).all()
+
+def repair_counters(db: Session) -> bool:
+    try:
+        repair_project_counters(db)
+        return True
+    except SQLAlchemyError as e:
+        raise ProjectValidationError(f"Database error while recomputing counters: {e}")
 
 def get_project(db: Session, project_id: int) -> Project:
     project = db.query(Project).get(project_id)
@@ -189,6 +219,32 @@ def update_project(db: Session, project_id: int, data: dict) -> Project:
         logger.error(f"Failed to update project: {e}")
         raise ProjectValidationError("Database error while updating project.")
 
+def clone_project(db: Session, project_id: int, data: dict) -> Dict[str, int]:
+    """
+    Серверное глубокое копирование проекта (app/services/project_clone.py) в одной транзакции.
+    Возвращает {"id": id копии, "tasks": n, "devlog": n}.
+    """
+    project = get_project(db, project_id)
+    name = (data.get("name") or f"{project.name} (copy)").strip()
+    if not name:
+        raise ProjectValidationError("Project name is required.")
+    if len(name) > 128:
+        raise ProjectValidationError("Project name must be at most 128 characters.")
+    if db.query(Project).filter_by(name=name).first():
+        raise DuplicateProjectName(f"Project with name '{name}' already exists.")
+    options = {
+        key: data[key] for key in ("include_tasks", "include_subtasks", "include_devlog", "include_custom_fields")
+        if key in data
+    }
+    try:
+        result = copy_project(db, project_id, name, **options)
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Failed to clone project {project_id}: {e}")
+        raise ProjectValidationError("Database error while cloning project.")
+    return result
+
 def soft_delete_project(db: Session, project_id: int) -> bool:
     project = get_project(db, project_id)
     if project.is_deleted:
@@ -215,6 +271,83 @@ def restore_project(db: Session, project_id: int) -> bool:
         logger.error(f"Failed to restore project: {e}")
         raise ProjectValidationError("Database error while restoring project.")
 
+def _as_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # chat_messages.timestamp — timestamptz, остальные колонки — naive UTC
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def _count_if(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+def get_project_stats(db: Session, project_id: int) -> Dict:
+    """
+    Агрегаты для дашборда проекта: три GROUP BY/агрегатных запроса, строки не загружаются.
+    """
+    get_project(db, project_id)
+    today = date.today()
+    now = datetime.utcnow()
+
+    task_rows = db.execute(
+        select(
+            Task.status,
+            Task.priority,
+            func.count().label("total"),
+            _count_if((Task.deadline < today) & (Task.status != "done")).label("overdue"),
+            _count_if(Task.parent_task_id.isnot(None)).label("subtasks"),
+            _count_if(Task.parent_task_id.isnot(None) & (Task.status == "done")).label("subtasks_done"),
+            func.max(Task.updated_at).label("last_update"),
+        )
+        .where(Task.project_id == project_id, Task.is_deleted == False)
+        .group_by(Task.status, Task.priority)
+    ).all()
+
+    devlog = db.execute(
+        select(
+            func.count().label("total"),
+            _count_if(DevLogEntry.created_at >= now - timedelta(days=7)).label("last_7_days"),
+            _count_if(DevLogEntry.created_at >= now - timedelta(days=30)).label("last_30_days"),
+            func.max(DevLogEntry.created_at).label("last_entry"),
+        )
+        .where(DevLogEntry.project_id == project_id, DevLogEntry.is_deleted == False)
+    ).one()
+
+    chat = db.execute(
+        select(func.count().label("total"), func.max(ChatMessage.timestamp).label("last_message"))
+        .where(ChatMessage.project_id == project_id, ChatMessage.is_deleted == False)
+    ).one()
+
+    by_status, by_priority = {}, {}
+    overdue = subtasks = subtasks_done = 0
+    last_task_update = None
+    for row in task_rows:
+        by_status[row.status] = by_status.get(row.status, 0) + row.total
+        by_priority[row.priority] = by_priority.get(row.priority, 0) + row.total
+        overdue += row.overdue
+        subtasks += row.subtasks
+        subtasks_done += row.subtasks_done
+        if row.last_update and (last_task_update is None or row.last_update > last_task_update):
+            last_task_update = row.last_update
+
+    activity = [
+        ts for ts in (last_task_update, devlog.last_entry, _as_naive_utc(chat.last_message)) if ts
+    ]
+    return {
+        "project_id": project_id,
+        "tasks_total": sum(by_status.values()),
+        "tasks_by_status": by_status,
+        "tasks_by_priority": by_priority,
+        "tasks_overdue": overdue,
+        "subtasks_total": subtasks,
+        "subtasks_done": subtasks_done,
+        "subtask_completion": round(subtasks_done / subtasks, 4) if subtasks else None,
+        "devlog_total": devlog.total,
+        "devlog_last_7_days": devlog.last_7_days,
+        "devlog_last_30_days": devlog.last_30_days,
+        "chat_messages": chat.total,
+        "last_activity_at": max(activity) if activity else None,
+    }
+
 def get_ai_context(db: Session, project_id: int) -> Dict:
     project = get_project(db, project_id)
     is_overdue = bool(project.deadline and project.deadline < date.today())
@@ -0,0 +1,148 @@
+#app/crud/readers.py
+"""
+Read-only путь для горячих GET: Core select() по нужным колонкам -> Row.
+Без identity map, отслеживания изменений и lazy-load; строки сразу идут
+в app.core.serialization.orm_rows (Row отдаёт значения по имени колонки).
+Фильтры те же, что у ORM-функций (app/crud/filters.py и history_statement).
+"""
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import inspect as sa_inspect, select
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import DevLogValidationError, TaskValidationError
+from app.core.fieldsets import InvalidFieldset, check_fields
+from app.core.pagination import next_cursor_for
+from app.crud.devlog import count_entries, entries_page_query
+from app.crud.filters import DEVLOG_FILTERS, TASK_FILTERS
+from app.crud.jarvis import history_statement
+from app.crud.task import keyset_page_query
+from app.models.devlog import DevLogEntry
+from app.models.jarvis import ChatMessage
+from app.models.task import Task
+from app.schemas.devlog import DevLogRead
+from app.schemas.task import TaskRead
+
+# Вид по умолчанию = поля соответствующих Short/Read схем
+TASK_SHORT_FIELDS = ("id", "title")
+# GET /me/tasks: вид "моя нагрузка" по умолчанию
+MY_TASK_FIELDS = ("title", "status", "priority", "deadline", "project_id")
+TASK_READ_FIELDS = (
+    "id", "title", "description", "status", "priority", "deadline", "assignees", "tags",
+    "project_id", "parent_task_id", "custom_fields", "attachments", "is_favorite", "ai_notes",
+    "external_id", "reviewed", "created_at", "updated_at", "is_deleted", "rank",
+)
+DEVLOG_SHORT_FIELDS = ("id", "entry_type", "content", "author", "created_at")
+CHAT_READ_FIELDS = (
+    "id", "project_id", "role", "content", "timestamp", "metadata",
+    "author", "ai_notes", "attachments", "is_deleted",
+)
+# Поле ответа -> атрибут модели, если они различаются
+CHAT_RENAMED = {"metadata": "metadata_"}
+
+def _columns(model, names: Sequence[str], renamed: Optional[Dict[str, str]] = None) -> list:
+    """
+    Колонки модели с label = имя поля ответа; неизвестное имя -> InvalidFieldset.
+    """
+    renamed = renamed or {}
+    available = {attr.key for attr in sa_inspect(model).column_attrs}
+    unknown = [name for name in names if renamed.get(name, name) not in available]
+    if unknown:
+        raise InvalidFieldset(
+            f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(sorted(available))}."
+        )
+    return [getattr(model, renamed.get(name, name)).label(name) for name in dict.fromkeys(names)]
+
+def read_tasks_page(
+    db: Session,
+    filters: dict = None,
+    sort_by: str = "deadline",
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+) -> Dict:
+    """
+    Core-аналог get_tasks_page: {"tasks": [Row], "next_cursor": str | None}.
+    Колонка сортировки выбирается всегда (для курсора), в ответ попадают только fields.
+    """
+    sort_key = TASK_FILTERS.sort(sort_by).column.key
+    names = ("id", *fields) if fields else TASK_SHORT_FIELDS
+    try:
+        check_fields(TaskRead, names)
+        columns = _columns(Task, (*names, sort_key))
+    except InvalidFieldset as e:
+        raise TaskValidationError(str(e))
+    clauses, params = TASK_FILTERS.where(filters)
+    statement = keyset_page_query(select(*columns).where(*clauses), sort_by, limit, cursor)
+    rows = db.execute(statement, params).all()
+    tasks, next_cursor = next_cursor_for(rows, limit, sort_by, lambda row: getattr(row, sort_key))
+    return {"tasks": tasks, "next_cursor": next_cursor}
+
+def read_task(db: Session, task_id: int) -> Optional[Row]:
+    return db.execute(select(*_columns(Task, TASK_READ_FIELDS)).where(Task.id == task_id)).first()
+
+def read_entries(
+    db: Session,
+    filters: dict = None,
+    page: int = 1,
+    per_page: int = 20,
+    fields: Optional[List[str]] = None,
+    count: str = "exact",
+) -> Dict:
+    """
+    Core-аналог get_entries: {"entries": [Row], "total_count": int | None}.
+    """
+    names = ("id", *fields) if fields else DEVLOG_SHORT_FIELDS
+    try:
+        check_fields(DevLogRead, names)
+        columns = _columns(DevLogEntry, names)
+    except InvalidFieldset as e:
+        raise DevLogValidationError(str(e))
+    clauses, params = DEVLOG_FILTERS.where(filters)
+    statement = select(*columns).where(*clauses)
+
+    total_count = count_entries(db, filters, count)["total_count"]
+
+    page = max(page, 1)
+    per_page = max(per_page, 1)
+    statement = statement.order_by(*DEVLOG_FILTERS.order_by()).limit(per_page).offset((page - 1) * per_page)
+    return {"entries": db.execute(statement, params).all(), "total_count": total_count}
+
+def read_entries_page(
+    db: Session,
+    filters: dict = None,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    count: str = "none",
+) -> Dict:
+    """
+    Core-аналог get_entries_page: {"entries": [Row], "next_cursor", "total_count", "count"}.
+    created_at выбирается всегда (для курсора).
+    """
+    names = ("id", *fields) if fields else DEVLOG_SHORT_FIELDS
+    try:
+        check_fields(DevLogRead, names)
+        columns = _columns(DevLogEntry, (*names, "created_at"))
+    except InvalidFieldset as e:
+        raise DevLogValidationError(str(e))
+    clauses, params = DEVLOG_FILTERS.where(filters)
+    statement = entries_page_query(select(*columns).where(*clauses), limit, cursor)
+    rows = db.execute(statement, params).all()
+    entries, next_cursor = next_cursor_for(rows, limit, "created_at", lambda row: row.created_at)
+    counted = count_entries(db, filters, "none" if cursor else count)
+    return {"entries": entries, "next_cursor": next_cursor, **counted}
+
+def read_history(
+    db: Session,
+    project_id: int,
+    limit: Optional[int] = None,
+    offset: Optional[int] = None,
+    include_deleted: bool = False,
+) -> List[Row]:
+    """
+    Core-аналог get_history (старые сообщения первыми).
+    """
+    statement = select(*_columns(ChatMessage, CHAT_READ_FIELDS, CHAT_RENAMED))
+    return db.execute(history_statement(statement, project_id, limit, offset, include_deleted)).all()
@@ -1,15 +1,39 @@
 #app/crud/tasks.py
 from datetime import date, datetime
+from sqlalchemy import case, false, func, insert, literal, or_, select, true, update
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from app.models.project import Project
+from app.models.tag import Tag, task_tags
 from app.models.task import Task
 from app.core.exceptions import (
     TaskNotFound,
     TaskValidationError,
 )
 from app.core.custom_fields import CUSTOM_FIELDS_SCHEMA
+from app.core.dialect import is_postgres
+from app.core.jsonb import json_array_append, json_array_remove
+from app.core.fieldsets import InvalidFieldset, fieldset_options
+from app.core.lexorank import InvalidRank, rank_between
+from app.crud.filters import TASK_FILTERS
+from app.crud.upsert import upsert_by_external_id
+from app.schemas.task import TaskRead
+from app.services.project_counters import recompute_project_counters
+from app.services.assignee_index import resync_assignees
+from app.services.tag_index import resync_tags
+from app.services.task_ranking import (
+    COLUMN_ORDER, append_ranks, column_end_rank, needs_rebalance, neighbour_ranks,
+    rebalance_column, rebalance_long_ranks,
+)
+from app.core.pagination import (
+    InvalidCursor,
+    decode_cursor,
+    keyset_clause,
+    keyset_order_by,
+    next_cursor_for,
+)
 import logging
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 logger = logging.getLogger("DevOS.Tasks")
 
@@ -21,71 +45,86 @@ def validate_custom_fields_payload(custom_fields: dict):
         if not schema["validator"](value):
             raise TaskValidationError(f"Invalid value for '{key}': {value} (expected {schema['type']})")
 
-def create_task(db: Session, data: dict) -> Task:
-    if db.query(Task).filter_by(
-        project_id=data["project_id"], title=data["title"].strip()
-    ).first():
-        raise TaskValidationError("Task title must be unique within a project.")
-
-    if not data.get("title") or not data["title"].strip():
-        raise TaskValidationError("Title is required.")
-    if not data.get("project_id"):
-        raise TaskValidationError("Project ID is required.")
-
-    deadline = data.get("deadline")
-    if deadline and not isinstance(deadline, date):
+def _parse_deadline(value) -> Optional[date]:
+    if value and not isinstance(value, date):
         try:
-            deadline = date.fromisoformat(str(deadline))
+            return date.fromisoformat(str(value))
         except ValueError:
             raise TaskValidationError("Invalid deadline date format. Use YYYY-MM-DD.")
-    if deadline and deadline < date.today():
-        raise TaskValidationError("Deadline cannot be in the past.")
+    return value or None
 
-    priority = int(data.get("priority", 3))
+def _parse_priority(value) -> int:
+    try:
+        priority = int(value)
+    except (TypeError, ValueError):
+        raise TaskValidationError("Priority must be an integer between 1 and 5.")
     if not 1 <= priority <= 5:
         raise TaskValidationError("Priority must be an integer between 1 and 5.")
+    return priority
 
-    custom_fields = data.get("custom_fields", {})
-    if not isinstance(custom_fields, dict):
+def _parse_custom_fields(value) -> dict:
+    if not isinstance(value, dict):
         raise TaskValidationError("Custom fields must be a dictionary (JSON object).")
-    if custom_fields:
-        validate_custom_fields_payload(custom_fields)
+    if value:
+        validate_custom_fields_payload(value)
+    return value
 
-    tags_data = data.get("tags") or []
+def _parse_tags(value) -> list:
+    tags_data = value or []
     if not isinstance(tags_data, list) or not all(isinstance(tag, str) for tag in tags_data):
         raise TaskValidationError("Tags must be a list of strings.")
+    return tags_data
+
+def _prepare_task_row(data: dict, allow_past_deadline: bool = False) -> dict:
+    """
+    Валидация и нормализация данных новой задачи без обращения к БД.
+    Возвращает значения колонок для Task(**row) или bulk INSERT.
+    allow_past_deadline — строка обновляет существующую задачу (upsert): просроченный
+    дедлайн у неё законен, синхронизация не должна на нём падать.
+    """
+    if not data.get("title") or not data["title"].strip():
+        raise TaskValidationError("Title is required.")
+    if not data.get("project_id"):
+        raise TaskValidationError("Project ID is required.")
+
+    deadline = _parse_deadline(data.get("deadline"))
+    if deadline and deadline < date.today() and not allow_past_deadline:
+        raise TaskValidationError("Deadline cannot be in the past.")
 
     assignees = data.get("assignees", [])
     if not isinstance(assignees, list):
         raise TaskValidationError("Assignees must be a list.")
 
-    # Новые поля для расширения
-    attachments = data.get("attachments", [])
-    is_favorite = data.get("is_favorite", False)
-    ai_notes = data.get("ai_notes")
-    external_id = data.get("external_id")
-    reviewed = data.get("reviewed", False)
-
-    task = Task(
+    return dict(
         title=data["title"].strip(),
-        description=data.get("description", "").strip(),
+        description=(data.get("description") or "").strip(),
         status=data.get("status", "todo"),
-        priority=priority,
+        priority=_parse_priority(data.get("priority", 3)),
         deadline=deadline,
         assignees=assignees,
-        tags=tags_data,
+        tags=_parse_tags(data.get("tags")),
         project_id=int(data["project_id"]),
         parent_task_id=data.get("parent_task_id"),
-        custom_fields=custom_fields,
+        custom_fields=_parse_custom_fields(data.get("custom_fields", {})),
         is_deleted=False,
-        attachments=attachments,
-        is_favorite=is_favorite,
-        ai_notes=ai_notes,
-        external_id=external_id,
-        reviewed=reviewed,
+        # Новые поля для расширения
+        attachments=data.get("attachments", []),
+        is_favorite=data.get("is_favorite", False),
+        ai_notes=data.get("ai_notes"),
+        external_id=data.get("external_id"),
+        reviewed=data.get("reviewed", False),
         created_at=data.get("created_at") or datetime.utcnow(),
         updated_at=data.get("updated_at") or datetime.utcnow(),
     )
+
+def create_task(db: Session, data: dict) -> Task:
+    row = _prepare_task_row(data)
+    if db.query(Task).filter_by(project_id=row["project_id"], title=row["title"]).first():
+        raise TaskValidationError("Task title must be unique within a project.")
+
+    task = Task(**row)
+    # Новая задача — в конец своей колонки доски
+    task.rank = rank_between(column_end_rank(db, task.project_id, task.status), None)
     db.add(task)
     try:
         db.commit()
@@ -102,64 +141,178 @@ def get_task(db: Session, task_id: int) -> Task:
         raise TaskNotFound(f"Task {task_id} not found.")
     return task
 
-def get_all_tasks(db: Session, filters: dict = None, sort_by: str = "deadline") -> List[Task]:
-    query = db.query(Task)
-    filters = filters or {}
-
-    if not filters.get("show_archived", False):
-        query = query.filter(Task.is_deleted == False)
-
-    if "project_id" in filters:
-        query = query.filter(Task.project_id == filters["project_id"])
-    if "status" in filters and filters["status"] != "all":
-        query = query.filter(Task.status == filters["status"])
-    if "search" in filters:
-        val = f"%{filters['search']}%"
-        query = query.filter(Task.title.ilike(val) | Task.description.ilike(val))
-    if "deadline_before" in filters:
-        query = query.filter(Task.deadline <= filters["deadline_before"])
-    if "deadline_after" in filters:
-        query = query.filter(Task.deadline >= filters["deadline_after"])
-    if "parent_task_id" in filters:
-        query = query.filter(Task.parent_task_id == filters["parent_task_id"])
-    if "priority" in filters:
-        query = query.filter(Task.priority == filters["priority"])
-    if "tag" in filters:
-        tag = filters["tag"]
-        query = query.filter(Task.tags.contains([tag]))
-    if "custom_fields" in filters:
-        for key, value in filters["custom_fields"].items():
-            query = query.filter(Task.custom_fields[key].astext == str(value))
-    if "assignee_id" in filters:
-        query = query.filter(Task.assignees.contains([{"user_id": filters["assignee_id"]}]))
-    if "is_favorite" in filters:
-        query = query.filter(Task.is_favorite == filters["is_favorite"])
-    if "external_id" in filters:
-        query = query.filter(Task.external_id == filters["external_id"])
-    if "reviewed" in filters:
-        query = query.filter(Task.reviewed == filters["reviewed"])
-
-    if hasattr(Task, sort_by):
-        if sort_by == "priority":
-            query = query.order_by(getattr(Task, sort_by).asc())
-        else:
-            query = query.order_by(getattr(Task, sort_by).desc())
-    else:
-        query = query.order_by(Task.deadline.asc())
+# Текст и JSON, которых нет в TaskShort: в списках грузятся только по fields=
+TASK_HEAVY_COLUMNS = ("description", "ai_notes", "attachments", "custom_fields")
+
+def _task_list_options(fields: Optional[List[str]], required=("id",)) -> list:
+    try:
+        return fieldset_options(Task, TaskRead, fields, TASK_HEAVY_COLUMNS, required=required)
+    except InvalidFieldset as e:
+        raise TaskValidationError(str(e))
+
+def get_all_tasks(db: Session, filters: dict = None, sort_by: str = "deadline",
+                  fields: Optional[List[str]] = None) -> List[Task]:
+    query = db.query(Task).options(*_task_list_options(fields))
+    return TASK_FILTERS.apply(query, filters, sort_by).all()
+
+def get_tasks_page(
+    db: Session,
+    filters: dict = None,
+    sort_by: str = "deadline",
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+) -> Dict:
+    """
+    Keyset-пагинация: следующая страница продолжается с (значение sort_by, id)
+    последней строки, поэтому глубокие страницы стоят столько же, сколько первая.
+    fields — sparse fieldset (load_only), иначе тяжёлые колонки отложены.
+    """
+    # Колонка сортировки нужна для курсора, даже если её не запросили
+    sort_key = TASK_FILTERS.sort(sort_by).column.key
+    options = _task_list_options(fields, required=("id", sort_key))
+    query = TASK_FILTERS.apply(db.query(Task).options(*options), filters, ordered=False)
+    rows = keyset_page_query(query, sort_by, limit, cursor).all()
+    tasks, next_cursor = next_cursor_for(rows, limit, sort_by, lambda t: getattr(t, sort_key))
+    return {"tasks": tasks, "next_cursor": next_cursor}
+
+def keyset_page_query(query, sort_by: str, limit: int, cursor: Optional[str] = None):
+    """
+    Курсор + ORDER BY + LIMIT limit+1 поверх ORM Query или Core select() задач.
+    """
+    sort = TASK_FILTERS.sort(sort_by)
+    if limit < 1:
+        raise TaskValidationError("Limit must be a positive integer.")
+    if cursor:
+        try:
+            value, last_id = decode_cursor(cursor, sort_by, sort.value_type)
+        except InvalidCursor as e:
+            raise TaskValidationError(str(e))
+        query = query.filter(keyset_clause(sort.column, Task.id, sort.descending, value, last_id))
+    return query.order_by(*keyset_order_by(sort.column, Task.id, sort.descending)).limit(limit + 1)
 
-    return query.all()
+# Жёсткий предел глубины: защищает рекурсивный CTE от циклов в parent_task_id
+MAX_TREE_DEPTH = 100
+
+TASK_TREE_COLUMNS = (
+    Task.id, Task.parent_task_id, Task.project_id, Task.title,
+    Task.status, Task.priority, Task.deadline, Task.is_deleted,
+)
+
+def _subtree_cte(task_id: int, max_depth: Optional[int] = None, include_archived: bool = False):
+    """
+    WITH RECURSIVE: id корня и всех потомков с глубиной (корень — 0).
+    Архивные задачи отсекаются вместе с их поддеревом.
+    """
+    depth_limit = min(max_depth, MAX_TREE_DEPTH) if max_depth is not None else MAX_TREE_DEPTH
+    root = select(Task.id, literal(0).label("depth")).where(Task.id == task_id)
+    subtree = root.cte("subtree", recursive=True)
+    children = (
+        select(Task.id, (subtree.c.depth + 1).label("depth"))
+        .join(subtree, Task.parent_task_id == subtree.c.id)
+        .where(subtree.c.depth < depth_limit)
+    )
+    if not include_archived:
+        children = children.where(Task.is_deleted == False)
+    return subtree.union_all(children)
+
+def get_task_tree(
+    db: Session,
+    task_id: int,
+    max_depth: Optional[int] = None,
+    include_archived: bool = False,
+) -> Dict:
+    """
+    Всё дерево подзадач одним запросом; вложенная структура собирается за O(n).
+    """
+    subtree = _subtree_cte(task_id, max_depth, include_archived)
+    rows = db.execute(
+        select(*TASK_TREE_COLUMNS, subtree.c.depth)
+        .join(subtree, subtree.c.id == Task.id)
+        .order_by(subtree.c.depth, Task.id)
+    ).mappings().all()
+    if not rows:
+        raise TaskNotFound(f"Task {task_id} not found.")
+
+    nodes = {}
+    for row in rows:
+        # Цикл в parent_task_id повторяет задачи до MAX_TREE_DEPTH: берём первое (самое мелкое) вхождение
+        if row["id"] in nodes:
+            continue
+        node = dict(row)
+        node["subtasks"] = []
+        nodes[node["id"]] = node
+        # Строки упорядочены по глубине, поэтому родитель уже в nodes
+        parent = nodes.get(node["parent_task_id"]) if node["depth"] else None
+        if parent is not None:
+            parent["subtasks"].append(node)
+    return nodes[task_id]
+
+UPDATABLE_TASK_FIELDS = [
+    "title", "description", "status", "priority", "deadline",
+    "assignees", "tags", "parent_task_id", "attachments", "is_favorite",
+    "ai_notes", "external_id", "reviewed"
+]
+
+# Порядок колонок доски; неизвестные статусы идут следом по алфавиту
+BOARD_STATUS_ORDER = ["todo", "in progress", "blocked", "done", "cancelled"]
+
+BOARD_CARD_COLUMNS = (
+    Task.id, Task.title, Task.rank, Task.status, Task.priority, Task.deadline,
+    Task.assignees, Task.tags, Task.parent_task_id,
+)
+
+def get_board(db: Session, project_id: int, per_column: int = 50) -> Dict:
+    """
+    Kanban-доска: задачи по статусам, в каждой колонке top-N в ручном порядке (rank),
+    задачи без ранга — следом по priority/deadline.
+    Один запрос с ROW_NUMBER() OVER (PARTITION BY status) и COUNT(*) OVER для итогов.
+    """
+    ranked = (
+        select(
+            *BOARD_CARD_COLUMNS,
+            func.row_number().over(
+                partition_by=Task.status,
+                order_by=COLUMN_ORDER,
+            ).label("position"),
+            func.count().over(partition_by=Task.status).label("column_total"),
+        )
+        .where(Task.project_id == project_id, Task.is_deleted == False)
+        .subquery()
+    )
+    rows = db.execute(
+        select(ranked).where(ranked.c.position <= per_column).order_by(ranked.c.status, ranked.c.position)
+    ).mappings().all()
+
+    columns = {}
+    for row in rows:
+        card = dict(row)
+        total = card.pop("column_total")
+        card.pop("position")
+        column = columns.setdefault(card["status"], {"status": card["status"], "total": total, "tasks": []})
+        column["tasks"].append(card)
+
+    def column_order(status):
+        if status in BOARD_STATUS_ORDER:
+            return (0, BOARD_STATUS_ORDER.index(status), "")
+        return (1, 0, status or "")
+
+    return {
+        "project_id": project_id,
+        "columns": [columns[status] for status in sorted(columns, key=column_order)],
+    }
 
 def update_task(db: Session, task_id: int, data: dict) -> Task:
     task = get_task(db, task_id)
     pre_update = {k: v for k, v in task.__dict__.items() if not k.startswith('_sa_')}
 
-    for field in [
-        "title", "description", "status", "priority", "deadline",
-        "assignees", "tags", "parent_task_id", "attachments", "is_favorite",
-        "ai_notes", "external_id", "reviewed"
-    ]:
+    previous_status = task.status
+    for field in UPDATABLE_TASK_FIELDS:
         if field in data:
             setattr(task, field, data[field] if field != "title" else data[field].strip())
+    if task.status != previous_status:
+        # Смена колонки без явного места (см. move_task) — в конец новой колонки
+        task.rank = rank_between(column_end_rank(db, task.project_id, task.status), None)
 
     if "custom_fields" in data:
         cf = data["custom_fields"]
@@ -199,6 +352,427 @@ def update_task(db: Session, task_id: int, data: dict) -> Task:
         logger.error(f"Failed to update task: {e}")
         raise TaskValidationError("Database error while updating task.")
 
+def move_task(db: Session, task_id: int, status: Optional[str] = None,
+              prev_id: Optional[int] = None, next_id: Optional[int] = None) -> Dict:
+    """
+    Drag-and-drop: ставит задачу между prev_id (выше) и next_id (ниже) в колонке status
+    (по умолчанию — текущей). Пишется одна строка: rank (и status), размер колонки не важен.
+    Один сосед — второй берётся из индекса; без соседей — в конец колонки.
+    Возвращает {"task": Task, "rebalance": bool} — пора ли перенумеровать колонку фоном.
+    """
+    task = get_task(db, task_id)
+    if task.is_deleted:
+        raise TaskValidationError("Archived tasks cannot be moved.")
+    target = status if status is not None else task.status
+    neighbour_ids = {i for i in (prev_id, next_id) if i is not None}
+    if task_id in neighbour_ids:
+        raise TaskValidationError("A task cannot be its own neighbour.")
+
+    ranks = {}
+    if neighbour_ids:
+        found = {
+            row.id: row
+            for row in db.execute(
+                select(Task.id, Task.project_id, Task.status, Task.rank, Task.is_deleted)
+                .where(Task.id.in_(neighbour_ids))
+            )
+        }
+        for neighbour_id in neighbour_ids:
+            row = found.get(neighbour_id)
+            if row is None or row.is_deleted:
+                raise TaskNotFound(f"Task {neighbour_id} not found.")
+            if row.project_id != task.project_id or row.status != target:
+                raise TaskValidationError(
+                    f"Task {neighbour_id} is not in column '{target}' of project {task.project_id}."
+                )
+        if any(found[i].rank is None for i in neighbour_ids):
+            # В колонке задачи без ранга (upsert, старые данные) — сначала перенумеровать её
+            rebalance_column(db, task.project_id, target)
+            found = {row.id: row for row in db.execute(select(Task.id, Task.rank).where(Task.id.in_(neighbour_ids)))}
+        ranks = {i: found[i].rank for i in neighbour_ids}
+
+    prev_rank, next_rank = neighbour_ranks(
+        db, task.project_id, target, task_id, ranks.get(prev_id), ranks.get(next_id)
+    )
+    try:
+        new_rank = rank_between(prev_rank, next_rank)
+    except InvalidRank:
+        raise TaskValidationError("Neighbour tasks are out of order; reload the board and retry.")
+
+    task.status = target
+    task.rank = new_rank
+    task.updated_at = datetime.utcnow()
+    try:
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Failed to move task {task_id}: {e}")
+        raise TaskValidationError("Database error while moving task.")
+    logger.info(f"Moved task {task_id} to '{target}' at rank {new_rank}")
+    return {"task": task, "rebalance": needs_rebalance(new_rank)}
+
+def rebalance_ranks(db: Session, project_ids: Optional[List[int]] = None) -> Dict[str, int]:
+    try:
+        return rebalance_long_ranks(db, project_ids)
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise TaskValidationError(f"Database error while rebalancing ranks: {e}")
+
+BULK_CHUNK_SIZE = 500
+
+def _taken_titles(db: Session, keys: set, exclude_ids: set = frozenset()) -> Dict:
+    """
+    Один set-based запрос: какие (project_id, title) из keys уже заняты в БД.
+    Возвращает {(project_id, title): id}.
+    """
+    if not keys:
+        return {}
+    project_ids = {project_id for project_id, _ in keys}
+    titles = {title for _, title in keys}
+    rows = db.execute(
+        select(Task.id, Task.project_id, Task.title)
+        .where(Task.project_id.in_(project_ids), Task.title.in_(titles))
+    ).all()
+    return {
+        (row.project_id, row.title): row.id
+        for row in rows
+        if (row.project_id, row.title) in keys and row.id not in exclude_ids
+    }
+
+def _write_in_chunks(db: Session, statement, rows: List[dict], indexes: List[int],
+                     chunk_size: int, errors: List[Dict], action: str, project_of) -> List[Dict]:
+    """
+    executemany по чанкам, каждый чанк — своя транзакция.
+    Ошибка БД помечает весь чанк, остальные чанки продолжаются.
+    executemany минует ORM-события, поэтому счётчики проектов, связи тегов и исполнителей чанка
+    пересчитываются в той же транзакции (project_of: row -> project_id).
+    """
+    written = []
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        chunk_indexes = indexes[start:start + chunk_size]
+        try:
+            result = db.execute(statement, chunk)
+            ids = result.scalars().all() if statement.is_insert else [row["id"] for row in chunk]
+            recompute_project_counters(db, {project_of(row) for row in chunk})
+            resync_tags(db, Task, ids if statement.is_insert else [row["id"] for row in chunk if "tags" in row])
+            resync_assignees(db, ids if statement.is_insert else [row["id"] for row in chunk if "assignees" in row])
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.error(f"Bulk {action} failed for items {chunk_indexes[0]}..{chunk_indexes[-1]}: {e}")
+            errors.extend(
+                {"index": i, "error": f"Database error while {action} task."} for i in chunk_indexes
+            )
+            continue
+        written.extend({"index": i, "id": task_id} for i, task_id in zip(chunk_indexes, ids))
+    return written
+
+def bulk_create_tasks(db: Session, items: List[dict], chunk_size: int = BULK_CHUNK_SIZE) -> Dict:
+    """
+    Массовое создание: валидация всего батча в памяти, одна проверка уникальности,
+    executemany INSERT чанками. Ошибки возвращаются по индексу элемента.
+    """
+    errors, rows, indexes = [], [], []
+    batch_keys = set()
+    for i, data in enumerate(items):
+        try:
+            row = _prepare_task_row(data)
+        except TaskValidationError as e:
+            errors.append({"index": i, "error": str(e)})
+            continue
+        key = (row["project_id"], row["title"])
+        if key in batch_keys:
+            errors.append({"index": i, "error": "Task title must be unique within a project."})
+            continue
+        batch_keys.add(key)
+        rows.append(row)
+        indexes.append(i)
+
+    taken = _taken_titles(db, batch_keys)
+    if taken:
+        drop = {n for n, row in enumerate(rows) if (row["project_id"], row["title"]) in taken}
+        errors.extend(
+            {"index": indexes[n], "error": "Task title must be unique within a project."} for n in drop
+        )
+        rows = [row for n, row in enumerate(rows) if n not in drop]
+        indexes = [index for n, index in enumerate(indexes) if n not in drop]
+
+    append_ranks(db, rows)
+    statement = insert(Task).returning(Task.id, sort_by_parameter_order=True)
+    created = _write_in_chunks(
+        db, statement, rows, indexes, chunk_size, errors, "creating", lambda row: row["project_id"]
+    )
+    logger.info(f"Bulk-created {len(created)} tasks ({len(errors)} errors)")
+    return {"succeeded": created, "errors": sorted(errors, key=lambda e: e["index"])}
+
+def bulk_update_tasks(db: Session, items: List[dict], chunk_size: int = BULK_CHUNK_SIZE) -> Dict:
+    """
+    Массовое обновление по id: текущее состояние читается одним запросом,
+    запись — ORM bulk UPDATE по первичному ключу (executemany) чанками.
+    """
+    ids = {item.get("id") for item in items if item.get("id") is not None}
+    current = {
+        row.id: row
+        for row in db.execute(
+            select(Task.id, Task.project_id, Task.title, Task.status, Task.deadline, Task.custom_fields)
+            .where(Task.id.in_(ids))
+        ).all()
+    } if ids else {}
+
+    errors, rows, indexes = [], [], []
+    renamed = {}
+    for i, data in enumerate(items):
+        task_id = data.get("id")
+        existing = current.get(task_id)
+        if existing is None:
+            errors.append({"index": i, "error": f"Task {task_id} not found."})
+            continue
+        try:
+            values = {field: data[field] for field in UPDATABLE_TASK_FIELDS if field in data}
+            if "title" in values:
+                values["title"] = (values["title"] or "").strip()
+                if not values["title"]:
+                    raise TaskValidationError("Task title is required.")
+            if "priority" in values:
+                values["priority"] = _parse_priority(values["priority"])
+            if "tags" in values:
+                values["tags"] = _parse_tags(values["tags"])
+            if "deadline" in values:
+                values["deadline"] = _parse_deadline(values["deadline"])
+            deadline = values.get("deadline", existing.deadline)
+            status = values.get("status", existing.status)
+            if deadline and deadline < date.today() and status != "done":
+                raise TaskValidationError("Deadline cannot be set to a past date.")
+            if "custom_fields" in data:
+                cf = _parse_custom_fields(data["custom_fields"])
+                values["custom_fields"] = {**(existing.custom_fields or {}), **cf}
+        except TaskValidationError as e:
+            errors.append({"index": i, "error": str(e)})
+            continue
+
+        if values.get("title", existing.title) != existing.title:
+            key = (existing.project_id, values["title"])
+            if key in renamed:
+                errors.append({"index": i, "error": "Task title must be unique within a project."})
+                continue
+            renamed[key] = len(rows)
+        values["id"] = task_id
+        values["updated_at"] = datetime.utcnow()
+        rows.append(values)
+        indexes.append(i)
+
+    # Старое название освобождает только задача, чьё переименование в этом батче проходит;
+    # отклонённое переименование возвращает ей старое название — проверка до устойчивости
+    drop = set()
+    while True:
+        accepted = {key: n for key, n in renamed.items() if n not in drop}
+        moving_away = {rows[n]["id"] for n in accepted.values()}
+        blocked = {accepted[key] for key in _taken_titles(db, set(accepted), exclude_ids=moving_away)}
+        if not blocked:
+            break
+        drop |= blocked
+    if drop:
+        errors.extend(
+            {"index": indexes[n], "error": "Task title must be unique within a project."} for n in drop
+        )
+        rows = [row for n, row in enumerate(rows) if n not in drop]
+        indexes = [index for n, index in enumerate(indexes) if n not in drop]
+
+    updated = _write_in_chunks(
+        db, update(Task), rows, indexes, chunk_size, errors, "updating",
+        lambda row: current[row["id"]].project_id,
+    )
+    logger.info(f"Bulk-updated {len(updated)} tasks ({len(errors)} errors)")
+    return {"succeeded": updated, "errors": sorted(errors, key=lambda e: e["index"])}
+
+def _expire_tasks(db: Session, ids) -> None:
+    # Set-based UPDATE минует unit of work: загруженные задачи перечитают поля при обращении
+    ids = set(ids)
+    for task in list(db.identity_map.values()):
+        if isinstance(task, Task) and task.id in ids:
+            db.expire(task)
+
+BULK_ACTIONS = ("set_status", "set_priority", "add_tag", "remove_tag", "archive", "restore", "move_project")
+
+def _with_tag(tag: str):
+    # id задач с тегом — по индексу связей (tag_id, task_id), как фильтр "tag"
+    return select(task_tags.c.task_id).join(Tag, Tag.id == task_tags.c.tag_id).where(Tag.name == tag)
+
+def _bulk_action_change(db: Session, action: str, value) -> tuple:
+    """
+    (значения SET, условие "строка действительно меняется") для действия bulk_task_action.
+    Условие отсекает строки, которые уже в нужном состоянии: они не переписываются
+    и не попадают в RETURNING.
+    """
+    if action == "set_status":
+        if not isinstance(value, str) or not value.strip() or len(value.strip()) > 24:
+            raise TaskValidationError("Status must be a non-empty string of up to 24 characters.")
+        value = value.strip()
+        # Задачи уходят в конец новой колонки: rank сбрасывается, колонка перенумеровывается
+        return {"status": value, "rank": None}, Task.status.is_distinct_from(value)
+    if action == "set_priority":
+        value = _parse_priority(value)
+        return {"priority": value}, Task.priority.is_distinct_from(value)
+    if action in ("add_tag", "remove_tag"):
+        if not isinstance(value, str) or not value:
+            raise TaskValidationError("Tag must be a non-empty string.")
+        if action == "add_tag":
+            return {"tags": json_array_append(Task.tags, value, is_postgres(db))}, Task.id.not_in(_with_tag(value))
+        return {"tags": json_array_remove(Task.tags, value, is_postgres(db))}, Task.id.in_(_with_tag(value))
+    if action == "archive":
+        return {"is_deleted": True}, Task.is_deleted == false()
+    if action == "restore":
+        return {"is_deleted": False}, Task.is_deleted == true()
+    if action == "move_project":
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise TaskValidationError("Target project id must be an integer.")
+        project = db.get(Project, value)
+        if project is None or project.is_deleted:
+            raise TaskValidationError(f"Project {value} not found.")
+        return {"project_id": value, "rank": None}, Task.project_id != value
+    raise TaskValidationError(f"Unknown bulk action '{action}'. Use one of: {', '.join(BULK_ACTIONS)}.")
+
+def bulk_task_action(db: Session, filters: dict, action: str, value=None, dry_run: bool = False) -> Dict:
+    """
+    Одно действие над всеми задачами, подходящими под filters (та же спека, что у списка задач):
+    один UPDATE ... WHERE <фильтры> RETURNING id вместо PATCH на каждую задачу.
+    dry_run — только число задач, которые изменятся.
+    Счётчики проектов, связи тегов и ранги колонок досок пересчитываются в той же транзакции.
+    """
+    filters = dict(filters or {})
+    # Проверяются условия, которые реально попадут в WHERE: спека отбрасывает
+    # status="all", поиск без слов и т.п. (show_archived=True — без условия "только живые")
+    narrowing, _ = TASK_FILTERS.where({**filters, "show_archived": True})
+    if not narrowing:
+        raise TaskValidationError("At least one filter is required for a bulk action.")
+    if action == "restore":
+        # Восстанавливаются архивные задачи — фильтр "только живые" здесь не имеет смысла
+        filters["show_archived"] = True
+    values, changed = _bulk_action_change(db, action, value)
+    clauses, params = TASK_FILTERS.where(filters)
+    where = (*clauses, changed)
+
+    if dry_run:
+        matched = db.execute(select(func.count()).select_from(Task).where(*where), params).scalar()
+        return {"action": action, "dry_run": True, "matched": matched, "ids": []}
+
+    tasks = Task.__table__
+    try:
+        affected_projects = set()
+        if action == "move_project":
+            # Названия уникальны в проекте: ни с задачами целевого проекта, ни между собой
+            moving = select(Task.id).where(*where).correlate(None)
+            conflicts = db.execute(
+                select(Task.title)
+                .where(or_(Task.project_id == values["project_id"], Task.id.in_(moving)))
+                .group_by(Task.title)
+                .having(func.count() > 1)
+                .limit(5),
+                params,
+            ).scalars().all()
+            if conflicts:
+                raise TaskValidationError(
+                    f"Task titles already exist in project {values['project_id']}: {', '.join(conflicts)}."
+                )
+            affected_projects.update(db.execute(select(Task.project_id).where(*where).distinct(), params).scalars())
+
+        rows = db.execute(
+            update(tasks).where(*where)
+            .values(**values, updated_at=datetime.utcnow())
+            .returning(tasks.c.id, tasks.c.project_id, tasks.c.status),
+            params,
+        ).all()
+        ids = [row.id for row in rows]
+        if action in ("set_status", "archive", "restore", "move_project"):
+            recompute_project_counters(db, affected_projects | {row.project_id for row in rows})
+        if action in ("add_tag", "remove_tag"):
+            resync_tags(db, Task, ids)
+        if "rank" in values:
+            for project_id, status in {(row.project_id, row.status) for row in rows}:
+                rebalance_column(db, project_id, status)
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Bulk action {action} failed: {e}")
+        raise TaskValidationError(f"Database error while applying bulk action '{action}'.")
+
+    _expire_tasks(db, ids)
+    logger.info(f"Bulk action {action} applied to {len(ids)} tasks")
+    return {"action": action, "dry_run": False, "matched": len(ids), "ids": ids}
+
+def _after_upsert(db: Session, project_ids, external_ids: List[str]) -> None:
+    recompute_project_counters(db, project_ids)
+    for start in range(0, len(external_ids), BULK_CHUNK_SIZE):
+        resync_assignees(db, db.execute(
+            select(Task.id).where(Task.external_id.in_(external_ids[start:start + BULK_CHUNK_SIZE]))
+        ).scalars().all())
+
+def upsert_tasks(db: Session, items: List[dict]) -> Dict:
+    """
+    Идемпотентная синхронизация задач по external_id (интеграции, nightly sync).
+    Возвращает счётчики created/updated/unchanged и ошибки по индексу элемента.
+    """
+    errors, rows = [], []
+    external_ids, title_keys = {}, {}
+    # external_id -> project_id уже синхронизированных задач
+    existing = dict(db.execute(
+        select(Task.external_id, Task.project_id)
+        .where(Task.external_id.in_({data["external_id"] for data in items if data.get("external_id")}))
+    ).all())
+    for i, data in enumerate(items):
+        try:
+            if not data.get("external_id"):
+                raise TaskValidationError("External ID is required for upsert.")
+            row = _prepare_task_row(data, allow_past_deadline=data["external_id"] in existing)
+        except TaskValidationError as e:
+            errors.append({"index": i, "error": str(e)})
+            continue
+        key = (row["project_id"], row["title"])
+        if row["external_id"] in external_ids:
+            errors.append({"index": i, "error": "Duplicate external_id within the batch."})
+            continue
+        if key in title_keys:
+            errors.append({"index": i, "error": "Task title must be unique within a project."})
+            continue
+        external_ids[row["external_id"]] = i
+        title_keys[key] = row["external_id"]
+        rows.append(row)
+
+    if title_keys:
+        holders = db.execute(
+            select(Task.project_id, Task.title, Task.external_id)
+            .where(
+                Task.project_id.in_({pid for pid, _ in title_keys}),
+                Task.title.in_({title for _, title in title_keys}),
+            )
+        ).all()
+        # Заголовок занят другой задачей (не той, что синхронизируется)
+        conflicts = {
+            title_keys[(h.project_id, h.title)]
+            for h in holders
+            if (h.project_id, h.title) in title_keys
+            and h.external_id != title_keys[(h.project_id, h.title)]
+        }
+        errors.extend(
+            {"index": external_ids[ext], "error": "Task title must be unique within a project."}
+            for ext in conflicts
+        )
+        rows = [row for row in rows if row["external_id"] not in conflicts]
+
+    # Задача может переехать в другой проект — пересчитываем и старые проекты
+    affected_projects = {row["project_id"] for row in rows}
+    affected_projects.update(existing[row["external_id"]] for row in rows if row["external_id"] in existing)
+    try:
+        counts = upsert_by_external_id(
+            db, Task, rows,
+            before_commit=lambda: _after_upsert(db, affected_projects, [row["external_id"] for row in rows]),
+        )
+    except SQLAlchemyError as e:
+        logger.error(f"Failed to upsert tasks: {e}")
+        raise TaskValidationError("Database error while upserting tasks.")
+    return {**counts, "errors": sorted(errors, key=lambda e: e["index"])}
+
 def soft_delete_task(db: Session, task_id: int) -> bool:
     task = get_task(db, task_id)
     if task.is_deleted:
@@ -227,6 +801,126 @@ def restore_task(db: Session, task_id: int) -> bool:
         logger.error(f"Failed to restore task: {e}")
         raise TaskValidationError("Database error while restoring task.")
 
+def _update_subtree(db: Session, task_id: int, values: dict, *where, include_archived: bool = False) -> list:
+    """
+    Один UPDATE ... WHERE id IN (WITH RECURSIVE поддерево) RETURNING id, project_id, status:
+    поддерево не загружается в сессию. Коммит — на вызывающем.
+    """
+    subtree = _subtree_cte(task_id, include_archived=include_archived)
+    tasks = Task.__table__
+    rows = db.execute(
+        update(tasks)
+        .where(tasks.c.id.in_(select(subtree.c.id)), *where)
+        .values(**values, updated_at=datetime.utcnow())
+        .returning(tasks.c.id, tasks.c.project_id, tasks.c.status)
+    ).all()
+    _expire_tasks(db, [row.id for row in rows])
+    return rows
+
+def archive_subtree(db: Session, task_id: int) -> List[int]:
+    """
+    Архивирует задачу со всеми живыми потомками одним запросом; возвращает id архивированных.
+    """
+    task = get_task(db, task_id)
+    if task.is_deleted:
+        raise TaskValidationError("Task already archived.")
+    try:
+        rows = _update_subtree(db, task_id, {"is_deleted": True}, Task.is_deleted == false())
+        recompute_project_counters(db, {row.project_id for row in rows})
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Failed to archive subtree of task {task_id}: {e}")
+        raise TaskValidationError("Database error while archiving task subtree.")
+    logger.info(f"Archived subtree of task {task_id}: {len(rows)} tasks")
+    return [row.id for row in rows]
+
+def restore_subtree(db: Session, task_id: int) -> List[int]:
+    """
+    Восстанавливает задачу и всех архивных потомков одним запросом; возвращает id восстановленных.
+    """
+    task = get_task(db, task_id)
+    if not task.is_deleted:
+        raise TaskValidationError("Task is not archived.")
+    try:
+        rows = _update_subtree(db, task_id, {"is_deleted": False}, Task.is_deleted == true(), include_archived=True)
+        recompute_project_counters(db, {row.project_id for row in rows})
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Failed to restore subtree of task {task_id}: {e}")
+        raise TaskValidationError("Database error while restoring task subtree.")
+    logger.info(f"Restored subtree of task {task_id}: {len(rows)} tasks")
+    return [row.id for row in rows]
+
+def reparent_subtree(db: Session, task_id: int, parent_task_id: Optional[int]) -> List[int]:
+    """
+    Переносит задачу с поддеревом под parent_task_id (None — на верхний уровень).
+    Новый родитель из другого проекта переносит в этот проект всё поддерево
+    (одним UPDATE; задачи встают в конец колонок досок). Возвращает id изменённых задач.
+    """
+    task = get_task(db, task_id)
+    old_project_id = project_id = task.project_id
+    if parent_task_id is not None:
+        parent = db.execute(
+            select(Task.project_id, Task.is_deleted).where(Task.id == parent_task_id)
+        ).first()
+        if parent is None:
+            raise TaskNotFound(f"Task {parent_task_id} not found.")
+        if parent.is_deleted:
+            raise TaskValidationError("Cannot move a task under an archived task.")
+        # Цикл: новый родитель внутри переносимого поддерева (включая архивные ветки)
+        subtree = _subtree_cte(task_id, include_archived=True)
+        if db.execute(select(subtree.c.id).where(subtree.c.id == parent_task_id).limit(1)).first():
+            raise TaskValidationError("Cannot move a task under itself or its own subtask.")
+        project_id = parent.project_id
+
+    if project_id == old_project_id:
+        # Тот же проект: меняется только корень, потомки остаются под ним
+        if task.parent_task_id == parent_task_id:
+            return []
+        task.parent_task_id = parent_task_id
+        task.updated_at = datetime.utcnow()
+        try:
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.error(f"Failed to reparent task {task_id}: {e}")
+            raise TaskValidationError("Database error while moving task.")
+        logger.info(f"Moved task {task_id} under {parent_task_id}")
+        return [task_id]
+
+    subtree = _subtree_cte(task_id, include_archived=True)
+    conflicts = db.execute(
+        select(Task.title)
+        .where(or_(Task.project_id == project_id, Task.id.in_(select(subtree.c.id))))
+        .group_by(Task.title)
+        .having(func.count() > 1)
+        .limit(5)
+    ).scalars().all()
+    if conflicts:
+        raise TaskValidationError(f"Task titles already exist in project {project_id}: {', '.join(conflicts)}.")
+
+    tasks = Task.__table__
+    values = {
+        # Корню — новый родитель, потомкам — прежний
+        "parent_task_id": case((tasks.c.id == task_id, parent_task_id), else_=tasks.c.parent_task_id),
+        "project_id": project_id,
+        "rank": None,
+    }
+    try:
+        rows = _update_subtree(db, task_id, values, include_archived=True)
+        recompute_project_counters(db, {old_project_id, project_id})
+        for column in {(row.project_id, row.status) for row in rows}:
+            rebalance_column(db, *column)
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Failed to reparent task {task_id}: {e}")
+        raise TaskValidationError("Database error while moving task subtree.")
+    logger.info(f"Moved task {task_id} under {parent_task_id} ({len(rows)} tasks updated)")
+    return [row.id for row in rows]
+
 def get_ai_context(db: Session, task_id: int) -> Dict:
     task = get_task(db, task_id)
     is_overdue = bool(task.deadline and task.deadline < date.today() and task.status != "done")
@@ -1,12 +1,21 @@
 #app/crud/template.py
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from app.models.project import Project
 from app.models.template import Template
 from app.core.exceptions import (
     DuplicateProjectName,
     ProjectValidationError,
     # Можно создать TemplateNotFoundError
 )
+from app.core.fieldsets import InvalidFieldset, fieldset_options
+from app.crud.filters import TEMPLATE_FILTERS
+from app.schemas.template import TemplateRead
+from app.crud.project import _prepare_project_row, get_project
+from app.services.template_engine import (
+    TemplateStructureError, capture_structure, compile_structure, compiled_template, forget_template, instantiate,
+)
 import logging
 from typing import List, Optional, Dict
 
@@ -57,23 +66,17 @@ def get_template(db: Session, template_id: int) -> Template:
         raise ProjectValidationError(f"Template with id={template_id} not found.")
     return template
 
-def get_all_templates(db: Session, filters: Optional[Dict] = None) -> List[Template]:
-    filters = filters or {}
-    query = db.query(Template)
-
-    if "is_active" in filters:
-        query = query.filter(Template.is_active == filters["is_active"])
-
-    if "name" in filters:
-        query = query.filter(Template.name.ilike(f"%{filters['name']}%"))
-
-    if "tag" in filters:
-        query = query.filter(Template.tags.contains([filters["tag"]]))
+TEMPLATE_HEAVY_COLUMNS = ("description", "structure", "ai_notes")
 
-    if "subscription_level" in filters:
-        query = query.filter(Template.subscription_level == filters["subscription_level"])
-
-    return query.order_by(Template.created_at.desc()).all()
+def get_all_templates(db: Session, filters: Optional[Dict] = None,
+                      fields: Optional[List[str]] = None) -> List[Template]:
+    filters = filters or {}
+    try:
+        options = fieldset_options(Template, TemplateRead, fields, TEMPLATE_HEAVY_COLUMNS)
+    except InvalidFieldset as e:
+        raise ProjectValidationError(str(e))
+    query = db.query(Template).options(*options)
+    return TEMPLATE_FILTERS.apply(query, filters).all()
 
 def update_template(db: Session, template_id: int, data: dict) -> Template:
     template = get_template(db, template_id)
@@ -102,6 +105,94 @@ def update_template(db: Session, template_id: int, data: dict) -> Template:
         logger.error(f"Error updating template {template.id}: {e}")
         raise ProjectValidationError("Database error while updating template.")
 
+def delete_template(db: Session, template_id: int) -> bool:
+    template = get_template(db, template_id)
+    db.delete(template)
+    try:
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to delete template {template_id}: {e}")
+        raise ProjectValidationError("Database error while deleting template.")
+    forget_template(template_id)
+    logger.info(f"Deleted template {template_id}")
+    return True
+
+def clone_template_to_project(db: Session, template_id: int, project_data: dict) -> Project:
+    """
+    Новый проект из шаблона: проект, плагины и дерево задач structure в одной транзакции
+    (app/services/template_engine.py). Структура компилируется один раз на версию шаблона.
+    """
+    template = db.execute(
+        select(Template.id, Template.updated_at, Template.is_active).where(Template.id == template_id)
+    ).first()
+    if template is None:
+        raise ProjectValidationError(f"Template with id={template_id} not found.")
+    if not template.is_active:
+        raise ProjectValidationError("Template is inactive.")
+
+    row = _prepare_project_row(project_data)
+    if db.query(Project).filter_by(name=row["name"]).first():
+        raise DuplicateProjectName(f"Project with name '{row['name']}' already exists.")
+    try:
+        compiled = compiled_template(db, template_id, template.updated_at)
+        result = instantiate(db, compiled, row)
+        db.commit()
+    except TemplateStructureError as e:
+        db.rollback()
+        raise ProjectValidationError(f"Invalid template structure: {e}")
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Failed to create project from template {template_id}: {e}")
+        raise ProjectValidationError("Database error while creating project from template.")
+    logger.info(f"Created project {result['project_id']} from template {template_id}")
+    return db.get(Project, result["project_id"])
+
+def create_template_from_project(db: Session, project_id: int, data: dict) -> Template:
+    """
+    Шаблон из существующего проекта (structure собирается capture_structure за один проход).
+    Структура сразу проверяется компилятором: из шаблона гарантированно создаётся проект.
+    """
+    project = get_project(db, project_id)
+    name = (data.get("name") or f"{project.name} template").strip()
+    if not name:
+        raise ProjectValidationError("Template name is required.")
+    if len(name) > 128:
+        raise ProjectValidationError("Template name must be at most 128 characters.")
+    if db.query(Template).filter(Template.name == name).first():
+        raise DuplicateProjectName(f"Template with name '{name}' already exists.")
+
+    structure = capture_structure(
+        db, project_id,
+        strip_dates=data.get("strip_dates", False),
+        strip_assignees=data.get("strip_assignees", False),
+    )
+    try:
+        compile_structure(project_id, project.updated_at, structure)
+    except TemplateStructureError as e:
+        raise ProjectValidationError(f"Project cannot be captured as a template: {e}")
+
+    template = Template(
+        name=name,
+        description=data.get("description") or project.description,
+        version="1.0.0",
+        author=data.get("author"),
+        is_active=True,
+        tags=project.tags or [],
+        structure=structure,
+        subscription_level=project.subscription_level,
+        is_private=data.get("is_private", False),
+    )
+    db.add(template)
+    try:
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Failed to create template from project {project_id}: {e}")
+        raise ProjectValidationError("Database error while creating template.")
+    logger.info(f"Created template {template.id} from project {project_id}")
+    return template
+
 def soft_delete_template(db: Session, template_id: int) -> bool:
     template = get_template(db, template_id)
     if not template.is_active:
@@ -0,0 +1,110 @@
+#app/crud/upsert.py
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import JSON, Boolean, cast, insert, literal_column, or_, select, update
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.dialect import is_postgres
+from app.services.tag_index import TAG_LINKS, resync_tags
+import logging
+
+logger = logging.getLogger("DevOS.Upsert")
+
+UPSERT_CHUNK_SIZE = 1000
+
+# Эти колонки не перезаписываются при обновлении и не участвуют в сравнении
+IMMUTABLE_ON_UPDATE = {"id", "external_id", "created_at", "updated_at", "is_deleted"}
+
+def _is_distinct(column, other):
+    if isinstance(column.type, JSON):
+        # json в Postgres не сравнивается, jsonb — сравнивается
+        return cast(column, JSONB).is_distinct_from(cast(other, JSONB))
+    return column.is_distinct_from(other)
+
+def _upsert_postgres(db: Session, model, rows: List[dict], fields: List[str]) -> Dict[str, int]:
+    created = updated = 0
+    for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+        stmt = pg_insert(model).values(rows[start:start + UPSERT_CHUNK_SIZE])
+        excluded = stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[model.external_id],
+            set_={**{f: excluded[f] for f in fields}, "updated_at": excluded.updated_at},
+            # Неизменённые строки не переписываются и не попадают в RETURNING
+            where=or_(*[_is_distinct(getattr(model, f), excluded[f]) for f in fields]),
+        ).returning(model.id, literal_column("xmax = 0", Boolean).label("inserted"))
+        for row in db.execute(stmt):
+            if row.inserted:
+                created += 1
+            else:
+                updated += 1
+    return {"created": created, "updated": updated}
+
+def _upsert_portable(db: Session, model, rows: List[dict], fields: List[str]) -> Dict[str, int]:
+    existing = {}
+    keys = [row["external_id"] for row in rows]
+    for start in range(0, len(keys), UPSERT_CHUNK_SIZE):
+        for current in db.execute(
+            select(model.id, model.external_id, *[getattr(model, f) for f in fields])
+            .where(model.external_id.in_(keys[start:start + UPSERT_CHUNK_SIZE]))
+        ).mappings():
+            existing[current["external_id"]] = current
+
+    to_insert, to_update = [], []
+    for row in rows:
+        current = existing.get(row["external_id"])
+        if current is None:
+            to_insert.append(row)
+        elif any(current[f] != row[f] for f in fields):
+            to_update.append({
+                "id": current["id"],
+                "updated_at": row["updated_at"],
+                **{f: row[f] for f in fields},
+            })
+    if to_insert:
+        db.execute(insert(model), to_insert)
+    if to_update:
+        db.execute(update(model), to_update)
+    return {"created": len(to_insert), "updated": len(to_update)}
+
+def _resync_upserted_tags(db: Session, model, external_ids: List[str]) -> None:
+    for start in range(0, len(external_ids), UPSERT_CHUNK_SIZE):
+        ids = db.execute(
+            select(model.id).where(model.external_id.in_(external_ids[start:start + UPSERT_CHUNK_SIZE]))
+        ).scalars().all()
+        resync_tags(db, model, ids)
+
+def upsert_by_external_id(db: Session, model, rows: List[dict],
+                          before_commit: Optional[Callable[[], None]] = None) -> Dict[str, int]:
+    """
+    Идемпотентный upsert по external_id в одной транзакции.
+    rows — уже провалидированные значения колонок с уникальными external_id.
+    Postgres: INSERT ... ON CONFLICT DO UPDATE ... WHERE <что-то изменилось>;
+    остальные диалекты: один SELECT существующих + executemany INSERT/UPDATE.
+    before_commit — производные данные (счётчики и т.п.) в той же транзакции;
+    связи тегов (app/services/tag_index.py) пересинхронизируются здесь же.
+    """
+    if not rows:
+        return {"created": 0, "updated": 0, "unchanged": 0}
+    now = datetime.utcnow()
+    for row in rows:
+        row["updated_at"] = now
+    fields = [f for f in rows[0] if f not in IMMUTABLE_ON_UPDATE]
+
+    try:
+        if is_postgres(db):
+            counts = _upsert_postgres(db, model, rows, fields)
+        else:
+            counts = _upsert_portable(db, model, rows, fields)
+        if model in TAG_LINKS and "tags" in fields:
+            _resync_upserted_tags(db, model, [row["external_id"] for row in rows])
+        if before_commit is not None:
+            before_commit()
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    counts["unchanged"] = len(rows) - counts["created"] - counts["updated"]
+    logger.info(f"Upserted {model.__tablename__}: {counts}")
+    return counts
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from app.models.user import User
 from app.core.exceptions import ProjectValidationError
+from app.crud.filters import USER_FILTERS
 from typing import List, Optional
 from passlib.context import CryptContext
 import logging
@@ -86,16 +87,7 @@ def update_user(db: Session, user_id: int, data: dict) -> User:
         raise ProjectValidationError("Database error while updating user.")
 
 def get_users(db: Session, filters: dict = None) -> List[User]:
-    filters = filters or {}
-    query = db.query(User)
-    if "is_active" in filters:
-        query = query.filter(User.is_active == filters["is_active"])
-    if "role" in filters:
-        query = query.filter(User.roles.contains([filters["role"]]))
-    if "search" in filters:
-        value = f"%{filters['search']}%"
-        query = query.filter((User.username.ilike(value)) | (User.full_name.ilike(value)))
-    return query.order_by(User.created_at.desc()).all()
+    return USER_FILTERS.apply(db.query(User), filters).all()
 
 def set_last_login(db: Session, user_id: int) -> None:
     user = get_user(db, user_id)
@@ -2,6 +2,7 @@
 
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 
@@ -11,10 +12,12 @@ import os
 
 # --- Auto Import All Routers ---
 from app.api import (
-    ai_context, auth, devlog, jarvis, plugin, project, settings,
-    task, team, template, token_refresh, user
+    ai_context, auth, devlog, jarvis, me, plugin, project, search, settings,
+    tag, task, team, template, token_refresh, typeahead, user
 )
 from app.core.settings import settings
+from app.core.statement_cache import compiled_cache_stats
+from app.crud.filters import FILTER_SPECS
 print(settings.DATABASE_URL)
 print(settings.SECRET_KEY)
 
@@ -34,6 +37,7 @@ app = FastAPI(
     title=API_TITLE,
     version=API_VERSION,
     description="Backend for modular AI-ready project manager (FastAPI)",
+    default_response_class=ORJSONResponse,  # orjson вместо stdlib json для всех ответов
 )
 
 # --- CORS middleware ---
@@ -56,13 +60,17 @@ app.include_router(ai_context.router)
 app.include_router(auth.router)
 app.include_router(devlog.router)
 app.include_router(jarvis.router)
+app.include_router(me.router)
 app.include_router(plugin.router)
 app.include_router(project.router)
+app.include_router(search.router)
 app.include_router(settings.router)
+app.include_router(tag.router)
 app.include_router(task.router)
 app.include_router(team.router)
 app.include_router(template.router)
 app.include_router(token_refresh.router)
+app.include_router(typeahead.router)
 app.include_router(user.router)
 
 # --- Healthcheck and Root ---
@@ -74,6 +82,14 @@ def read_root():
 def health():
     return {"ok": True}
 
+@app.get("/health/statement-cache", tags=["Health"])
+def statement_cache():
+    # compiled — кеш скомпилированного SQL SQLAlchemy, filters — кеш WHERE по сигнатуре фильтров
+    return {
+        "compiled": compiled_cache_stats(),
+        "filters": {spec.name: spec.cache_info() for spec in FILTER_SPECS},
+    }
+
 # --- Custom Exception handlers, error schemas, logging can be added here ---
 # Example: from app.schemas.response import ErrorResponse
 
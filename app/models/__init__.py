@@ -7,5 +7,11 @@ from .jarvis import ChatMessage
 from .template import Template
 from .settings import Setting
 from .team import Team
+from .tag import Tag
+from .project_plugin import ProjectPlugin
+from . import task_assignee
+
+# FTS5-таблицы поиска для SQLite создаются слушателем after_create
+from app.core import fulltext  # noqa: F401
 
 # додай тут всі свої моделі!
@@ -1,6 +1,6 @@
 #app/models/ai_context.py
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, JSON, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Boolean, Index
 from app.models.base import Base
 
 class AIContext(Base):
@@ -17,5 +17,11 @@ class AIContext(Base):
     notes = Column(String(512), nullable=True)        # коментарі
     is_deleted = Column(Boolean, default=False, nullable=False)  # soft-delete
 
+    __table_args__ = (
+        # Сортировка списка по умолчанию (created_at DESC, id DESC); список не отсекает is_deleted.
+        # SQLite не поддерживает NULLS LAST в индексах
+        Index("ix_ai_contexts_created_at", created_at.desc().nulls_last(), id.desc()).ddl_if(dialect="postgresql"),
+    )
+
     def __repr__(self):
         return f"<AIContext(id={self.id}, object_type='{self.object_type}', object_id={self.object_id})>"
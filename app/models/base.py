@@ -1,4 +1,9 @@
 #app/models/base.py
+from sqlalchemy import JSON
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import declarative_base
 
 Base = declarative_base()
+
+# JSON-колонки: в Postgres — JSONB (операторы @>, GIN-индексы), в остальных диалектах — JSON
+JSONType = JSON().with_variant(JSONB(), "postgresql")
@@ -2,13 +2,19 @@
 
 
 from sqlalchemy import (
-    Column, Integer, String, DateTime, ForeignKey, JSON, Boolean, Index
+    Column, Integer, String, DateTime, ForeignKey, Boolean, Index
 )
 from sqlalchemy.orm import relationship
 import datetime
-from app.models.base import Base
+from app.models.base import Base, JSONType
 
 class DevLogEntry(Base):
+    """
+    В Postgres таблица партиционирована по месяцу created_at и по entry_type
+    (миграция 7e2a4c9b15d3, app/services/devlog_partitions.py), физический PK —
+    (id, created_at). Модель описывает PK как id: он уникален (последовательность),
+    а create_all на SQLite остаётся обычной таблицей.
+    """
     __tablename__ = "devlog_entries"
 
     id = Column(Integer, primary_key=True)
@@ -18,15 +24,15 @@ class DevLogEntry(Base):
     entry_type = Column(String(24), nullable=False, default="note")  # "note", "action", "decision", "meeting"
     content = Column(String(5000), nullable=False)
     author = Column(String(64), nullable=False)
-    tags = Column(JSON, default=list)
-    custom_fields = Column(JSON, default=dict)
+    tags = Column(JSONType, default=list)
+    custom_fields = Column(JSONType, default=dict)
 
     # Аудит
     edited_by = Column(String(64), nullable=True)
     edit_reason = Column(String(256), nullable=True)
 
     # Вложения (список файлов/ссылок)
-    attachments = Column(JSON, default=list)
+    attachments = Column(JSONType, default=list)
 
     # AI-примечания
     ai_notes = Column(String(2000), nullable=True)
@@ -43,6 +49,19 @@ class DevLogEntry(Base):
     # Доданий індекс по created_at:
     __table_args__ = (
         Index("ix_devlog_entries_created_at", "created_at"),
+        Index("ix_devlog_entries_tags_gin", "tags", postgresql_using="gin", postgresql_ops={"tags": "jsonb_path_ops"}),
+        Index("ix_devlog_entries_custom_fields_gin", "custom_fields", postgresql_using="gin", postgresql_ops={"custom_fields": "jsonb_path_ops"}),
+        # Частичные индексы под ленту devlog (is_deleted = false, новые сверху)
+        Index(
+            "ix_devlog_entries_live_project_created_at",
+            project_id, created_at.desc(), id.desc(),
+            postgresql_where=(is_deleted == False), sqlite_where=(is_deleted == False),
+        ),
+        Index(
+            "ix_devlog_entries_live_created_at",
+            created_at.desc(), id.desc(),
+            postgresql_where=(is_deleted == False), sqlite_where=(is_deleted == False),
+        ),
     )
 
     def __repr__(self):
@@ -1,6 +1,6 @@
 #app/models/jarvis.py
 import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, func, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, func, Boolean, Index
 from app.models.base import Base
 
 class ChatMessage(Base):
@@ -24,6 +24,15 @@ class ChatMessage(Base):
     ai_notes = Column(Text, nullable=True)                     # AI summary/explanation
     attachments = Column(JSON, default=list)                   # [{ "url": "...", "type": "...", "name": "..." }]
 
+    __table_args__ = (
+        # История чата проекта без удалённых сообщений, по времени
+        Index(
+            "ix_chat_messages_live_project_timestamp",
+            project_id, timestamp,
+            postgresql_where=(is_deleted == False), sqlite_where=(is_deleted == False),
+        ),
+    )
+
     def __repr__(self):
         return (
             f"<ChatMessage(id={self.id}, project_id={self.project_id}, role='{self.role}', timestamp='{self.timestamp}')>"
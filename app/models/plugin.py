@@ -1,6 +1,6 @@
 #app/models/plugin.py
-from sqlalchemy import Column, Integer, String, Boolean, JSON
-from app.models.base import Base
+from sqlalchemy import Column, Index, Integer, String, Boolean
+from app.models.base import Base, JSONType
 
 class Plugin(Base):
     __tablename__ = "plugins"
@@ -9,7 +9,7 @@ class Plugin(Base):
     name = Column(String(100), unique=True, nullable=False, index=True)
     description = Column(String(500), nullable=True)
 
-    config_json = Column(JSON, nullable=False, default=dict)   # Основная конфигурация (любая структура)
+    config_json = Column(JSONType, nullable=False, default=dict)   # Основная конфигурация (любая структура)
     is_active = Column(Boolean, default=True, nullable=False)
 
     # --- Дополнительно для масштабируемости/Pro ---
@@ -20,7 +20,11 @@ class Plugin(Base):
     ui_component = Column(String(64), nullable=True)           # Имя компонента фронта (например, "KanbanBoard")
 
     # Можно добавить поле tags для быстрого поиска/фильтрации
-    tags = Column(JSON, default=list)                          # ["calendar", "kanban"]
+    tags = Column(JSONType, default=list)                          # ["calendar", "kanban"]
+
+    __table_args__ = (
+        Index("ix_plugins_tags_gin", "tags", postgresql_using="gin", postgresql_ops={"tags": "jsonb_path_ops"}),
+    )
 
     def __repr__(self):
         return f"<Plugin(id={self.id}, name='{self.name}', version={self.version}, active={self.is_active})>"
@@ -1,8 +1,8 @@
 #app/models/project.py
 import datetime
-from app.models.base import Base
+from app.models.base import Base, JSONType
 from sqlalchemy import (
-    Column, Integer, String, Date, DateTime, Text, JSON, ForeignKey, Boolean, Index
+    Column, Integer, String, Date, DateTime, Text, ForeignKey, Boolean, Index
 )
 
 class Project(Base):
@@ -12,13 +12,13 @@ class Project(Base):
     name = Column(String(128), nullable=False, index=True)
     description = Column(Text, nullable=True)
     status = Column(String(32), nullable=False, default="active", index=True)
-    deadline = Column(Date, nullable=True, index=True)  # Індекс по дедлайну
+    deadline = Column(Date, nullable=True)  # Індекс по дедлайну — ix_projects_deadline
     created_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False, onupdate=datetime.datetime.utcnow)
 
-    participants = Column(JSON, nullable=True, default=list)    # [{name, email, role}]
-    tags = Column(JSON, nullable=True, default=list)            # ["python", "startup"]
-    custom_fields = Column(JSON, default=dict)                  # Додаткові поля
+    participants = Column(JSONType, nullable=True, default=list)    # [{name, email, role}]
+    tags = Column(JSONType, nullable=True, default=list)            # ["python", "startup"]
+    custom_fields = Column(JSONType, default=dict)                  # Додаткові поля
 
     priority = Column(Integer, default=3)
     linked_repo = Column(String(256), nullable=True)
@@ -32,18 +32,55 @@ class Project(Base):
     is_deleted = Column(Boolean, default=False, nullable=False)
     is_favorite = Column(Boolean, default=False, nullable=False)
     ai_notes = Column(Text, nullable=True)
-    attachments = Column(JSON, default=list)
+    attachments = Column(JSONType, default=list)
 
-    external_id = Column(String(64), nullable=True, index=True)   # Для інтеграцій (та індекс для швидкого пошуку)
+    external_id = Column(String(64), nullable=True)   # Для інтеграцій (унікальний індекс нижче — upsert)
     subscription_level = Column(String(32), nullable=True)
 
+    # Денормалізовані лічильники прогресу (див. app/services/project_counters.py)
+    tasks_total = Column(Integer, nullable=False, default=0, server_default="0")
+    tasks_done = Column(Integer, nullable=False, default=0, server_default="0")
+
+    @property
+    def tasks_open(self) -> int:
+        return (self.tasks_total or 0) - (self.tasks_done or 0)
+
+    @property
+    def progress(self) -> float:
+        return round(self.tasks_done / self.tasks_total, 4) if self.tasks_total else 0.0
+
     def __repr__(self):
         return f"<Project(id={self.id}, name='{self.name}', status='{self.status}', priority={self.priority})>"
 
     # Додаткові індекси (deadline, external_id)
     __table_args__ = (
         Index("ix_projects_deadline", "deadline"),
-        Index("ix_projects_external_id", "external_id"),
+        Index("ix_projects_external_id", "external_id", unique=True),
+        # GIN (jsonb_path_ops) под фильтры @> по тегам и custom_fields
+        Index("ix_projects_tags_gin", "tags", postgresql_using="gin", postgresql_ops={"tags": "jsonb_path_ops"}),
+        Index("ix_projects_custom_fields_gin", "custom_fields", postgresql_using="gin", postgresql_ops={"custom_fields": "jsonb_path_ops"}),
+        # GIN (pg_trgm) под typeahead по имени проекта
+        Index(
+            "ix_projects_live_name_trgm", name,
+            postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"},
+            postgresql_where=(is_deleted == False),
+        ).ddl_if(dialect="postgresql"),
+        # Частичные индексы под список проектов (is_deleted = false)
+        Index(
+            "ix_projects_live_created_at",
+            created_at.desc(),
+            postgresql_where=(is_deleted == False), sqlite_where=(is_deleted == False),
+        ),
+        Index(
+            "ix_projects_live_status_created_at",
+            status, created_at.desc(),
+            postgresql_where=(is_deleted == False), sqlite_where=(is_deleted == False),
+        ),
+        Index(
+            "ix_projects_live_priority",
+            priority, id,
+            postgresql_where=(is_deleted == False), sqlite_where=(is_deleted == False),
+        ),
     )
 
 def init_db(engine):
@@ -0,0 +1,25 @@
+#app/models/project_plugin.py
+from datetime import datetime
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer
+from app.models.base import Base, JSONType
+
+class ProjectPlugin(Base):
+    """
+    Подключение плагина к проекту (создаётся из structure.plugins шаблона, app/services/template_engine.py).
+    config — настройки плагина в этом проекте поверх Plugin.config_json.
+    """
+    __tablename__ = "project_plugins"
+
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    plugin_id = Column(Integer, ForeignKey("plugins.id", ondelete="CASCADE"), primary_key=True)
+    config = Column(JSONType, nullable=False, default=dict)
+    is_enabled = Column(Boolean, default=True, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        # Проекты с плагином (PK покрывает плагины проекта)
+        Index("ix_project_plugins_plugin_id", "plugin_id", "project_id"),
+    )
+
+    def __repr__(self):
+        return f"<ProjectPlugin(project_id={self.project_id}, plugin_id={self.plugin_id}, enabled={self.is_enabled})>"
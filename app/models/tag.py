@@ -0,0 +1,36 @@
+#app/models/tag.py
+from datetime import datetime
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, Table, Text
+from app.models.base import Base
+
+class Tag(Base):
+    """
+    Нормализованный справочник тегов. Источник правды — JSON-массивы tags у сущностей,
+    связи <entity>_tags поддерживаются app/services/tag_index.py.
+    """
+    __tablename__ = "tags"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(Text, nullable=False, unique=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<Tag(id={self.id}, name='{self.name}')>"
+
+def _link_table(name: str, entity_table: str, entity_column: str, foreign_key: bool = True) -> Table:
+    # PK (entity, tag) — теги сущности; индекс (tag, entity) — сущности по тегу
+    entity_fk = [ForeignKey(f"{entity_table}.id", ondelete="CASCADE")] if foreign_key else []
+    return Table(
+        name, Base.metadata,
+        Column(entity_column, Integer, *entity_fk, primary_key=True),
+        Column("tag_id", Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+        Index(f"ix_{name}_tag_id", "tag_id", entity_column),
+    )
+
+task_tags = _link_table("task_tags", "tasks", "task_id")
+project_tags = _link_table("project_tags", "projects", "project_id")
+# devlog_entries партиционирована (PK id, created_at) — FK на id невозможен,
+# связи удаляют drop_tags() и retention (app/services/devlog_partitions.py)
+devlog_entry_tags = _link_table("devlog_entry_tags", "devlog_entries", "entry_id", foreign_key=False)
+template_tags = _link_table("template_tags", "templates", "template_id")
+plugin_tags = _link_table("plugin_tags", "plugins", "plugin_id")
@@ -1,10 +1,10 @@
 #app/models/task.py
 import datetime
 from sqlalchemy import (
-    Column, Integer, String, Date, DateTime, ForeignKey, JSON, Boolean, Index
+    Column, Integer, String, Date, DateTime, ForeignKey, Boolean, Index
 )
 from sqlalchemy.orm import relationship
-from app.models.base import Base
+from app.models.base import Base, JSONType
 
 class Task(Base):
     __tablename__ = "tasks"  # множина, для consistency
@@ -16,14 +16,17 @@ class Task(Base):
     title = Column(String(160), nullable=False)
     description = Column(String(2000), default="")
 
-    status = Column(String(24), default="todo", index=True)  # індекс для швидкої фільтрації
-    priority = Column(Integer, default=3, index=True)        # індекс для Kanban/AI/сортування
-    deadline = Column(Date, nullable=True, index=True)       # індекс для пошуку по даті
+    status = Column(String(24), default="todo")  # ix_tasks_status — індекс для швидкої фільтрації
+    priority = Column(Integer, default=3)         # ix_tasks_priority — індекс для Kanban/AI/сортування
+    deadline = Column(Date, nullable=True)       # ix_tasks_deadline — індекс для пошуку по даті
+    # Ручной порядок в колонке доски (project_id, status), см. app/core/lexorank.py.
+    # Побайтное сравнение: в Postgres — COLLATE "C", в SQLite BINARY по умолчанию
+    rank = Column(String(64).with_variant(String(64, collation="C"), "postgresql"), nullable=True)
 
-    assignees = Column(JSON, nullable=True, default=list)    # [{user_id, name, role}]
-    tags = Column(JSON, default=list)                        # ["bug", "feature"]
+    assignees = Column(JSONType, nullable=True, default=list)    # [{user_id, name, role}]
+    tags = Column(JSONType, default=list)                        # ["bug", "feature"]
 
-    custom_fields = Column(JSON, default=dict)                # Кастомные поля
+    custom_fields = Column(JSONType, default=dict)                # Кастомные поля
 
     created_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False, onupdate=datetime.datetime.utcnow)
@@ -32,8 +35,8 @@ class Task(Base):
     is_favorite = Column(Boolean, default=False, nullable=False)
 
     ai_notes = Column(String(2000), nullable=True)
-    attachments = Column(JSON, default=list)
-    external_id = Column(String(64), nullable=True, index=True)  # для інтеграцій, індекс!
+    attachments = Column(JSONType, default=list)
+    external_id = Column(String(64), nullable=True)  # для інтеграцій, унікальний індекс нижче (upsert)
     reviewed = Column(Boolean, default=False, nullable=False)
 
     # Сабтаски (self-referencing)
@@ -41,9 +44,50 @@ class Task(Base):
 
     __table_args__ = (
         Index("ix_tasks_deadline", "deadline"),
-        Index("ix_tasks_external_id", "external_id"),
+        Index("ix_tasks_external_id", "external_id", unique=True),
         Index("ix_tasks_status", "status"),
         Index("ix_tasks_priority", "priority"),
+        # GIN (jsonb_path_ops) под фильтры @> по тегам, исполнителям и custom_fields
+        Index("ix_tasks_tags_gin", "tags", postgresql_using="gin", postgresql_ops={"tags": "jsonb_path_ops"}),
+        Index("ix_tasks_assignees_gin", "assignees", postgresql_using="gin", postgresql_ops={"assignees": "jsonb_path_ops"}),
+        Index("ix_tasks_custom_fields_gin", "custom_fields", postgresql_using="gin", postgresql_ops={"custom_fields": "jsonb_path_ops"}),
+        # GIN (pg_trgm) под typeahead по названию: ILIKE 'q%' и word_similarity (%>)
+        Index(
+            "ix_tasks_live_title_trgm", title,
+            postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"},
+            postgresql_where=(is_deleted == False),
+        ).ddl_if(dialect="postgresql"),
+        # Частичные составные индексы под списки (is_deleted = false + project_id + сортировка)
+        Index(
+            "ix_tasks_live_project_status_deadline",
+            project_id, status, deadline.desc().nulls_last(), id.desc(),
+            postgresql_where=(is_deleted == False), sqlite_where=(is_deleted == False),
+        ).ddl_if(dialect="postgresql"),  # SQLite не поддерживает NULLS LAST в индексах
+        Index(
+            "ix_tasks_live_project_status_priority",
+            project_id, status, priority, id,
+            postgresql_where=(is_deleted == False), sqlite_where=(is_deleted == False),
+        ),
+        Index(
+            "ix_tasks_live_project_deadline",
+            project_id, deadline.desc().nulls_last(), id.desc(),
+            postgresql_where=(is_deleted == False), sqlite_where=(is_deleted == False),
+        ).ddl_if(dialect="postgresql"),  # SQLite не поддерживает NULLS LAST в индексах
+        Index(
+            "ix_tasks_live_project_priority",
+            project_id, priority, id,
+            postgresql_where=(is_deleted == False), sqlite_where=(is_deleted == False),
+        ),
+        Index(
+            "ix_tasks_live_project_status_rank",
+            project_id, status, rank,
+            postgresql_where=(is_deleted == False), sqlite_where=(is_deleted == False),
+        ),
+        Index(
+            "ix_tasks_live_project_created_at",
+            project_id, created_at.desc(), id.desc(),
+            postgresql_where=(is_deleted == False), sqlite_where=(is_deleted == False),
+        ),
     )
 
     def __repr__(self):
@@ -0,0 +1,14 @@
+#app/models/task_assignee.py
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, Table
+from app.models.base import Base
+
+# Нормализованные исполнители задач. Источник правды — JSON tasks.assignees,
+# строки поддерживаются app/services/assignee_index.py (только элементы с user_id).
+# PK (task_id, user_id) — исполнители задачи; индекс (user_id, task_id) — задачи пользователя.
+task_assignees = Table(
+    "task_assignees", Base.metadata,
+    Column("task_id", Integer, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True),
+    Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+    Column("role", String(32), nullable=True),
+    Index("ix_task_assignees_user_id", "user_id", "task_id"),
+)
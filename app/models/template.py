@@ -1,7 +1,7 @@
 #app/models/template.py
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, JSON, Text
-from app.models.base import Base
+from sqlalchemy import Column, Index, Integer, String, Boolean, DateTime, Text
+from app.models.base import Base, JSONType
 
 class Template(Base):
     __tablename__ = "templates"
@@ -14,11 +14,17 @@ class Template(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, nullable=False, onupdate=datetime.utcnow)
     is_active = Column(Boolean, default=True, nullable=False)
-    tags = Column(JSON, default=list, nullable=False)  # list of strings, e.g. ["freelance", "startup"]
-    structure = Column(JSON, nullable=False)  # основной объект — JSON со структурой проекта (плагины, задачи, настройки)
+    tags = Column(JSONType, default=list, nullable=False)  # list of strings, e.g. ["freelance", "startup"]
+    structure = Column(JSONType, nullable=False)  # основной объект — JSON со структурой проекта (плагины, задачи, настройки)
     ai_notes = Column(Text, nullable=True)
     subscription_level = Column(String(32), nullable=True)  # например: Free, Pro, VIP
     is_private = Column(Boolean, default=False, nullable=False)
 
+    __table_args__ = (
+        Index("ix_templates_tags_gin", "tags", postgresql_using="gin", postgresql_ops={"tags": "jsonb_path_ops"}),
+        # Сортировка списка по умолчанию (created_at DESC, id DESC); SQLite не поддерживает NULLS LAST в индексах
+        Index("ix_templates_created_at", created_at.desc().nulls_last(), id.desc()).ddl_if(dialect="postgresql"),
+    )
+
     def __repr__(self):
         return f"<Template(id={self.id}, name='{self.name}', version='{self.version}', active={self.is_active})>"
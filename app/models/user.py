@@ -1,6 +1,6 @@
 #app/models/user.py
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, JSON
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, JSON, Index
 from sqlalchemy.orm import relationship
 from app.models.base import Base
 
@@ -22,5 +22,15 @@ class User(Base):
 
     # Дополнительные поля можно добавить по мере роста: настройки, Telegram, Stripe, и т.д.
 
+    __table_args__ = (
+        # GIN (pg_trgm) под typeahead по username
+        Index(
+            "ix_users_username_trgm", username,
+            postgresql_using="gin", postgresql_ops={"username": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        # Сортировка списка по умолчанию (created_at DESC, id DESC); SQLite не поддерживает NULLS LAST в индексах
+        Index("ix_users_created_at", created_at.desc().nulls_last(), id.desc()).ddl_if(dialect="postgresql"),
+    )
+
     def __repr__(self):
         return f"<User(id={self.id}, username='{self.username}', email='{self.email}', roles={self.roles})>"
@@ -1,6 +1,6 @@
 #app/schemas/devlog.py
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal
 from datetime import datetime
 
 from app.schemas.attachment import Attachment
@@ -45,6 +45,12 @@ class DevLogShort(BaseModel):
     class Config:
         orm_mode = True
 
+class DevLogPage(BaseModel):
+    results: List[DevLogShort]
+    next_cursor: Optional[str] = Field(None, description="Opaque cursor for the next page (null on the last page)")
+    total_count: Optional[int] = Field(None, description="Only on the first page and only when count is not 'none'")
+    count: Literal["exact", "estimated", "none"] = Field("none", description="How total_count was obtained")
+
 class DevLogRead(DevLogBase):
     id: int
     created_at: datetime
@@ -5,6 +5,7 @@ from datetime import date, datetime
 
 from app.schemas.participant import Participant
 from app.schemas.attachment import Attachment
+from app.schemas.task import TaskCard
 
 class ProjectBase(BaseModel):
     name: str = Field(..., example="My Project")
@@ -45,18 +46,72 @@ class ProjectUpdate(BaseModel):
     external_id: Optional[str]
     subscription_level: Optional[str]
 
+class ProjectUpsert(ProjectBase):
+    external_id: str = Field(..., example="PRJ-4567")
+
+class ProjectBatchUpsert(BaseModel):
+    items: List[ProjectUpsert] = Field(..., min_items=1, max_items=10000)
+
+class ProjectClone(BaseModel):
+    name: Optional[str] = Field(None, max_length=128, description="Name of the copy (default: '<name> (copy)')")
+    include_tasks: bool = True
+    include_subtasks: bool = True
+    include_devlog: bool = False
+    include_custom_fields: bool = True
+
+class ProjectToTemplate(BaseModel):
+    name: Optional[str] = Field(None, max_length=128, description="Template name (default: '<project name> template')")
+    description: Optional[str] = None
+    author: Optional[str] = None
+    is_private: bool = False
+    strip_dates: bool = Field(False, description="Do not carry task deadlines into the template")
+    strip_assignees: bool = Field(False, description="Do not carry task assignees into the template")
+
 class ProjectShort(BaseModel):
     id: int
     name: str
+    tasks_total: int = 0
+    tasks_done: int = 0
+    tasks_open: int = 0
+    progress: float = Field(0.0, description="Share of live tasks in status 'done' (0..1)")
 
     class Config:
         orm_mode = True
 
+class BoardColumn(BaseModel):
+    status: Optional[str] = None
+    total: int = Field(..., description="Total tasks in this column (not only the returned ones)")
+    tasks: List[TaskCard] = Field(default_factory=list)
+
+class ProjectBoard(BaseModel):
+    project_id: int
+    columns: List[BoardColumn] = Field(default_factory=list)
+
+class ProjectStats(BaseModel):
+    project_id: int
+    tasks_total: int = 0
+    tasks_by_status: Dict[str, int] = Field(default_factory=dict, example={"todo": 12, "done": 30})
+    tasks_by_priority: Dict[int, int] = Field(default_factory=dict, example={1: 4, 3: 38})
+    tasks_overdue: int = 0
+    subtasks_total: int = 0
+    subtasks_done: int = 0
+    subtask_completion: Optional[float] = Field(None, example=0.75)
+    devlog_total: int = 0
+    devlog_last_7_days: int = 0
+    devlog_last_30_days: int = 0
+    chat_messages: int = 0
+    last_activity_at: Optional[datetime] = None
+
 class ProjectRead(ProjectBase):
     id: int
     created_at: datetime
     updated_at: datetime
     is_deleted: bool
+    # Счётчики прогресса, как в ProjectShort: fields= списка выбирает из полей этой схемы
+    tasks_total: int = 0
+    tasks_done: int = 0
+    tasks_open: int = 0
+    progress: float = Field(0.0, description="Share of live tasks in status 'done' (0..1)")
 
     class Config:
         orm_mode = True
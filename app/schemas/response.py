@@ -1,6 +1,6 @@
 #app/schemas/response.py
 from pydantic import BaseModel, Field
-from typing import Any, Optional
+from typing import Any, List, Optional
 
 class ErrorDetail(BaseModel):
     code: str = Field(..., example="validation_error")
@@ -19,5 +19,23 @@ class ListResponse(BaseModel):
     total_count: Optional[int] = None
     detail: Optional[str] = None
 
+class BulkItemResult(BaseModel):
+    index: int = Field(..., description="Position of the item in the request batch")
+    id: int
+
+class BulkItemError(BaseModel):
+    index: int = Field(..., description="Position of the item in the request batch")
+    error: str = Field(..., example="Task title must be unique within a project.")
+
+class BulkResponse(BaseModel):
+    succeeded: List[BulkItemResult] = Field(default_factory=list)
+    errors: List[BulkItemError] = Field(default_factory=list)
+
+class UpsertResponse(BaseModel):
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    errors: List[BulkItemError] = Field(default_factory=list)
+
 class SimpleMessage(BaseModel):
     message: str = Field(..., example="Action completed successfully")
@@ -0,0 +1,15 @@
+#app/schemas/search.py
+from pydantic import BaseModel
+from typing import List, Optional
+
+class SearchHit(BaseModel):
+    type: str                  # task | project | devlog | chat
+    id: int
+    project_id: Optional[int] = None
+    title: Optional[str] = None
+    snippet: Optional[str] = None   # фрагмент с <mark>…</mark>
+    rank: float
+
+class SearchResults(BaseModel):
+    query: str
+    hits: List[SearchHit] = []
@@ -0,0 +1,11 @@
+#app/schemas/tag.py
+from pydantic import BaseModel
+
+class TagUsage(BaseModel):
+    name: str
+    total: int
+    tasks: int = 0
+    projects: int = 0
+    devlog: int = 0
+    templates: int = 0
+    plugins: int = 0
@@ -1,6 +1,6 @@
 #app/schemas/task.py
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal
 from datetime import date, datetime
 
 from app.schemas.assignee import Assignee
@@ -43,6 +43,34 @@ class TaskUpdate(BaseModel):
     external_id: Optional[str]
     reviewed: Optional[bool]
 
+class TaskBulkCreate(BaseModel):
+    items: List[TaskCreate] = Field(..., min_items=1, max_items=10000)
+
+class TaskBulkUpdateItem(TaskUpdate):
+    id: int
+
+class TaskBulkUpdate(BaseModel):
+    items: List[TaskBulkUpdateItem] = Field(..., min_items=1, max_items=10000)
+
+class TaskUpsert(TaskBase):
+    external_id: str = Field(..., example="TASK-1001")
+
+class TaskBatchUpsert(BaseModel):
+    items: List[TaskUpsert] = Field(..., min_items=1, max_items=10000)
+
+class TaskBulkAction(BaseModel):
+    filters: Dict[str, Any] = Field(..., example={"project_id": 1, "status": "review"},
+                                    description="Same filters as GET /tasks/ (at least one is required)")
+    action: Literal["set_status", "set_priority", "add_tag", "remove_tag", "archive", "restore", "move_project"]
+    value: Optional[Any] = Field(None, example="done", description="Status, priority, tag or target project id")
+    dry_run: bool = Field(False, description="Only count the tasks that would change")
+
+class TaskBulkActionResult(BaseModel):
+    action: str
+    dry_run: bool
+    matched: int = Field(..., description="Tasks changed (or that would change on dry run)")
+    ids: List[int] = Field(default_factory=list)
+
 class TaskShort(BaseModel):
     id: int
     title: str
@@ -50,8 +78,46 @@ class TaskShort(BaseModel):
     class Config:
         orm_mode = True
 
+class TaskPage(BaseModel):
+    results: List[TaskShort]
+    next_cursor: Optional[str] = Field(None, description="Opaque cursor for the next page (null on the last page)")
+
+class TaskMove(BaseModel):
+    status: Optional[str] = Field(None, description="Target column (default: current status)")
+    prev_id: Optional[int] = Field(None, description="Task that should end up directly above")
+    next_id: Optional[int] = Field(None, description="Task that should end up directly below")
+
+class TaskReparent(BaseModel):
+    parent_task_id: Optional[int] = Field(None, description="New parent task (null — top level)")
+
+class TaskCard(BaseModel):
+    id: int
+    title: str
+    rank: Optional[str] = None
+    status: Optional[str] = None
+    priority: Optional[int] = None
+    deadline: Optional[date] = None
+    assignees: List[Assignee] = Field(default_factory=list)
+    tags: List[str] = Field(default_factory=list)
+    parent_task_id: Optional[int] = None
+
+class TaskTreeNode(BaseModel):
+    id: int
+    parent_task_id: Optional[int] = None
+    project_id: int
+    title: str
+    status: Optional[str] = None
+    priority: Optional[int] = None
+    deadline: Optional[date] = None
+    is_deleted: bool = False
+    depth: int = 0
+    subtasks: List["TaskTreeNode"] = Field(default_factory=list)
+
+TaskTreeNode.update_forward_refs()
+
 class TaskRead(TaskBase):
     id: int
+    rank: Optional[str] = None
     created_at: datetime
     updated_at: datetime
     is_deleted: bool
@@ -0,0 +1,14 @@
+#app/schemas/typeahead.py
+from pydantic import BaseModel
+from typing import List, Optional
+
+class TypeaheadHit(BaseModel):
+    type: str                  # task | project | tag | user
+    id: Optional[int] = None   # у тегов нет id
+    project_id: Optional[int] = None
+    label: str
+    score: float
+
+class TypeaheadResults(BaseModel):
+    query: str
+    hits: List[TypeaheadHit] = []
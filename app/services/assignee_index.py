@@ -0,0 +1,162 @@
+#app/services/assignee_index.py
+"""
+Нормализованные исполнители задач: task_assignees(task_id, user_id, role).
+
+JSON tasks.assignees остаётся источником правды (API не меняется), таблица —
+производные данные, как связи тегов (app/services/tag_index.py):
+- ORM-изменения задач синхронизируются слушателем after_flush в той же транзакции;
+- массовые операции вызывают resync_assignees() перед commit.
+Обратное направление: переименование пользователя обновляет name/email/avatar_url
+в JSON его задач — задачи находятся по индексу (user_id, task_id), а не сканом.
+"""
+from collections import defaultdict
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import bindparam, delete, event, inspect, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from app.models.task import Task
+from app.models.task_assignee import task_assignees
+from app.models.user import User
+import logging
+
+logger = logging.getLogger("DevOS.AssigneeIndex")
+
+def clean_assignees(value) -> Dict[int, Optional[str]]:
+    """user_id -> role из JSON-значения; элементы без целого user_id в индекс не попадают."""
+    if not isinstance(value, list):
+        return {}
+    result = {}
+    for assignee in value:
+        if not isinstance(assignee, dict):
+            continue
+        user_id = assignee.get("user_id")
+        # Повтор user_id в одной задаче: берётся первая роль
+        if isinstance(user_id, int) and not isinstance(user_id, bool) and user_id not in result:
+            role = assignee.get("role")
+            result[user_id] = role[:32] if isinstance(role, str) else None
+    return result
+
+def sync_assignees(session: Session, assignees_by_task: Dict[int, Dict[int, Optional[str]]]) -> None:
+    """
+    Приводит строки task_assignees задач к заданным {user_id: role} (пишется только разница).
+    Несуществующие user_id пропускаются (FK на users).
+    """
+    if not assignees_by_task:
+        return
+    connection = session.connection()
+    wanted_users = {user_id for users in assignees_by_task.values() for user_id in users}
+    known = set(connection.execute(select(User.id).where(User.id.in_(wanted_users))).scalars()) if wanted_users else set()
+
+    current: Dict[int, Dict[int, Optional[str]]] = defaultdict(dict)
+    for task_id, user_id, role in connection.execute(
+        select(task_assignees.c.task_id, task_assignees.c.user_id, task_assignees.c.role)
+        .where(task_assignees.c.task_id.in_(list(assignees_by_task)))
+    ):
+        current[task_id][user_id] = role
+
+    to_add, to_remove, to_change = [], [], []
+    for task_id, users in assignees_by_task.items():
+        users = {user_id: role for user_id, role in users.items() if user_id in known}
+        existing = current[task_id]
+        to_add.extend({"task_id": task_id, "user_id": u, "role": r} for u, r in users.items() if u not in existing)
+        to_remove.extend((task_id, u) for u in existing if u not in users)
+        to_change.extend(
+            {"b_task_id": task_id, "b_user_id": u, "role": r}
+            for u, r in users.items() if u in existing and existing[u] != r
+        )
+
+    if to_remove:
+        connection.execute(
+            delete(task_assignees).where(tuple_(task_assignees.c.task_id, task_assignees.c.user_id).in_(to_remove))
+        )
+    if to_add:
+        connection.execute(task_assignees.insert(), to_add)
+    if to_change:
+        connection.execute(
+            update(task_assignees)
+            .where(task_assignees.c.task_id == bindparam("b_task_id"), task_assignees.c.user_id == bindparam("b_user_id"))
+            .values(role=bindparam("role")),
+            to_change,
+        )
+
+def resync_assignees(session: Session, task_ids: Iterable[int]) -> None:
+    """Перечитывает tasks.assignees — для записей мимо ORM (executemany, upsert)."""
+    task_ids = list(set(task_ids))
+    for start in range(0, len(task_ids), 1000):
+        rows = session.connection().execute(
+            select(Task.id, Task.assignees).where(Task.id.in_(task_ids[start:start + 1000]))
+        )
+        sync_assignees(session, {task_id: clean_assignees(assignees) for task_id, assignees in rows})
+
+def _user_values(user: User) -> Dict[str, Optional[str]]:
+    # Поля пользователя, денормализованные в элементах tasks.assignees
+    return {
+        "name": user.full_name or user.username,
+        "email": user.email,
+        "avatar_url": user.avatar_url,
+    }
+
+def refresh_assignee_names(session: Session, users: Dict[int, Dict[str, Optional[str]]]) -> int:
+    """
+    Переписывает денормализованные поля исполнителей в JSON задач этих пользователей.
+    users: user_id -> {"name", "email", "avatar_url"}. Возвращает число изменённых задач.
+    """
+    connection = session.connection()
+    task_ids = connection.execute(
+        select(task_assignees.c.task_id).where(task_assignees.c.user_id.in_(list(users))).distinct()
+    ).scalars().all()
+    if not task_ids:
+        return 0
+    changed = []
+    for task_id, assignees in connection.execute(select(Task.id, Task.assignees).where(Task.id.in_(task_ids))):
+        patched, dirty = [], False
+        for assignee in assignees or []:
+            values = users.get(assignee.get("user_id")) if isinstance(assignee, dict) else None
+            if values:
+                # Пустые значения не добавляют ключей, которых в элементе не было
+                values = {key: value for key, value in values.items() if value is not None or key in assignee}
+            if values and any(assignee.get(key) != value for key, value in values.items()):
+                assignee = {**assignee, **values}
+                dirty = True
+            patched.append(assignee)
+        if dirty:
+            changed.append({"b_id": task_id, "assignees": patched})
+    if changed:
+        connection.execute(
+            update(Task.__table__).where(Task.__table__.c.id == bindparam("b_id")).values(assignees=bindparam("assignees")),
+            changed,
+        )
+        # Загруженные в сессию задачи увидят новые значения при следующем обращении
+        for item in changed:
+            task = session.identity_map.get(inspect(Task).identity_key_from_primary_key((item["b_id"],)))
+            if task is not None:
+                session.expire(task, ["assignees"])
+    logger.info(f"Refreshed assignee names in {len(changed)} tasks for users {sorted(users)}")
+    return len(changed)
+
+def _renamed(obj: User) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[key].history.has_changes() for key in ("full_name", "username", "email", "avatar_url"))
+
+@event.listens_for(Session, "after_flush")
+def _track_assignees(session: Session, flush_context) -> None:
+    # В after_flush new/dirty/deleted ещё в состоянии до flush, id новых задач уже есть
+    changed: Dict[int, Dict[int, Optional[str]]] = {}
+    for obj in session.new:
+        if isinstance(obj, Task):
+            changed[obj.id] = clean_assignees(obj.assignees)
+    renamed: Dict[int, Dict[str, Optional[str]]] = {}
+    for obj in session.dirty:
+        if isinstance(obj, Task) and inspect(obj).attrs["assignees"].history.has_changes():
+            changed[obj.id] = clean_assignees(obj.assignees)
+        elif isinstance(obj, User) and _renamed(obj):
+            renamed[obj.id] = _user_values(obj)
+    removed = [obj.id for obj in session.deleted if isinstance(obj, Task)]
+    if changed:
+        sync_assignees(session, changed)
+    if removed:
+        # ON DELETE CASCADE в Postgres; SQLite без PRAGMA foreign_keys — вручную
+        session.connection().execute(delete(task_assignees).where(task_assignees.c.task_id.in_(removed)))
+    if renamed:
+        refresh_assignee_names(session, renamed)
@@ -0,0 +1,175 @@
+#app/services/devlog_partitions.py
+"""
+Партиционирование devlog_entries (только Postgres, миграция 7e2a4c9b15d3).
+
+devlog_entries  PARTITION BY RANGE (created_at) — по месяцу:
+  devlog_entries_y2025m06  PARTITION BY LIST (entry_type):
+    devlog_entries_y2025m06_action, ..._note, ..._decision, ..._meeting, ..._other (DEFAULT)
+  devlog_entries_default — строки вне созданных месяцев (задним/будущим числом).
+
+Запросы с date_from/date_to читают только свои месяцы; VACUUM и индексы текущего
+месяца не растут вместе с историей. PK — (id, created_at): уникальность id держит
+последовательность, поэтому FK devlog_entry_tags -> devlog_entries нет
+(связи — производные данные, app/services/tag_index.py).
+
+Обслуживание (maintain_partitions, периодически):
+- ensure_partitions() — месяцы вперёд создаются заранее: таблица собирается отдельно
+  и подключается ATTACH PARTITION (SHARE UPDATE EXCLUSIVE на devlog_entries,
+  лента не блокируется). Строки из DEFAULT-партиции за этот месяц переносятся.
+- apply_retention() — подпартиции старше RETENTION_MONTHS[тип] отключаются (DETACH)
+  и переносятся в схему ARCHIVE_SCHEMA (или удаляются), их связи тегов удаляются.
+Коммит — на вызывающем.
+"""
+import re
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import Engine, text
+from sqlalchemy.orm import Session
+
+from app.core.dialect import is_postgres
+from app.models.devlog import DevLogEntry
+import logging
+
+logger = logging.getLogger("DevOS.DevLogPartitions")
+
+PARENT = "devlog_entries"
+DEFAULT_PARTITION = "devlog_entries_default"
+ARCHIVE_SCHEMA = "devlog_archive"
+OTHER_TYPE = "other"           # DEFAULT-подпартиция месяца: прочие entry_type
+PRECREATE_MONTHS = 3           # сколько месяцев вперёд держать созданными
+LOCK_TIMEOUT = "5s"            # DDL не ждёт долгие запросы, очередь за ним не копится
+
+# entry_type -> сколько полных месяцев подпартиция живёт в devlog_entries (None — бессрочно)
+RETENTION_MONTHS: Dict[str, Optional[int]] = {
+    "action": 3,               # CI-боты: тысячи записей в день
+    "note": None,
+    "decision": None,
+    "meeting": None,
+    OTHER_TYPE: None,
+}
+
+_MONTH_NAME = re.compile(rf"^{PARENT}_y(\d{{4}})m(\d{{2}})$")
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+def partition_name(month: date) -> str:
+    return f"{PARENT}_y{month.year:04d}m{month.month:02d}"
+
+def subpartition_name(month: date, entry_type: str) -> str:
+    return f"{partition_name(month)}_{entry_type}"
+
+def _children(session: Session, parent: str) -> List[str]:
+    return session.execute(
+        text("SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+             "WHERE i.inhparent = CAST(:parent AS regclass)"),
+        {"parent": parent},
+    ).scalars().all()
+
+def attached_months(session: Session) -> List[date]:
+    """Подключённые месячные партиции, по возрастанию."""
+    months = []
+    for name in _children(session, PARENT):
+        match = _MONTH_NAME.match(name)
+        if match:
+            months.append(date(int(match.group(1)), int(match.group(2)), 1))
+    return sorted(months)
+
+def _create_month(session: Session, month: date) -> None:
+    name, start, end = partition_name(month), month, add_months(month, 1)
+    bounds = {"start": datetime.combine(start, datetime.min.time()), "end": datetime.combine(end, datetime.min.time())}
+    # Отдельная таблица той же структуры (включая generated search_vector), пока не подключена —
+    # блокировки на devlog_entries не нужны
+    session.execute(text(
+        f"CREATE TABLE {name} (LIKE {PARENT} INCLUDING DEFAULTS INCLUDING GENERATED) "
+        f"PARTITION BY LIST (entry_type)"
+    ))
+    for entry_type in RETENTION_MONTHS:
+        bound = "DEFAULT" if entry_type == OTHER_TYPE else f"FOR VALUES IN ('{entry_type}')"
+        session.execute(text(f"CREATE TABLE {subpartition_name(month, entry_type)} PARTITION OF {name} {bound}"))
+
+    # ATTACH проверяет, что в DEFAULT-партиции нет строк этого месяца: переносим их
+    columns = ", ".join(column.name for column in DevLogEntry.__table__.c)
+    in_month = "created_at >= :start AND created_at < :end"
+    moved = session.execute(
+        text(f"INSERT INTO {name} ({columns}) SELECT {columns} FROM {DEFAULT_PARTITION} WHERE {in_month}"), bounds
+    ).rowcount
+    if moved:
+        session.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE {in_month}"), bounds)
+        logger.info(f"Moved {moved} devlog entries from {DEFAULT_PARTITION} to {name}")
+    session.execute(text(
+        f"ALTER TABLE {PARENT} ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ('{bounds['start']:%Y-%m-%d}') TO ('{bounds['end']:%Y-%m-%d}')"
+    ))
+
+def ensure_partitions(session: Session, months_ahead: int = PRECREATE_MONTHS,
+                      today: Optional[date] = None) -> List[str]:
+    """Создаёт недостающие партиции от текущего месяца до +months_ahead. Возвращает имена созданных."""
+    current = month_start(today or datetime.utcnow().date())
+    existing = set(attached_months(session))
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        if month not in existing:
+            _create_month(session, month)
+            created.append(partition_name(month))
+    if created:
+        logger.info(f"Created devlog partitions: {', '.join(created)}")
+    return created
+
+def expired_subpartitions(session: Session, today: Optional[date] = None) -> List[str]:
+    """Подключённые подпартиции, вышедшие за RETENTION_MONTHS своего entry_type."""
+    current = month_start(today or datetime.utcnow().date())
+    expired = []
+    for month in attached_months(session):
+        attached = set(_children(session, partition_name(month)))
+        for entry_type, months in RETENTION_MONTHS.items():
+            name = subpartition_name(month, entry_type)
+            if months is not None and month < add_months(current, -months) and name in attached:
+                expired.append(name)
+    return expired
+
+def apply_retention(session: Session, today: Optional[date] = None, drop: bool = False) -> List[str]:
+    """
+    DETACH просроченных подпартиций; drop=False — перенос в схему ARCHIVE_SCHEMA
+    (данные доступны для выгрузки), drop=True — удаление. Возвращает имена.
+    """
+    names = expired_subpartitions(session, today)
+    if names and not drop:
+        session.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+    for name in names:
+        parent = name.rsplit("_", 1)[0]
+        session.execute(text(f"ALTER TABLE {parent} DETACH PARTITION {name}"))
+        # FK нет — связи тегов отключённых записей удаляются явно
+        session.execute(text(f"DELETE FROM devlog_entry_tags WHERE entry_id IN (SELECT id FROM {name})"))
+        if drop:
+            session.execute(text(f"DROP TABLE {name}"))
+        else:
+            session.execute(text(f"ALTER TABLE {name} SET SCHEMA {ARCHIVE_SCHEMA}"))
+    if names:
+        logger.info(f"{'Dropped' if drop else 'Archived'} devlog partitions: {', '.join(names)}")
+    return names
+
+def maintain_partitions(session: Session, today: Optional[date] = None, drop: bool = False) -> Dict[str, List[str]]:
+    """Периодическое обслуживание: будущие месяцы + retention. Вне Postgres — ничего не делает."""
+    if not is_postgres(session):
+        return {"created": [], "archived": []}
+    session.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+    created = ensure_partitions(session, today=today)
+    archived = apply_retention(session, today=today, drop=drop)
+    return {"created": created, "archived": archived}
+
+def maintain_partitions_job(bind: Engine) -> None:
+    """Обслуживание из фоновой задачи / cron: своя сессия, отдельная транзакция."""
+    with Session(bind=bind) as db:
+        try:
+            maintain_partitions(db)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Devlog partition maintenance failed: {e}")
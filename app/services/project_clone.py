@@ -0,0 +1,188 @@
+#app/services/project_clone.py
+"""
+Глубокое копирование проекта внутри БД: только INSERT ... SELECT, строки не проходят через Python.
+
+Новые id задач и записей devlog выделяются заранее во временных таблицах соответствий
+(old_id -> new_id): в Postgres — nextval() последовательности id, в остальных диалектах —
+сдвиг за MAX(id) (SQLite сериализует запись). Затем строки вставляются с явными id,
+а parent_task_id / task_id переводятся через те же таблицы. Связи тегов, исполнителей
+и подключения плагинов копируются так же set-based, счётчики нового проекта
+пересчитываются. Коммит — на вызывающем.
+"""
+from datetime import datetime
+from typing import Dict
+
+from sqlalchemy import Column, Integer, MetaData, Table, delete, false, func, insert, literal, null, select
+from sqlalchemy.orm import Session
+
+from app.core.dialect import is_postgres
+from app.models.devlog import DevLogEntry
+from app.models.project import Project
+from app.models.project_plugin import ProjectPlugin
+from app.models.tag import devlog_entry_tags, project_tags, task_tags
+from app.models.task import Task
+from app.models.task_assignee import task_assignees
+from app.services.project_counters import recompute_project_counters
+import logging
+
+logger = logging.getLogger("DevOS.ProjectClone")
+
+# Временные таблицы живут только на время копирования (своя MetaData: не попадают в миграции)
+_id_maps = MetaData()
+
+def _id_map(name: str) -> Table:
+    return Table(
+        name, _id_maps,
+        Column("old_id", Integer, primary_key=True, autoincrement=False),
+        Column("new_id", Integer, nullable=False),
+        prefixes=["TEMPORARY"],
+    )
+
+TASK_IDS = _id_map("clone_task_ids")
+DEVLOG_IDS = _id_map("clone_devlog_ids")
+
+def _allocate_ids(session: Session, id_map: Table, table: Table, *where) -> None:
+    """Заполняет id_map: old_id — строки table по where, new_id — свободные id той же таблицы."""
+    connection = session.connection()
+    id_map.create(connection, checkfirst=True)   # SQLite: таблица могла остаться после сбоя
+    connection.execute(delete(id_map))
+    if is_postgres(session):
+        new_id = func.nextval(func.pg_get_serial_sequence(table.name, "id"))
+    else:
+        top = select(func.coalesce(func.max(table.c.id), 0)).correlate(None).scalar_subquery()
+        new_id = table.c.id + top
+    connection.execute(
+        insert(id_map).from_select(["old_id", "new_id"], select(table.c.id, new_id).where(*where))
+    )
+
+def _copy(session: Session, table: Table, values: dict, source) -> int:
+    """INSERT INTO table SELECT: колонки из values (SQL-выражения) или одноимённые колонки table."""
+    columns = [column for column in table.c if column.key in values or not column.primary_key]
+    statement = insert(table).from_select(
+        [column.key for column in columns],
+        source.with_only_columns(*[values.get(column.key, column) for column in columns]),
+    )
+    return session.connection().execute(statement).rowcount
+
+def copy_project(
+    session: Session,
+    project_id: int,
+    name: str,
+    include_tasks: bool = True,
+    include_subtasks: bool = True,
+    include_devlog: bool = False,
+    include_custom_fields: bool = True,
+) -> Dict[str, int]:
+    """
+    Копия проекта project_id с именем name; архивные задачи и записи не копируются.
+    include_subtasks=False — только задачи верхнего уровня. external_id копий пустой.
+    Возвращает {"id": id нового проекта, "tasks": n, "devlog": n}.
+    """
+    connection = session.connection()
+    now = datetime.utcnow()
+    projects, tasks, entries = Project.__table__, Task.__table__, DevLogEntry.__table__
+
+    project_values = {
+        "name": literal(name, projects.c.name.type),
+        "external_id": null(),
+        "is_deleted": false(),
+        "tasks_total": literal(0),
+        "tasks_done": literal(0),
+        "created_at": literal(now, projects.c.created_at.type),
+        "updated_at": literal(now, projects.c.updated_at.type),
+    }
+    if not include_custom_fields:
+        project_values["custom_fields"] = literal({}, projects.c.custom_fields.type)
+    columns = [column for column in projects.c if column.key != "id"]
+    new_project_id = connection.execute(
+        insert(projects).from_select(
+            [column.key for column in columns],
+            select(*[project_values.get(column.key, column) for column in columns]).where(projects.c.id == project_id),
+        ).returning(projects.c.id)
+    ).scalar_one()
+    connection.execute(
+        insert(project_tags).from_select(
+            ["project_id", "tag_id"],
+            select(literal(new_project_id), project_tags.c.tag_id).where(project_tags.c.project_id == project_id),
+        )
+    )
+
+    bindings = ProjectPlugin.__table__
+    connection.execute(
+        insert(bindings).from_select(
+            ["project_id", "plugin_id", "config", "is_enabled", "created_at"],
+            select(
+                literal(new_project_id), bindings.c.plugin_id, bindings.c.config,
+                bindings.c.is_enabled, literal(now, bindings.c.created_at.type),
+            ).where(bindings.c.project_id == project_id),
+        )
+    )
+
+    counts = {"id": new_project_id, "tasks": 0, "devlog": 0}
+    task_map = TASK_IDS.alias("task_map")
+    if include_tasks:
+        where = [tasks.c.project_id == project_id, tasks.c.is_deleted == false()]
+        if not include_subtasks:
+            where.append(tasks.c.parent_task_id.is_(None))
+        _allocate_ids(session, TASK_IDS, tasks, *where)
+
+        # Родитель, которого нет среди копий (архивный, из другого проекта) -> задача верхнего уровня
+        parent_map = TASK_IDS.alias("parent_map")
+        task_values = {
+            "id": task_map.c.new_id,
+            "project_id": literal(new_project_id),
+            "parent_task_id": parent_map.c.new_id,
+            "external_id": null(),
+            "created_at": literal(now, tasks.c.created_at.type),
+            "updated_at": literal(now, tasks.c.updated_at.type),
+        }
+        if not include_custom_fields:
+            task_values["custom_fields"] = literal({}, tasks.c.custom_fields.type)
+        counts["tasks"] = _copy(
+            session, tasks, task_values,
+            select(tasks.c.id).select_from(
+                tasks.join(task_map, task_map.c.old_id == tasks.c.id)
+                .outerjoin(parent_map, parent_map.c.old_id == tasks.c.parent_task_id)
+            ),
+        )
+        connection.execute(
+            insert(task_tags).from_select(
+                ["task_id", "tag_id"],
+                select(task_map.c.new_id, task_tags.c.tag_id).join(task_map, task_map.c.old_id == task_tags.c.task_id),
+            )
+        )
+        connection.execute(
+            insert(task_assignees).from_select(
+                ["task_id", "user_id", "role"],
+                select(task_map.c.new_id, task_assignees.c.user_id, task_assignees.c.role)
+                .join(task_map, task_map.c.old_id == task_assignees.c.task_id),
+            )
+        )
+
+    if include_devlog:
+        _allocate_ids(session, DEVLOG_IDS, entries, entries.c.project_id == project_id, entries.c.is_deleted == false())
+        entry_map = DEVLOG_IDS.alias("entry_map")
+        source = entries.join(entry_map, entry_map.c.old_id == entries.c.id)
+        # Запись о нескопированной задаче остаётся записью проекта (task_id = NULL)
+        entry_values = {"id": entry_map.c.new_id, "project_id": literal(new_project_id), "task_id": null()}
+        if include_tasks:
+            source = source.outerjoin(task_map, task_map.c.old_id == entries.c.task_id)
+            entry_values["task_id"] = task_map.c.new_id
+        if not include_custom_fields:
+            entry_values["custom_fields"] = literal({}, entries.c.custom_fields.type)
+        # created_at записей сохраняется: это история проекта
+        counts["devlog"] = _copy(session, entries, entry_values, select(entries.c.id).select_from(source))
+        connection.execute(
+            insert(devlog_entry_tags).from_select(
+                ["entry_id", "tag_id"],
+                select(entry_map.c.new_id, devlog_entry_tags.c.tag_id)
+                .join(entry_map, entry_map.c.old_id == devlog_entry_tags.c.entry_id),
+            )
+        )
+        DEVLOG_IDS.drop(connection)
+
+    if include_tasks:
+        TASK_IDS.drop(connection)
+    recompute_project_counters(session, [new_project_id])
+    logger.info(f"Cloned project {project_id} into {new_project_id}: {counts}")
+    return counts
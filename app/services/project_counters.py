@@ -0,0 +1,114 @@
+#app/services/project_counters.py
+"""
+Денормализованные счётчики прогресса на projects (tasks_total, tasks_done).
+
+- ORM-изменения задач (create/update/soft-delete/restore) учитываются слушателем
+  after_flush в той же транзакции: UPDATE projects SET x = x + delta.
+- Массовые операции (executemany, set-based UPDATE) минуют unit of work и вызывают
+  recompute_project_counters() для затронутых проектов перед commit.
+- repair_project_counters() пересчитывает всё с нуля (ночной джоб / после сбоев).
+"""
+from collections import defaultdict
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import event, func, inspect, select, update
+from sqlalchemy.orm import Session
+
+from app.models.project import Project
+from app.models.task import Task
+import logging
+
+logger = logging.getLogger("DevOS.ProjectCounters")
+
+DONE_STATUS = "done"
+
+def _committed(state, key: str):
+    history = state.attrs[key].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return getattr(state.obj(), key)
+
+def _add(deltas: Dict, project_id, status, is_deleted, sign: int) -> None:
+    # Считаются только живые (не архивные) задачи
+    if project_id is None or is_deleted:
+        return
+    deltas[project_id][0] += sign
+    if status == DONE_STATUS:
+        deltas[project_id][1] += sign
+
+def apply_counter_deltas(session: Session, deltas: Dict) -> None:
+    projects = Project.__table__
+    connection = session.connection()
+    for project_id, (total, done) in deltas.items():
+        if not total and not done:
+            continue
+        connection.execute(
+            update(projects)
+            .where(projects.c.id == project_id)
+            .values(
+                tasks_total=projects.c.tasks_total + total,
+                tasks_done=projects.c.tasks_done + done,
+                # Счётчики — производные данные: onupdate не должен сдвигать updated_at проекта
+                updated_at=projects.c.updated_at,
+            )
+        )
+        project = session.identity_map.get(inspect(Project).identity_key_from_primary_key((project_id,)))
+        if project is not None:
+            session.expire(project, ["tasks_total", "tasks_done"])
+
+@event.listens_for(Session, "after_flush")
+def _track_task_counters(session: Session, flush_context) -> None:
+    # В after_flush new/dirty/deleted и история атрибутов ещё в состоянии до flush
+    deltas = defaultdict(lambda: [0, 0])
+    for obj in session.new:
+        if isinstance(obj, Task):
+            _add(deltas, obj.project_id, obj.status or "todo", obj.is_deleted, +1)
+    for obj in session.dirty:
+        if isinstance(obj, Task) and session.is_modified(obj):
+            state = inspect(obj)
+            _add(deltas, _committed(state, "project_id"), _committed(state, "status"),
+                 _committed(state, "is_deleted"), -1)
+            _add(deltas, obj.project_id, obj.status, obj.is_deleted, +1)
+    for obj in session.deleted:
+        if isinstance(obj, Task):
+            state = inspect(obj)
+            _add(deltas, _committed(state, "project_id"), _committed(state, "status"),
+                 _committed(state, "is_deleted"), -1)
+    if deltas:
+        apply_counter_deltas(session, deltas)
+
+def recompute_project_counters(session: Session, project_ids: Optional[Iterable[int]] = None) -> None:
+    """
+    Пересчёт с нуля одним UPDATE с коррелированными COUNT (по частичным индексам tasks).
+    Переписываются только расходящиеся строки; updated_at не меняется.
+    project_ids=None — все проекты. Коммит остаётся за вызывающим.
+    """
+    live = (Task.project_id == Project.id) & (Task.is_deleted == False)
+    total = select(func.count()).where(live).scalar_subquery()
+    done = select(func.count()).where(live, Task.status == DONE_STATUS).scalar_subquery()
+    statement = (
+        update(Project)
+        .where(Project.tasks_total.is_distinct_from(total) | Project.tasks_done.is_distinct_from(done))
+        .values(tasks_total=total, tasks_done=done, updated_at=Project.updated_at)
+    )
+    if project_ids is not None:
+        project_ids = {pid for pid in project_ids if pid is not None}
+        if not project_ids:
+            return
+        statement = statement.where(Project.id.in_(project_ids))
+    session.execute(statement.execution_options(synchronize_session=False))
+    for obj in list(session.identity_map.values()):
+        if isinstance(obj, Project):
+            session.expire(obj, ["tasks_total", "tasks_done"])
+
+def repair_project_counters(session: Session) -> None:
+    try:
+        recompute_project_counters(session)
+        session.commit()
+        logger.info("Recomputed progress counters for all projects")
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Failed to recompute project counters: {e}")
+        raise
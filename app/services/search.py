@@ -0,0 +1,113 @@
+#app/services/search.py
+"""
+Единый поиск по задачам, проектам, devlog и чату: ранжированные хиты с подсветкой,
+не больше limit на каждый тип, всё одним запросом (UNION ALL веток по типам).
+Postgres — search_vector @@ to_tsquery + ts_rank_cd/ts_headline;
+SQLite — FTS5 MATCH + bm25/snippet (app/core/fulltext.py).
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import Integer, bindparam, desc, false, func, literal, literal_column, select, text, union_all
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Session
+
+from app.core.dialect import is_postgres
+from app.core.fulltext import SEARCH_CONFIG, FtsQuery, search_terms
+from app.models.devlog import DevLogEntry
+from app.models.jarvis import ChatMessage
+from app.models.project import Project
+from app.models.task import Task
+
+HIGHLIGHT_START, HIGHLIGHT_STOP = "<mark>", "</mark>"
+HEADLINE_OPTIONS = (
+    f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, MaxWords=30, MinWords=10, MaxFragments=2"
+)
+
+class SearchQueryError(ValueError):
+    """Пустой запрос или неизвестный тип сущности."""
+    pass
+
+@dataclass(frozen=True)
+class SearchTarget:
+    kind: str
+    model: type
+    title: object          # колонка-заголовок хита
+    body: Sequence[object]  # колонки документа (как в FTS_SOURCES)
+    project_id: object
+
+    @property
+    def table(self) -> str:
+        return self.model.__tablename__
+
+SEARCH_TARGETS: Dict[str, SearchTarget] = {
+    "task": SearchTarget("task", Task, Task.title, (Task.title, Task.description), Task.project_id),
+    "project": SearchTarget("project", Project, Project.name, (Project.name, Project.description), Project.id),
+    "devlog": SearchTarget("devlog", DevLogEntry, DevLogEntry.entry_type, (DevLogEntry.content,), DevLogEntry.project_id),
+    "chat": SearchTarget("chat", ChatMessage, ChatMessage.role, (ChatMessage.content,), ChatMessage.project_id),
+}
+
+def _postgres_branch(target: SearchTarget, tsquery, limit: int, project_id: Optional[int]):
+    vector = literal_column(f"{target.table}.search_vector", TSVECTOR)
+    document = func.concat_ws(" ", *target.body)
+    # ts_rank_cd(..., 32) = rank / (rank + 1): 0..1, сравнимо между типами
+    rank = func.ts_rank_cd(vector, tsquery, 32)
+    statement = select(
+        literal(target.kind).label("type"),
+        target.model.id.label("id"),
+        target.project_id.label("project_id"),
+        target.title.label("title"),
+        func.ts_headline(SEARCH_CONFIG, document, tsquery, HEADLINE_OPTIONS).label("snippet"),
+        rank.label("rank"),
+    ).where(vector.op("@@")(tsquery), target.model.is_deleted == false())
+    if project_id is not None:
+        statement = statement.where(target.project_id == bindparam("project_id"))
+    return statement.order_by(desc("rank")).limit(limit).subquery()
+
+def _sqlite_branch(target: SearchTarget, project_id: Optional[int]) -> str:
+    fts = f"{target.table}_fts"
+    project_filter = f" AND t.{target.project_id.key} = :project_id" if project_id is not None else ""
+    # bm25 отрицательный (меньше — лучше): приводим к 0..1 как в Postgres
+    return (
+        f"SELECT * FROM (SELECT '{target.kind}' AS type, t.id AS id, t.{target.project_id.key} AS project_id, "
+        f"t.{target.title.key} AS title, "
+        f"snippet({fts}, -1, '{HIGHLIGHT_START}', '{HIGHLIGHT_STOP}', '…', 16) AS snippet, "
+        f"-bm25({fts}) / (1 - bm25({fts})) AS rank "
+        f"FROM {fts} JOIN {target.table} AS t ON t.id = {fts}.rowid "
+        f"WHERE {fts} MATCH :q AND t.is_deleted = 0{project_filter} "
+        f"ORDER BY rank DESC LIMIT :limit)"
+    )
+
+def search(
+    db: Session,
+    q: str,
+    kinds: Optional[List[str]] = None,
+    limit: int = 10,
+    project_id: Optional[int] = None,
+) -> List[dict]:
+    """
+    Хиты {type, id, project_id, title, snippet, rank} по убыванию rank,
+    не больше limit на каждый тип из kinds (по умолчанию — все).
+    """
+    if not search_terms(q):
+        raise SearchQueryError("Search query must contain at least one word.")
+    kinds = kinds or list(SEARCH_TARGETS)
+    unknown = [kind for kind in kinds if kind not in SEARCH_TARGETS]
+    if unknown:
+        raise SearchQueryError(f"Unknown type(s): {', '.join(unknown)}. Use: {', '.join(SEARCH_TARGETS)}.")
+    targets = [SEARCH_TARGETS[kind] for kind in dict.fromkeys(kinds)]
+
+    params = {"q": q, "limit": limit}
+    if project_id is not None:
+        params["project_id"] = project_id
+
+    if is_postgres(db):
+        tsquery = func.to_tsquery(SEARCH_CONFIG, bindparam("q", type_=FtsQuery()))
+        branches = [select(*branch.c) for branch in (_postgres_branch(t, tsquery, limit, project_id) for t in targets)]
+        statement = union_all(*branches).order_by(desc("rank"))
+        del params["limit"]
+    else:
+        sql = " UNION ALL ".join(_sqlite_branch(t, project_id) for t in targets) + " ORDER BY rank DESC"
+        statement = text(sql).bindparams(bindparam("q", type_=FtsQuery()), bindparam("limit", type_=Integer()))
+
+    return [dict(row) for row in db.execute(statement, params).mappings()]
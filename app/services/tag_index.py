@@ -0,0 +1,166 @@
+#app/services/tag_index.py
+"""
+Нормализованный индекс тегов: tags + <entity>_tags.
+
+JSON-массив tags у сущности остаётся источником правды (API не меняется),
+связи — производные данные, как счётчики проектов:
+- ORM create/update/delete синхронизируются слушателем after_flush в той же транзакции;
+- массовые операции (executemany, upsert) вызывают resync_tags() перед commit.
+Фильтры "tag" и облака тегов идут по индексам (tag_id, entity_id), а не по JSON.
+"""
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import Table, delete, event, false, func, inspect, literal, select, tuple_, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.dialect import dialect_name
+from app.models.devlog import DevLogEntry
+from app.models.plugin import Plugin
+from app.models.project import Project
+from app.models.tag import Tag, devlog_entry_tags, plugin_tags, project_tags, task_tags, template_tags
+from app.models.task import Task
+from app.models.template import Template
+import logging
+
+logger = logging.getLogger("DevOS.TagIndex")
+
+# Модель -> таблица связей (первая колонка — id сущности)
+TAG_LINKS: Dict[type, Table] = {
+    Task: task_tags,
+    Project: project_tags,
+    DevLogEntry: devlog_entry_tags,
+    Template: template_tags,
+    Plugin: plugin_tags,
+}
+
+# Ключи счётчиков в ответе GET /tags
+TAG_KINDS = {Task: "tasks", Project: "projects", DevLogEntry: "devlog", Template: "templates", Plugin: "plugins"}
+
+def entity_column(model):
+    return list(TAG_LINKS[model].primary_key.columns)[0]
+
+def clean_tags(value) -> Set[str]:
+    """Строковые непустые теги из JSON-значения (прочее в индекс не попадает)."""
+    if not isinstance(value, list):
+        return set()
+    return {tag for tag in value if isinstance(tag, str) and tag}
+
+def tag_ids(session: Session, names: Iterable[str]) -> Dict[str, int]:
+    """name -> id; недостающие теги создаются (ON CONFLICT DO NOTHING — безопасно при гонках)."""
+    names = sorted(set(names))
+    if not names:
+        return {}
+    connection = session.connection()
+    dialect_insert = postgresql.insert if dialect_name(session) == "postgresql" else sqlite.insert
+    connection.execute(
+        dialect_insert(Tag.__table__).on_conflict_do_nothing(index_elements=["name"]),
+        [{"name": name} for name in names],
+    )
+    return dict(connection.execute(select(Tag.name, Tag.id).where(Tag.name.in_(names))).all())
+
+def sync_tags(session: Session, model, tags_by_id: Dict[int, Set[str]]) -> None:
+    """
+    Приводит связи сущностей tags_by_id к заданным наборам тегов (вставка/удаление только разницы).
+    """
+    if not tags_by_id:
+        return
+    link = TAG_LINKS[model]
+    column = entity_column(model)
+    connection = session.connection()
+    current = defaultdict(set)
+    for entity_id, name in connection.execute(
+        select(column, Tag.name).join(Tag, Tag.id == link.c.tag_id).where(column.in_(list(tags_by_id)))
+    ):
+        current[entity_id].add(name)
+
+    to_add, to_remove = [], []
+    for entity_id, names in tags_by_id.items():
+        to_add.extend((entity_id, name) for name in names - current[entity_id])
+        to_remove.extend((entity_id, name) for name in current[entity_id] - names)
+
+    ids = tag_ids(session, {name for _, name in to_add} | {name for _, name in to_remove})
+    if to_remove:
+        connection.execute(
+            delete(link).where(tuple_(column, link.c.tag_id).in_([(e, ids[name]) for e, name in to_remove]))
+        )
+    if to_add:
+        connection.execute(
+            link.insert(), [{column.key: e, "tag_id": ids[name]} for e, name in to_add]
+        )
+
+def drop_tags(session: Session, model, ids: Iterable[int]) -> None:
+    # На Postgres это сделал бы ON DELETE CASCADE; SQLite без PRAGMA foreign_keys — нет
+    ids = list(ids)
+    if ids:
+        session.connection().execute(delete(TAG_LINKS[model]).where(entity_column(model).in_(ids)))
+
+def resync_tags(session: Session, model, ids: Iterable[int]) -> None:
+    """Перечитывает tags из таблицы сущности — для записей мимо ORM (executemany, upsert)."""
+    ids = list(set(ids))
+    for start in range(0, len(ids), 1000):
+        rows = session.connection().execute(
+            select(model.id, model.tags).where(model.id.in_(ids[start:start + 1000]))
+        )
+        sync_tags(session, model, {entity_id: clean_tags(tags) for entity_id, tags in rows})
+
+def _tags_changed(obj) -> bool:
+    return inspect(obj).attrs["tags"].history.has_changes()
+
+@event.listens_for(Session, "after_flush")
+def _track_tags(session: Session, flush_context) -> None:
+    # В after_flush new/dirty/deleted ещё в состоянии до flush, id новых объектов уже есть
+    changed = defaultdict(dict)
+    for obj in session.new:
+        if type(obj) in TAG_LINKS:
+            changed[type(obj)][obj.id] = clean_tags(obj.tags)
+    for obj in session.dirty:
+        if type(obj) in TAG_LINKS and _tags_changed(obj):
+            changed[type(obj)][obj.id] = clean_tags(obj.tags)
+    removed = defaultdict(list)
+    for obj in session.deleted:
+        if type(obj) in TAG_LINKS:
+            removed[type(obj)].append(obj.id)
+    for model, tags_by_id in changed.items():
+        sync_tags(session, model, tags_by_id)
+    for model, ids in removed.items():
+        drop_tags(session, model, ids)
+
+def _usage_branch(model, project_id: Optional[int]):
+    link = TAG_LINKS[model]
+    column = entity_column(model)
+    statement = (
+        select(link.c.tag_id, literal(TAG_KINDS[model]).label("kind"), func.count().label("uses"))
+        .join(model.__table__, model.id == column)
+        .group_by(link.c.tag_id)
+    )
+    if hasattr(model, "is_deleted"):
+        statement = statement.where(model.is_deleted == false())
+    if project_id is not None:
+        statement = statement.where((model.id if model is Project else model.project_id) == project_id)
+    return statement
+
+def tag_usage(
+    db: Session,
+    project_id: Optional[int] = None,
+    prefix: Optional[str] = None,
+    limit: Optional[int] = 100,
+) -> List[dict]:
+    """
+    [{name, total, tasks, projects, devlog, templates, plugins}] по убыванию total.
+    project_id — только задачи/devlog этого проекта и сам проект (шаблоны и плагины вне проектов).
+    limit=None — все теги.
+    """
+    models = [m for m in TAG_LINKS if project_id is None or hasattr(m, "project_id") or m is Project]
+    usage = union_all(*[_usage_branch(model, project_id) for model in models]).subquery()
+    statement = select(Tag.name, usage.c.kind, usage.c.uses).join(usage, usage.c.tag_id == Tag.id)
+    if prefix:
+        statement = statement.where(Tag.name.startswith(prefix, autoescape=True))
+
+    counts: Dict[str, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(TAG_KINDS.values(), 0))
+    for name, kind, uses in db.execute(statement):
+        counts[name][kind] += uses
+    result = [{"name": name, "total": sum(kinds.values()), **kinds} for name, kinds in counts.items()]
+    result.sort(key=lambda row: (-row["total"], row["name"]))
+    return result[:limit]
@@ -0,0 +1,123 @@
+#app/services/task_ranking.py
+"""
+Ручной порядок задач на доске: tasks.rank в пределах колонки (project_id, status).
+
+- Перемещение/создание пишет только одну строку (app/core/lexorank.py).
+- Когда ранги колонки становятся длинными (много вставок в одно место)
+  или в ней есть задачи без ранга (upsert, старые данные), колонка
+  перенумеровывается целиком: rebalance_column() — фоном после move,
+  rebalance_long_ranks() — периодически по всем колонкам.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Engine, bindparam, false, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.lexorank import rank_between, rank_sequence
+from app.models.task import Task
+import logging
+
+logger = logging.getLogger("DevOS.TaskRanking")
+
+REBALANCE_LENGTH = 24   # ранг длиннее — колонку пора перенумеровать
+
+# Порядок колонки: ручной ранг, затем прежний порядок доски (для задач без ранга)
+COLUMN_ORDER = (
+    Task.rank.asc().nulls_last(), Task.priority.asc().nulls_last(),
+    Task.deadline.asc().nulls_last(), Task.id.asc(),
+)
+
+def _column(project_id: int, status: Optional[str]) -> list:
+    status_clause = Task.status == status if status is not None else Task.status.is_(None)
+    return [Task.project_id == project_id, status_clause, Task.is_deleted == false()]
+
+def column_end_rank(db: Session, project_id: int, status: Optional[str]) -> Optional[str]:
+    """Последний ранг колонки (MAX по индексу project_id, status, rank)."""
+    return db.execute(select(func.max(Task.rank)).where(*_column(project_id, status))).scalar()
+
+def append_ranks(db: Session, rows: List[dict]) -> None:
+    """
+    Проставляет rank новым строкам (bulk INSERT): каждая — в конец своей колонки,
+    в порядке следования в rows. Один запрос MAX на колонку.
+    """
+    ends: Dict[Tuple[int, Optional[str]], Optional[str]] = {}
+    for row in rows:
+        key = (row["project_id"], row.get("status"))
+        if key not in ends:
+            ends[key] = column_end_rank(db, *key)
+        row["rank"] = ends[key] = rank_between(ends[key], None)
+
+def neighbour_ranks(db: Session, project_id: int, status: Optional[str], exclude_id: int,
+                    prev_rank: Optional[str] = None, next_rank: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Достраивает недостающего соседа: задача сразу после prev_rank / сразу перед next_rank
+    (перемещаемая задача exclude_id не учитывается). Без соседей — конец колонки.
+    """
+    column = [*_column(project_id, status), Task.id != exclude_id]
+    if prev_rank is not None and next_rank is None:
+        next_rank = db.execute(select(func.min(Task.rank)).where(*column, Task.rank > prev_rank)).scalar()
+    elif next_rank is not None and prev_rank is None:
+        prev_rank = db.execute(select(func.max(Task.rank)).where(*column, Task.rank < next_rank)).scalar()
+    elif prev_rank is None and next_rank is None:
+        prev_rank = db.execute(select(func.max(Task.rank)).where(*column)).scalar()
+    return prev_rank, next_rank
+
+def needs_rebalance(rank: Optional[str]) -> bool:
+    return rank is not None and len(rank) > REBALANCE_LENGTH
+
+def rebalance_column(db: Session, project_id: int, status: Optional[str]) -> int:
+    """
+    Перенумеровывает колонку равномерными рангами, сохраняя текущий порядок.
+    Одна executemany-запись по PK; updated_at не трогается (это не правка задачи).
+    Коммит — на вызывающем.
+    """
+    ids = db.execute(select(Task.id).where(*_column(project_id, status)).order_by(*COLUMN_ORDER)).scalars().all()
+    if ids:
+        tasks = Task.__table__
+        db.execute(
+            update(tasks)
+            .where(tasks.c.id == bindparam("b_id"))
+            # updated_at = updated_at: не срабатывает onupdate
+            .values(rank=bindparam("b_rank"), updated_at=tasks.c.updated_at),
+            [{"b_id": task_id, "b_rank": rank} for task_id, rank in zip(ids, rank_sequence(len(ids)))],
+        )
+        # Загруженные в сессию задачи перечитают rank
+        for task in db.identity_map.values():
+            if isinstance(task, Task) and task.project_id == project_id and task.status == status:
+                db.expire(task, ["rank"])
+    logger.info(f"Rebalanced ranks of {len(ids)} tasks in project {project_id}, status {status!r}")
+    return len(ids)
+
+def rebalance_column_job(bind: Engine, project_id: int, status: Optional[str]) -> None:
+    """Фоновая перенумерация (BackgroundTasks): своя сессия, отдельная транзакция."""
+    with Session(bind=bind) as db:
+        try:
+            rebalance_column(db, project_id, status)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Background rank rebalance failed for project {project_id}, status {status!r}: {e}")
+
+def columns_to_rebalance(db: Session, project_ids: Optional[Iterable[int]] = None) -> List[Tuple[int, Optional[str]]]:
+    """Колонки с длинными рангами или живыми задачами без ранга."""
+    statement = (
+        select(Task.project_id, Task.status)
+        .where(Task.is_deleted == false())
+        .group_by(Task.project_id, Task.status)
+        .having(or_(
+            func.max(func.length(Task.rank)) > REBALANCE_LENGTH,
+            func.count() > func.count(Task.rank),
+        ))
+    )
+    if project_ids is not None:
+        statement = statement.where(Task.project_id.in_(list(project_ids)))
+    return [tuple(row) for row in db.execute(statement)]
+
+def rebalance_long_ranks(db: Session, project_ids: Optional[Iterable[int]] = None) -> Dict[str, int]:
+    """Периодическое обслуживание: перенумеровать все колонки, которым это нужно."""
+    columns = columns_to_rebalance(db, project_ids)
+    tasks = 0
+    for project_id, status in columns:
+        tasks += rebalance_column(db, project_id, status)
+        db.commit()
+    return {"columns": len(columns), "tasks": tasks}
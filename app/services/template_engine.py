@@ -0,0 +1,376 @@
+#app/services/template_engine.py
+"""
+Шаблоны проектов: Template.structure = {plugins, default_tasks, settings}.
+
+- compile_structure() один раз проверяет структуру и раскладывает дерево задач
+  по уровням вложенности с готовыми значениями колонок и рангами доски;
+  результат кешируется по (template_id, updated_at) — правка шаблона меняет ключ.
+- instantiate() создаёт проект, подключения плагинов и задачи массовыми INSERT:
+  один executemany на уровень дерева, поэтому число запросов зависит от глубины
+  шаблона, а не от числа задач. Коммит — на вызывающем.
+- capture_structure() — обратное направление: structure из живого проекта
+  за один проход потокового курсора по его задачам.
+"""
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import false, insert, select, true
+from sqlalchemy.orm import Session
+
+from app.core.custom_fields import CUSTOM_FIELDS_SCHEMA
+from app.core.lexorank import rank_sequence
+from app.models.plugin import Plugin
+from app.models.project import Project
+from app.models.project_plugin import ProjectPlugin
+from app.models.task import Task
+from app.models.template import Template
+from app.services.assignee_index import resync_assignees
+from app.services.project_counters import recompute_project_counters
+from app.services.tag_index import resync_tags
+import logging
+
+logger = logging.getLogger("DevOS.TemplateEngine")
+
+MAX_TEMPLATE_TASKS = 50000
+MAX_TEMPLATE_DEPTH = 10
+TEMPLATE_CACHE_SIZE = 256
+
+class TemplateStructureError(ValueError):
+    pass
+
+@dataclass(frozen=True)
+class CompiledTask:
+    key: int                 # номер задачи в шаблоне (обход в глубину)
+    parent: Optional[int]    # key родителя
+    values: dict             # значения колонок tasks (без project_id / parent_task_id / дат)
+    deadline_in_days: Optional[int]
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    template_id: int
+    updated_at: datetime
+    plugins: Tuple[Tuple[str, dict], ...]
+    levels: Tuple[Tuple[CompiledTask, ...], ...]   # levels[0] — задачи верхнего уровня
+    project_custom_fields: dict = field(default_factory=dict)   # settings.custom_fields — значения по умолчанию
+
+    @property
+    def task_count(self) -> int:
+        return sum(len(level) for level in self.levels)
+
+# --- Компиляция ---
+
+def _text(item: dict, key: str, path: str, max_length: int, default: Optional[str] = None) -> Optional[str]:
+    value = item.get(key, default)
+    if value is None:
+        return None
+    if not isinstance(value, str):
+        raise TemplateStructureError(f"{path}.{key} must be a string.")
+    value = value.strip()
+    if len(value) > max_length:
+        raise TemplateStructureError(f"{path}.{key} must be at most {max_length} characters.")
+    return value
+
+def _int(value, path: str, low: int, high: int) -> int:
+    if isinstance(value, bool) or not isinstance(value, int) or not low <= value <= high:
+        raise TemplateStructureError(f"{path} must be an integer between {low} and {high}.")
+    return value
+
+def _check_custom_fields(value, path: str) -> dict:
+    if not isinstance(value, dict):
+        raise TemplateStructureError(f"{path} must be an object.")
+    for key, item in value.items():
+        schema = CUSTOM_FIELDS_SCHEMA.get(key)
+        if not schema:
+            raise TemplateStructureError(f"{path}: unknown custom field '{key}'.")
+        if not schema["validator"](item):
+            raise TemplateStructureError(f"{path}: invalid value for '{key}' (expected {schema['type']}).")
+    return dict(value)
+
+def _compile_plugins(value) -> Tuple[Tuple[str, dict], ...]:
+    if value is None:
+        return ()
+    if not isinstance(value, list):
+        raise TemplateStructureError("plugins must be a list.")
+    plugins, seen = [], set()
+    for i, item in enumerate(value):
+        # Плагин — имя или {"name": ..., "config": {...}}
+        item = {"name": item} if isinstance(item, str) else item
+        if not isinstance(item, dict) or not isinstance(item.get("name"), str) or not item["name"].strip():
+            raise TemplateStructureError(f"plugins[{i}] must be a plugin name or an object with a name.")
+        name = item["name"].strip()
+        config = item.get("config") or {}
+        if not isinstance(config, dict):
+            raise TemplateStructureError(f"plugins[{i}].config must be an object.")
+        if name in seen:
+            raise TemplateStructureError(f"Plugin '{name}' is listed twice.")
+        seen.add(name)
+        plugins.append((name, config))
+    return tuple(plugins)
+
+def _compile_task(item, path: str, settings: dict) -> Tuple[dict, Optional[int]]:
+    if not isinstance(item, dict):
+        raise TemplateStructureError(f"{path} must be an object.")
+    title = _text(item, "title", path, 160)
+    if not title:
+        raise TemplateStructureError(f"{path}.title is required.")
+    status = _text(item, "status", path, 24, settings["default_status"]) or settings["default_status"]
+    tags = item.get("tags") or []
+    if not isinstance(tags, list) or not all(isinstance(tag, str) for tag in tags):
+        raise TemplateStructureError(f"{path}.tags must be a list of strings.")
+    custom_fields = _check_custom_fields(item.get("custom_fields") or {}, f"{path}.custom_fields")
+    assignees = item.get("assignees") or []
+    if not isinstance(assignees, list) or not all(isinstance(assignee, dict) for assignee in assignees):
+        raise TemplateStructureError(f"{path}.assignees must be a list of objects.")
+    deadline_in_days = item.get("deadline_in_days")
+    if deadline_in_days is not None:
+        deadline_in_days = _int(deadline_in_days, f"{path}.deadline_in_days", 0, 3650)
+    values = {
+        "title": title,
+        "description": _text(item, "description", path, 2000, "") or "",
+        "status": status,
+        "priority": _int(item.get("priority", settings["default_priority"]), f"{path}.priority", 1, 5),
+        "tags": list(tags),
+        "custom_fields": custom_fields,
+        "assignees": list(assignees),
+        "ai_notes": _text(item, "ai_notes", path, 2000),
+    }
+    return values, deadline_in_days
+
+def compile_structure(template_id: int, updated_at: datetime, structure) -> CompiledTemplate:
+    """Проверяет structure и готовит её к instantiate(); ошибки — TemplateStructureError с путём."""
+    if not isinstance(structure, dict):
+        raise TemplateStructureError("Template structure must be an object.")
+    raw_settings = structure.get("settings") or {}
+    if not isinstance(raw_settings, dict):
+        raise TemplateStructureError("settings must be an object.")
+    settings = {
+        "default_priority": _int(raw_settings.get("default_priority", 3), "settings.default_priority", 1, 5),
+        "default_status": _text(raw_settings, "default_status", "settings", 24, "todo") or "todo",
+        "allow_subtasks": raw_settings.get("allow_subtasks", True) is not False,
+    }
+    default_tasks = structure.get("default_tasks") or []
+    if not isinstance(default_tasks, list):
+        raise TemplateStructureError("default_tasks must be a list.")
+
+    tasks: List[Tuple[int, Optional[int], int, dict, Optional[int]]] = []   # key, parent, depth, values, days
+    titles = set()
+    # Обход в глубину без рекурсии; стек в обратном порядке сохраняет порядок шаблона
+    stack = [(item, f"default_tasks[{i}]", None, 0) for i, item in reversed(list(enumerate(default_tasks)))]
+    while stack:
+        item, path, parent, depth = stack.pop()
+        values, days = _compile_task(item, path, settings)
+        if values["title"] in titles:
+            raise TemplateStructureError(f"{path}.title '{values['title']}' is used twice (titles are unique within a project).")
+        titles.add(values["title"])
+        key = len(tasks)
+        if key >= MAX_TEMPLATE_TASKS:
+            raise TemplateStructureError(f"Template has more than {MAX_TEMPLATE_TASKS} tasks.")
+        tasks.append((key, parent, depth, values, days))
+        subtasks = item.get("subtasks") or []
+        if not isinstance(subtasks, list):
+            raise TemplateStructureError(f"{path}.subtasks must be a list.")
+        if subtasks and not settings["allow_subtasks"]:
+            raise TemplateStructureError(f"{path}.subtasks: subtasks are disabled by settings.allow_subtasks.")
+        if subtasks and depth + 1 >= MAX_TEMPLATE_DEPTH:
+            raise TemplateStructureError(f"{path}: tasks can be nested at most {MAX_TEMPLATE_DEPTH} levels deep.")
+        stack.extend(
+            (child, f"{path}.subtasks[{i}]", key, depth + 1) for i, child in reversed(list(enumerate(subtasks)))
+        )
+
+    # Ранги доски: колонки нового проекта пусты, порядок — порядок задач в шаблоне
+    by_status = defaultdict(list)
+    for key, _, _, values, _ in tasks:
+        by_status[values["status"]].append(key)
+    ranks = {}
+    for keys in by_status.values():
+        ranks.update(zip(keys, rank_sequence(len(keys))))
+
+    levels = defaultdict(list)
+    for key, parent, depth, values, days in tasks:
+        levels[depth].append(CompiledTask(key, parent, {**values, "rank": ranks[key]}, days))
+    return CompiledTemplate(
+        template_id=template_id,
+        updated_at=updated_at,
+        plugins=_compile_plugins(structure.get("plugins")),
+        levels=tuple(tuple(levels[depth]) for depth in sorted(levels)),
+        project_custom_fields=_check_custom_fields(raw_settings.get("custom_fields") or {}, "settings.custom_fields"),
+    )
+
+# --- Кеш скомпилированных шаблонов ---
+
+class _CompiledCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._items: Dict[int, CompiledTemplate] = {}
+
+    def get(self, db: Session, template_id: int, updated_at: datetime) -> CompiledTemplate:
+        with self._lock:
+            compiled = self._items.get(template_id)
+        if compiled is not None and compiled.updated_at == updated_at:
+            return compiled
+        # Тяжёлый JSON structure читается только при промахе
+        structure = db.execute(select(Template.structure).where(Template.id == template_id)).scalar()
+        compiled = compile_structure(template_id, updated_at, structure)
+        with self._lock:
+            self._items.pop(template_id, None)
+            if len(self._items) >= TEMPLATE_CACHE_SIZE:
+                self._items.pop(next(iter(self._items)))
+            self._items[template_id] = compiled
+        logger.info(f"Compiled template {template_id}: {compiled.task_count} tasks, {len(compiled.plugins)} plugins")
+        return compiled
+
+    def forget(self, template_id: int) -> None:
+        with self._lock:
+            self._items.pop(template_id, None)
+
+_compiled = _CompiledCache()
+
+def compiled_template(db: Session, template_id: int, updated_at: datetime) -> CompiledTemplate:
+    return _compiled.get(db, template_id, updated_at)
+
+def forget_template(template_id: int) -> None:
+    _compiled.forget(template_id)
+
+# --- Создание проекта ---
+
+def instantiate(session: Session, compiled: CompiledTemplate, project_row: dict) -> Dict[str, int]:
+    """
+    Проект (project_row — провалидированные значения колонок), подключения плагинов и задачи.
+    Возвращает {"project_id", "tasks", "plugins"}.
+    """
+    plugin_ids = {}
+    if compiled.plugins:
+        names = [name for name, _ in compiled.plugins]
+        plugin_ids = dict(session.execute(
+            select(Plugin.name, Plugin.id).where(Plugin.name.in_(names), Plugin.is_active == true())
+        ).all())
+        missing = [name for name in names if name not in plugin_ids]
+        if missing:
+            raise TemplateStructureError(f"Unknown or inactive plugin(s): {', '.join(missing)}.")
+
+    if compiled.project_custom_fields:
+        project_row = {
+            **project_row,
+            "custom_fields": {**compiled.project_custom_fields, **(project_row.get("custom_fields") or {})},
+        }
+    project_id = session.execute(insert(Project).values(**project_row).returning(Project.id)).scalar_one()
+    now = datetime.utcnow()
+    if plugin_ids:
+        session.execute(insert(ProjectPlugin), [
+            {"project_id": project_id, "plugin_id": plugin_ids[name], "config": config,
+             "is_enabled": True, "created_at": now}
+            for name, config in compiled.plugins
+        ])
+
+    today = date.today()
+    statement = insert(Task).returning(Task.id, sort_by_parameter_order=True)
+    task_ids: Dict[int, int] = {}
+    for level in compiled.levels:
+        rows = [
+            {
+                **task.values,
+                "project_id": project_id,
+                "parent_task_id": task_ids[task.parent] if task.parent is not None else None,
+                "deadline": today + timedelta(days=task.deadline_in_days) if task.deadline_in_days is not None else None,
+                "attachments": [],
+                "is_deleted": False,
+                "is_favorite": False,
+                "reviewed": False,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for task in level
+        ]
+        # Один executemany на уровень: id родителей нужны следующему уровню
+        task_ids.update(zip((task.key for task in level), session.execute(statement, rows).scalars().all()))
+
+    # Массовые INSERT минуют after_flush: производные данные — явно
+    resync_tags(session, Project, [project_id])
+    resync_tags(session, Task, task_ids.values())
+    resync_assignees(session, [
+        task_ids[task.key] for level in compiled.levels for task in level if task.values["assignees"]
+    ])
+    recompute_project_counters(session, [project_id])
+    logger.info(f"Instantiated template {compiled.template_id} as project {project_id}: {len(task_ids)} tasks")
+    return {"project_id": project_id, "tasks": len(task_ids), "plugins": len(plugin_ids)}
+
+# --- Шаблон из проекта ---
+
+CAPTURE_BATCH_SIZE = 1000
+
+def _plugin_configs(session: Session, project_id: int) -> List[dict]:
+    rows = session.execute(
+        select(Plugin.name, ProjectPlugin.config)
+        .join(ProjectPlugin, ProjectPlugin.plugin_id == Plugin.id)
+        .where(ProjectPlugin.project_id == project_id, ProjectPlugin.is_enabled == true(), Plugin.is_active == true())
+        .order_by(Plugin.name)
+    )
+    return [{"name": name, "config": config or {}} for name, config in rows]
+
+def capture_structure(session: Session, project_id: int, strip_dates: bool = False,
+                      strip_assignees: bool = False) -> Dict[str, Any]:
+    """
+    structure шаблона из проекта: дерево живых задач, их теги и custom_fields,
+    custom_fields проекта (settings.custom_fields) и включённые плагины с настройками.
+    Задачи читаются одним потоковым проходом (yield_per, в Postgres — серверный курсор)
+    только нужными колонками, без ORM-объектов. Дедлайны становятся deadline_in_days
+    от даты создания проекта; strip_dates / strip_assignees их отбрасывают.
+    """
+    project = session.execute(
+        select(Project.created_at, Project.custom_fields).where(Project.id == project_id)
+    ).first()
+    start = project.created_at.date()
+    columns = [Task.id, Task.parent_task_id, Task.title, Task.description, Task.status, Task.priority,
+               Task.tags, Task.custom_fields, Task.ai_notes]
+    if not strip_dates:
+        columns.append(Task.deadline)
+    if not strip_assignees:
+        columns.append(Task.assignees)
+    rows = session.execute(
+        select(*columns)
+        .where(Task.project_id == project_id, Task.is_deleted == false())
+        # Порядок доски: в шаблоне задачи идут так же, и ранги копии совпадут по порядку
+        .order_by(Task.rank.asc().nulls_last(), Task.id)
+        .execution_options(yield_per=CAPTURE_BATCH_SIZE)
+    )
+
+    items: Dict[int, dict] = {}
+    parents: List[Tuple[int, Optional[int]]] = []
+    for row in rows:
+        # В шаблон попадают только непустые значения: structure остаётся компактной
+        item = {"title": row.title, "status": row.status or "todo", "priority": row.priority or 3}
+        if row.description:
+            item["description"] = row.description
+        if row.tags:
+            item["tags"] = row.tags
+        if row.custom_fields:
+            item["custom_fields"] = row.custom_fields
+        if row.ai_notes:
+            item["ai_notes"] = row.ai_notes
+        if not strip_dates and row.deadline is not None:
+            item["deadline_in_days"] = min(max((row.deadline - start).days, 0), 3650)
+        if not strip_assignees and row.assignees:
+            item["assignees"] = row.assignees
+        items[row.id] = item
+        parents.append((row.id, row.parent_task_id))
+
+    # Подзадачи в порядке потока; родитель вне копии (архивный, другой проект) -> верхний уровень
+    default_tasks = []
+    for task_id, parent_id in parents:
+        parent = items.get(parent_id) if parent_id is not None else None
+        if parent is not None:
+            parent.setdefault("subtasks", []).append(items[task_id])
+        else:
+            default_tasks.append(items[task_id])
+    return {
+        "plugins": _plugin_configs(session, project_id),
+        "default_tasks": default_tasks,
+        "settings": {
+            "default_priority": 3,
+            "allow_subtasks": True,
+            "custom_fields": project.custom_fields or {},
+        },
+    }
@@ -0,0 +1,192 @@
+#app/services/typeahead.py
+"""
+Typeahead для quick-switcher: top-N подсказок по задачам, проектам, тегам и пользователям.
+
+- Названия задач, имена проектов, username (Postgres): GIN pg_trgm —
+  префикс по ILIKE 'q%' плюс опечатки через word_similarity (оператор %>).
+- Теги (всегда) и имена проектов (fallback: не Postgres или запрос короче 3 символов,
+  когда триграммы не работают): PrefixTrie в памяти процесса (app/core/trie.py).
+  Деревья перестраиваются лениво: после ORM-изменений имён/тегов и не реже TRIE_TTL.
+"""
+import threading
+import time
+from itertools import chain
+from typing import Dict, List, Optional
+
+from sqlalchemy import bindparam, case, event, false, func, inspect, literal, null, or_, select, union_all
+from sqlalchemy.orm import Session
+
+from app.core.dialect import is_postgres
+from app.core.trie import PrefixTrie
+from app.services.tag_index import tag_usage
+from app.models.project import Project
+from app.models.task import Task
+from app.models.user import User
+import logging
+
+logger = logging.getLogger("DevOS.Typeahead")
+
+TYPEAHEAD_KINDS = ("task", "project", "tag", "user")
+MIN_TRIGRAM_CHARS = 3          # короче — у запроса нет ни одной полной триграммы
+WORD_SIMILARITY_THRESHOLD = 0.4
+MAX_EDITS = 1                  # опечатки в trie: одна вставка/удаление/замена/перестановка
+MIN_FUZZY_CHARS = 3            # на 1-2 символах "опечатка" совпадает почти со всем
+TRIE_TTL = 300                 # секунд; страхует от массовых Core-записей мимо ORM
+
+class TypeaheadQueryError(ValueError):
+    pass
+
+# --- Деревья в памяти процесса -------------------------------------------
+
+class _TrieCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tries: Optional[Dict[str, PrefixTrie]] = None
+        self._built_at = 0.0
+        self.stale = True
+
+    def get(self, db: Session) -> Dict[str, PrefixTrie]:
+        with self._lock:
+            if self.stale or self._tries is None or time.monotonic() - self._built_at > TRIE_TTL:
+                started = time.perf_counter()
+                self._tries = {"tag": _build_tag_trie(db), "project": _build_project_trie(db)}
+                self._built_at = time.monotonic()
+                self.stale = False
+                logger.info(
+                    "Typeahead tries rebuilt: %d tags, %d projects in %.1f ms",
+                    len(self._tries["tag"]), len(self._tries["project"]),
+                    (time.perf_counter() - started) * 1000,
+                )
+            return self._tries
+
+    def invalidate(self) -> None:
+        self.stale = True
+
+_tries = _TrieCache()
+
+def invalidate_typeahead_cache() -> None:
+    _tries.invalidate()
+
+def _build_tag_trie(db: Session) -> PrefixTrie:
+    trie = PrefixTrie()
+    # Частота по всем сущностям — из нормализованного индекса тегов
+    for usage in tag_usage(db, limit=None):
+        trie.add(usage["name"], weight=usage["total"])
+    return trie.freeze()
+
+def _build_project_trie(db: Session) -> PrefixTrie:
+    trie = PrefixTrie()
+    rows = db.execute(
+        select(Project.id, Project.name, Project.tasks_total).where(Project.is_deleted == false())
+    )
+    for project_id, name, tasks_total in rows:
+        # Крупные проекты выше при равном совпадении
+        trie.add(name, weight=1 + (tasks_total or 0), payload=project_id)
+    return trie.freeze()
+
+# Изменения, после которых деревья устарели (в after_flush история ещё до flush)
+_WATCHED = {Task: ("tags", "is_deleted"), Project: ("name", "tags", "is_deleted")}
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_on_change(session: Session, flush_context) -> None:
+    if _tries.stale:
+        return
+    for obj in chain(session.new, session.deleted):
+        if type(obj) in _WATCHED:
+            _tries.invalidate()
+            return
+    for obj in session.dirty:
+        watched = _WATCHED.get(type(obj))
+        if watched and any(inspect(obj).attrs[key].history.has_changes() for key in watched):
+            _tries.invalidate()
+            return
+
+def _trie_hits(trie: PrefixTrie, kind: str, q: str, limit: int) -> List[dict]:
+    return [
+        {
+            "type": kind,
+            "id": payload,
+            "project_id": payload if kind == "project" else None,
+            "label": label,
+            # Точное совпадение префикса выше опечатки, дальше — по весу
+            "score": round(1.0 / (1 + edits), 4),
+        }
+        for edits, (weight, label, payload) in trie.complete(
+            q, limit=limit, max_edits=MAX_EDITS if len(q) >= MIN_FUZZY_CHARS else 0,
+        )
+    ]
+
+# --- SQL (pg_trgm / LIKE) -------------------------------------------------
+
+def _like_prefix(q: str) -> str:
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
+
+def _sql_branch(kind: str, column, id_column, project_id_column, live, postgres: bool, limit: int):
+    q = bindparam("q")
+    prefix = bindparam("prefix")
+    starts_with = column.ilike(prefix, escape="\\")
+    if postgres:
+        # Префикс — 1.0, иначе похожесть слова (0..1); оба условия обслуживает GIN gin_trgm_ops
+        score = case((starts_with, 1.0), else_=func.word_similarity(q, column))
+        condition = or_(starts_with, column.op("%>")(q))
+    else:
+        # Без pg_trgm: только совпадение с начала названия или любого слова
+        score = literal(1.0)
+        condition = or_(starts_with, column.ilike("% " + prefix, escape="\\"))
+    statement = select(
+        literal(kind).label("type"),
+        id_column.label("id"),
+        (project_id_column if project_id_column is not None else null()).label("project_id"),
+        column.label("label"),
+        score.label("score"),
+    ).where(condition)
+    if live is not None:
+        statement = statement.where(live == false())
+    return statement.order_by(score.desc(), func.length(column), column).limit(limit).subquery()
+
+SQL_SOURCES = {
+    "task": lambda: (Task.title, Task.id, Task.project_id, Task.is_deleted),
+    "project": lambda: (Project.name, Project.id, Project.id, Project.is_deleted),
+    "user": lambda: (User.username, User.id, None, None),
+}
+
+def typeahead(db: Session, q: str, kinds: Optional[List[str]] = None, limit: int = 10) -> List[dict]:
+    """
+    [{type, id, project_id, label, score}] — не больше limit подсказок суммарно,
+    по убыванию score (1.0 — совпадение с начала, меньше — опечатка/похожесть).
+    В Postgres запросы короче MIN_TRIGRAM_CHARS ищут только по деревьям (проекты, теги).
+    """
+    q = (q or "").strip()
+    if not q:
+        raise TypeaheadQueryError("Query must not be empty.")
+    kinds = kinds or list(TYPEAHEAD_KINDS)
+    unknown = [kind for kind in kinds if kind not in TYPEAHEAD_KINDS]
+    if unknown:
+        raise TypeaheadQueryError(f"Unknown type(s): {', '.join(unknown)}. Use: {', '.join(TYPEAHEAD_KINDS)}.")
+    kinds = list(dict.fromkeys(kinds))
+
+    postgres = is_postgres(db)
+    trigrams = postgres and len(q) >= MIN_TRIGRAM_CHARS
+    trie_kinds = [k for k in kinds if k == "tag" or (k == "project" and not trigrams)]
+    sql_kinds = [k for k in kinds if k not in trie_kinds and (trigrams or not postgres)]
+
+    hits: List[dict] = []
+    if trie_kinds:
+        tries = _tries.get(db)
+        for kind in trie_kinds:
+            hits.extend(_trie_hits(tries[kind], kind, q, limit))
+    if sql_kinds:
+        branches = [
+            select(*_sql_branch(kind, *SQL_SOURCES[kind](), postgres=postgres, limit=limit).c)
+            for kind in sql_kinds
+        ]
+        if postgres:
+            db.execute(
+                select(func.set_config("pg_trgm.word_similarity_threshold", str(WORD_SIMILARITY_THRESHOLD), True))
+            )
+        rows = db.execute(union_all(*branches), {"q": q, "prefix": _like_prefix(q)}).mappings()
+        hits.extend({**row, "score": round(float(row["score"]), 4)} for row in rows)
+
+    hits.sort(key=lambda hit: (-hit["score"], len(hit["label"] or ""), hit["label"] or ""))
+    return hits[:limit]
@@ -0,0 +1,109 @@
+#benchmarks/read_path.py
+"""
+ORM-путь чтения против Core-пути (app/crud/readers.py) на списке задач.
+
+  orm+pydantic  — Query(Task) -> TaskRead.model_validate -> dict (как было)
+  orm+rows      — Query(Task) -> orm_rows                       (orjson fast path)
+  core+rows     — select(колонки) -> Row -> orm_rows            (read layer)
+
+Время: лучшее из --repeat прогонов, мкс на строку. Память: пик tracemalloc на строку.
+Таблицы создаются в SQLite-файле во временной папке.
+
+    python -m benchmarks.read_path [--rows 1000 10000 100000] [--repeat 3]
+"""
+import argparse
+import datetime
+import os
+import tempfile
+import time
+import tracemalloc
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateTable
+
+from app.core.serialization import orm_rows
+from app.crud.readers import TASK_READ_FIELDS, _columns
+from app.crud.filters import TASK_FILTERS
+from app.models.project import Project
+from app.models.task import Task
+from app.schemas.task import TaskRead
+
+FILTERS = {"project_id": 1}
+
+def setup(path: str, n: int):
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        # Только таблицы: индексы для полного скана не нужны
+        conn.execute(CreateTable(Project.__table__))
+        conn.execute(CreateTable(Task.__table__))
+        conn.execute(insert(Project), [{"id": 1, "name": "bench"}])
+        today = datetime.date.today()
+        now = datetime.datetime.utcnow()
+        conn.execute(insert(Task), [
+            {
+                "project_id": 1,
+                "title": f"Task #{i}: implement feature",
+                "description": "x" * 200,
+                "status": ("todo", "in progress", "done")[i % 3],
+                "priority": 1 + i % 5,
+                "deadline": today + datetime.timedelta(days=i % 90),
+                "assignees": [{"user_id": i % 7, "name": f"user{i % 7}", "email": None, "role": "dev",
+                               "avatar_url": None, "is_active": True}],
+                "tags": ["bug", "backend"] if i % 2 else ["feature"],
+                "custom_fields": {"estimate": i % 13},
+                "attachments": [],
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in range(n)
+        ])
+    return engine
+
+def orm_pydantic(session: Session) -> list:
+    tasks = TASK_FILTERS.apply(session.query(Task), FILTERS, ordered=False).all()
+    return [TaskRead.model_validate(task, from_attributes=True).model_dump() for task in tasks]
+
+def orm_fast(session: Session) -> list:
+    return orm_rows(TASK_FILTERS.apply(session.query(Task), FILTERS, ordered=False).all(), TaskRead)
+
+def core_rows(session: Session) -> list:
+    clauses, params = TASK_FILTERS.where(FILTERS)
+    statement = select(*_columns(Task, TASK_READ_FIELDS)).where(*clauses)
+    return orm_rows(session.execute(statement, params).all(), TaskRead)
+
+PATHS = {"orm+pydantic": orm_pydantic, "orm+rows": orm_fast, "core+rows": core_rows}
+
+def measure(engine, fn, repeat: int):
+    best = None
+    for _ in range(repeat):
+        with Session(engine) as session:
+            started = time.perf_counter()
+            rows = fn(session)
+            elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    with Session(engine) as session:
+        tracemalloc.start()
+        rows = fn(session)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return best, peak, len(rows)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.rows:
+            engine = setup(os.path.join(tmp, f"bench_{n}.db"), n)
+            print(f"\n{n} rows")
+            for name, fn in PATHS.items():
+                elapsed, peak, count = measure(engine, fn, args.repeat)
+                assert count == n
+                print(f"  {name:<13} {elapsed * 1e6 / n:7.1f} us/row   {peak / n / 1024:6.2f} KiB/row peak")
+            engine.dispose()
+
+if __name__ == "__main__":
+    main()
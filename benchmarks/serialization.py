@@ -0,0 +1,78 @@
+#benchmarks/serialization.py
+"""
+Сравнение сериализации списков задач: текущий путь FastAPI
+(pydantic response_model -> jsonable_encoder -> json) против orm_rows -> orjson.
+
+    python -m benchmarks.serialization [--rows 10000] [--repeat 5]
+"""
+import argparse
+import datetime
+import json
+import time
+from typing import List
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.core.serialization import orm_rows
+from app.models.task import Task
+from app.schemas.task import TaskCard, TaskShort
+
+def make_tasks(n: int) -> List[Task]:
+    today = datetime.date.today()
+    now = datetime.datetime.utcnow()
+    return [
+        Task(
+            id=i,
+            project_id=1 + i % 20,
+            parent_task_id=None,
+            title=f"Task #{i}: implement feature",
+            description="x" * 200,
+            status=("todo", "in progress", "done")[i % 3],
+            priority=1 + i % 5,
+            deadline=today + datetime.timedelta(days=i % 90),
+            # Так их сохраняет API: Assignee.dict() со всеми ключами
+            assignees=[{"user_id": i % 7, "name": f"user{i % 7}", "email": None, "role": "dev",
+                        "avatar_url": None, "is_active": True}],
+            tags=["bug", "backend"] if i % 2 else ["feature"],
+            custom_fields={"estimate": i % 13},
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(n)
+    ]
+
+def fastapi_default(tasks: List[Task], schema: type) -> bytes:
+    # То, что делает serialize_response + JSONResponse.render
+    validated = TypeAdapter(List[schema]).validate_python(tasks, from_attributes=True)
+    content = jsonable_encoder(validated)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+def orjson_fast_path(tasks: List[Task], schema: type) -> bytes:
+    return orjson.dumps(orm_rows(tasks, schema))
+
+def best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tasks = make_tasks(args.rows)
+    print(f"{args.rows} tasks, best of {args.repeat}")
+    for schema in (TaskShort, TaskCard):
+        assert json.loads(fastapi_default(tasks, schema)) == json.loads(orjson_fast_path(tasks, schema))
+        old = best_of(lambda: fastapi_default(tasks, schema), args.repeat)
+        new = best_of(lambda: orjson_fast_path(tasks, schema), args.repeat)
+        print(f"{schema.__name__:<10} pydantic+json {old * 1000:8.1f} ms   orm_rows+orjson {new * 1000:8.1f} ms   x{old / new:.1f}")
+
+if __name__ == "__main__":
+    main()
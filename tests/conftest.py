@@ -0,0 +1,64 @@
+#tests/conftest.py
+"""
+Общие фикстуры: db — SQLite в памяти (схема через Base.metadata.create_all,
+FTS5 ставит app/core/fulltext.py); pg_db — Postgres из TEST_DATABASE_URL,
+без переменной тесты с ним пропускаются.
+"""
+import os
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401 — регистрирует все таблицы в Base.metadata
+from app.models.base import Base
+from app.models.project import Project
+
+# app.crud импортирует app.core.exceptions: без него тесты не собрать — прогон останавливается
+# с причиной, а не завершается молча с "no tests ran"
+try:
+    import app.core.exceptions  # noqa: F401
+    MISSING_DEPENDENCY = None
+except ImportError as e:
+    MISSING_DEPENDENCY = str(e)
+
+def pytest_configure(config):
+    if MISSING_DEPENDENCY:
+        raise pytest.UsageError(f"tests need app.core.exceptions: {MISSING_DEPENDENCY}")
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+@pytest.fixture(scope="session")
+def pg_engine():
+    url = os.environ.get("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    engine = create_engine(url)
+    with engine.begin() as connection:
+        # gin_trgm_ops индексов typeahead
+        connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    yield engine
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+@pytest.fixture
+def pg_db(pg_engine):
+    with Session(pg_engine) as session:
+        yield session
+        session.rollback()
+
+@pytest.fixture
+def project(db):
+    project = Project(name="Test project")
+    db.add(project)
+    db.commit()
+    return project
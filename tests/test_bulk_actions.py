@@ -0,0 +1,47 @@
+#tests/test_bulk_actions.py
+import pytest
+
+from app.core.exceptions import TaskValidationError
+from app.crud.task import bulk_task_action, create_task
+from app.models.project import Project
+from app.models.task import Task
+
+@pytest.fixture
+def two_projects(db, project):
+    other = Project(name="Other project")
+    db.add(other)
+    db.commit()
+    for p in (project, other):
+        for i in range(3):
+            create_task(db, {"title": f"t{i}", "project_id": p.id, "status": "todo"})
+    return project, other
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"show_archived": True},
+    {"status": "all"},
+    {"search": "!!! ..."},
+    {"project_id": None, "tag": ""},
+])
+def test_bulk_action_without_effective_filter_is_rejected(db, two_projects, filters):
+    with pytest.raises(TaskValidationError):
+        bulk_task_action(db, filters, "archive")
+    assert db.query(Task).filter(Task.is_deleted.is_(True)).count() == 0
+
+def test_bulk_action_touches_only_matching_tasks(db, two_projects):
+    project, other = two_projects
+    result = bulk_task_action(db, {"project_id": project.id, "status": "all"}, "archive")
+
+    assert result["matched"] == 3
+    archived = db.query(Task).filter(Task.is_deleted.is_(True)).all()
+    assert {t.project_id for t in archived} == {project.id}
+    db.refresh(project)
+    db.refresh(other)
+    assert (project.tasks_total, other.tasks_total) == (0, 3)
+
+def test_bulk_action_dry_run_writes_nothing(db, two_projects):
+    project, _ = two_projects
+    result = bulk_task_action(db, {"project_id": project.id}, "set_status", "done", dry_run=True)
+
+    assert result["matched"] == 3
+    assert db.query(Task).filter(Task.status == "done").count() == 0
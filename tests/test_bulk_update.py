@@ -0,0 +1,40 @@
+#tests/test_bulk_update.py
+from app.crud.task import bulk_update_tasks, create_task
+from app.models.task import Task
+
+def _titles(db, project):
+    return sorted(t.title for t in db.query(Task).filter_by(project_id=project.id))
+
+def _tasks(db, project, *titles):
+    return [create_task(db, {"title": title, "project_id": project.id}).id for title in titles]
+
+def test_rename_onto_task_that_keeps_its_title_is_rejected(db, project):
+    a, b = _tasks(db, project, "A", "B")
+    result = bulk_update_tasks(db, [{"id": a, "title": "B"}, {"id": b, "priority": 1}])
+
+    assert [e["index"] for e in result["errors"]] == [0]
+    assert [s["index"] for s in result["succeeded"]] == [1]
+    assert _titles(db, project) == ["A", "B"]
+
+def test_swapping_titles_within_batch_is_allowed(db, project):
+    a, b = _tasks(db, project, "A", "B")
+    result = bulk_update_tasks(db, [{"id": a, "title": "B"}, {"id": b, "title": "A"}])
+
+    assert not result["errors"]
+    db.expire_all()
+    assert (db.get(Task, a).title, db.get(Task, b).title) == ("B", "A")
+
+def test_rejected_rename_keeps_old_title_taken(db, project):
+    # b -> "C" отклонён (C занят), поэтому "B" не освобождается и a -> "B" тоже отклонён
+    a, b, c = _tasks(db, project, "A", "B", "C")
+    result = bulk_update_tasks(db, [{"id": a, "title": "B"}, {"id": b, "title": "C"}])
+
+    assert sorted(e["index"] for e in result["errors"]) == [0, 1]
+    assert _titles(db, project) == ["A", "B", "C"]
+
+def test_two_renames_to_same_title_in_batch(db, project):
+    a, b = _tasks(db, project, "A", "B")
+    result = bulk_update_tasks(db, [{"id": a, "title": "X"}, {"id": b, "title": "X"}])
+
+    assert [e["index"] for e in result["errors"]] == [1]
+    assert _titles(db, project) == ["B", "X"]
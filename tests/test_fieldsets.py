@@ -0,0 +1,29 @@
+#tests/test_fieldsets.py
+import pytest
+
+from app.core.exceptions import ProjectValidationError, TaskValidationError
+from app.core.serialization import orm_rows
+from app.crud.project import get_all_projects
+from app.crud.readers import read_tasks_page
+from app.crud.task import create_task
+from app.schemas.project import ProjectRead
+from app.schemas.task import TaskRead
+
+@pytest.mark.parametrize("fields", [["team_id"], ["name", "author_id"]])
+def test_project_columns_outside_read_schema_are_rejected(db, project, fields):
+    with pytest.raises(ProjectValidationError):
+        get_all_projects(db, fields=fields)
+
+def test_project_fields_follow_read_schema(db, project):
+    create_task(db, {"title": "A", "project_id": project.id})
+
+    rows = orm_rows(get_all_projects(db, fields=["name", "tasks_open"]), ProjectRead, fields=["name", "tasks_open"])
+    assert rows == [{"id": project.id, "name": "Test project", "tasks_open": 1}]
+
+def test_task_reader_rejects_fields_outside_read_schema(db, project):
+    with pytest.raises(TaskValidationError):
+        read_tasks_page(db, fields=["title", "search_vector"])
+
+def test_orm_rows_drops_names_outside_schema(db, project):
+    task = create_task(db, {"title": "A", "project_id": project.id})
+    assert orm_rows([task], TaskRead, fields=["title", "secret"]) == [{"id": task.id, "title": "A"}]
@@ -0,0 +1,59 @@
+#tests/test_filters.py
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.crud.filters import DEVLOG_FILTERS, PROJECT_FILTERS, TASK_FILTERS, USER_FILTERS
+from app.models.devlog import DevLogEntry
+from app.models.project import Project
+from app.models.task import Task
+from app.models.user import User
+
+FIELDS = [{"estimate": 5, "team": "core"}, {"estimate": "5"}, {"estimate": 8, "team": "core"}, None]
+
+@pytest.mark.parametrize("filters, expected", [
+    ({"custom_fields": {"estimate": 5}}, {0, 1}),          # "5" и 5 совпадают
+    ({"custom_fields": {"team": "core"}}, {0, 2}),
+    ({"custom_fields": {"estimate": 8, "team": "core"}}, {2}),
+    ({"custom_fields": {"estimate": 8, "team": "infra"}}, set()),
+])
+def test_custom_fields_filter_on_sqlite(db, project, filters, expected):
+    db.add_all([Task(title=f"t{i}", project_id=project.id, status="todo", custom_fields=f)
+                for i, f in enumerate(FIELDS)])
+    db.add_all([Project(name=f"p{i}", custom_fields=f) for i, f in enumerate(FIELDS)])
+    db.add_all([DevLogEntry(project_id=project.id, entry_type="note", content=f"e{i}", author="dev", custom_fields=f)
+                for i, f in enumerate(FIELDS)])
+    db.commit()
+
+    tasks = TASK_FILTERS.apply(db.query(Task), filters).all()
+    projects = PROJECT_FILTERS.apply(db.query(Project), filters).all()
+    entries = DEVLOG_FILTERS.apply(db.query(DevLogEntry), filters).all()
+
+    assert {t.title for t in tasks} == {f"t{i}" for i in expected}
+    assert {p.name for p in projects} == {f"p{i}" for i in expected}
+    assert {e.content for e in entries} == {f"e{i}" for i in expected}
+
+def test_role_filter_on_sqlite(db):
+    for name, roles in (("ann", ["developer", "manager"]), ("bob", ["developer"]), ("eve", [])):
+        db.add(User(username=name, email=f"{name}@example.com", password_hash="x", roles=roles))
+    db.commit()
+
+    def usernames(role):
+        return {u.username for u in USER_FILTERS.apply(db.query(User), {"role": role}).all()}
+
+    assert usernames("manager") == {"ann"}
+    assert usernames("developer") == {"ann", "bob"}
+    assert usernames("admin") == set()
+
+def test_postgres_keeps_containment_operator():
+    dialect = postgresql.dialect()
+    clauses, _ = USER_FILTERS.where({"role": "manager"})
+    assert "CAST(users.roles AS JSONB) @>" in str(clauses[0].compile(dialect=dialect))
+    clauses, _ = TASK_FILTERS.where({"custom_fields": {"team": "core"}})
+    assert "tasks.custom_fields @>" in " ".join(str(c.compile(dialect=dialect)) for c in clauses)
+
+def test_projects_sort_by_priority(db):
+    db.add_all([Project(name=f"p{priority}", priority=priority) for priority in (3, 1, 5, 2)])
+    db.commit()
+
+    projects = PROJECT_FILTERS.apply(db.query(Project), {}, "priority").all()
+    assert [p.priority for p in projects] == [1, 2, 3, 5]
@@ -0,0 +1,89 @@
+#tests/test_index_usage.py
+"""
+EXPLAIN-проверка: каждая поддерживаемая комбинация фильтр/сортировка списков
+идёт по индексу (миграции c81d4e07f5a2, b6e03f9a4d12, 4f6a0d2c8e15), а не Seq Scan.
+Только Postgres (TEST_DATABASE_URL); enable_seqscan = off — на пустых таблицах
+иначе планировщику дешевле прочитать таблицу целиком.
+"""
+import pytest
+
+from sqlalchemy import select, text
+
+from app.core.row_counts import _Explain
+from app.crud.devlog import entries_page_query
+from app.crud.filters import (
+    AI_CONTEXT_FILTERS, DEVLOG_FILTERS, PROJECT_FILTERS, TASK_FILTERS, TEMPLATE_FILTERS, USER_FILTERS,
+)
+from app.crud.jarvis import history_statement
+from app.crud.task import keyset_page_query
+from app.models.ai_context import AIContext
+from app.models.devlog import DevLogEntry
+from app.models.jarvis import ChatMessage
+from app.models.project import Project
+from app.models.task import Task
+from app.models.template import Template
+from app.models.user import User
+
+def _tasks(filters, sort_by):
+    clauses, params = TASK_FILTERS.where(filters)
+    return keyset_page_query(select(Task.id).where(*clauses), sort_by, 50), params
+
+def _projects(filters, sort_by):
+    clauses, params = PROJECT_FILTERS.where(filters)
+    return select(Project.id).where(*clauses).order_by(*PROJECT_FILTERS.order_by(sort_by)).limit(50), params
+
+def _listed(spec, model, sort_by):
+    return select(model.id).order_by(*spec.order_by(sort_by)).limit(50), {}
+
+def _devlog(filters):
+    clauses, params = DEVLOG_FILTERS.where(filters)
+    return entries_page_query(select(DevLogEntry.id).where(*clauses), 50), params
+
+# (запрос, допустимые индексы)
+CASES = {
+    "tasks project/deadline": (_tasks({"project_id": 1}, "deadline"), {"ix_tasks_live_project_deadline"}),
+    "tasks project+status/deadline": (
+        _tasks({"project_id": 1, "status": "todo"}, "deadline"), {"ix_tasks_live_project_status_deadline"},
+    ),
+    "tasks project/priority": (_tasks({"project_id": 1}, "priority"), {"ix_tasks_live_project_priority"}),
+    "tasks project+status/priority": (
+        _tasks({"project_id": 1, "status": "todo"}, "priority"),
+        {"ix_tasks_live_project_status_priority"},
+    ),
+    "tasks project/created_at": (_tasks({"project_id": 1}, "created_at"), {"ix_tasks_live_project_created_at"}),
+    "tasks project+status/rank": (
+        _tasks({"project_id": 1, "status": "todo"}, "rank"), {"ix_tasks_live_project_status_rank"},
+    ),
+    "projects created_at": (_projects({}, "created_at"), {"ix_projects_live_created_at"}),
+    "projects status/created_at": (
+        _projects({"status": "active"}, "created_at"), {"ix_projects_live_status_created_at"},
+    ),
+    "projects priority": (_projects({}, "priority"), {"ix_projects_live_priority"}),
+    "templates created_at": (_listed(TEMPLATE_FILTERS, Template, "created_at"), {"ix_templates_created_at"}),
+    "users created_at": (_listed(USER_FILTERS, User, "created_at"), {"ix_users_created_at"}),
+    "ai contexts created_at": (
+        _listed(AI_CONTEXT_FILTERS, AIContext, "created_at"), {"ix_ai_contexts_created_at"},
+    ),
+    "devlog feed": (_devlog({}), {"ix_devlog_entries_live_created_at"}),
+    "devlog project feed": (_devlog({"project_id": 1}), {"ix_devlog_entries_live_project_created_at"}),
+    "chat history": (
+        (history_statement(select(ChatMessage.id), 1), {}), {"ix_chat_messages_live_project_timestamp"},
+    ),
+}
+
+def _nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _nodes(child)
+
+@pytest.mark.parametrize("case", list(CASES))
+def test_list_query_uses_partial_index(pg_db, case):
+    (statement, params), expected = CASES[case]
+    pg_db.execute(text("SET LOCAL enable_seqscan = off"))
+    plan = pg_db.execute(_Explain(statement), params).scalar_one()[0]["Plan"]
+
+    nodes = list(_nodes(plan))
+    assert not [node for node in nodes if node["Node Type"] == "Seq Scan"]
+    assert {node.get("Index Name") for node in nodes} & expected, [
+        (node["Node Type"], node.get("Index Name")) for node in nodes
+    ]
@@ -0,0 +1,73 @@
+#tests/test_pagination.py
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app.core.exceptions import DevLogValidationError, TaskValidationError
+from app.crud.devlog import get_entries_page
+from app.crud.filters import TASK_FILTERS
+from app.crud.readers import read_entries_page, read_tasks_page
+from app.crud.task import create_task, get_tasks_page
+from app.models.devlog import DevLogEntry
+from app.models.task import Task
+
+def _all_pages(read_page, **kwargs):
+    ids, cursor, pages = [], None, 0
+    while True:
+        page = read_page(cursor=cursor, **kwargs)
+        rows = page.get("tasks", page.get("entries"))
+        ids.extend(row.id for row in rows)
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return ids, pages
+
+@pytest.mark.parametrize("sort_by", ["deadline", "due", "priority", "created_at"])
+def test_task_keyset_pages_cover_every_task_once(db, project, sort_by):
+    for i in range(23):
+        # Повторы ключа и NULL-дедлайны: порядок держится на id
+        deadline = date.today() + timedelta(days=i % 4) if i % 5 else None
+        create_task(db, {"title": f"t{i}", "project_id": project.id, "priority": 1 + i % 3, "deadline": deadline})
+
+    ids, pages = _all_pages(get_tasks_page, db=db, filters={"project_id": project.id}, sort_by=sort_by, limit=5)
+    core_ids, _ = _all_pages(read_tasks_page, db=db, filters={"project_id": project.id}, sort_by=sort_by, limit=5)
+
+    expected = [t.id for t in db.query(Task).order_by(*TASK_FILTERS.order_by(sort_by))]
+    assert ids == expected
+    assert core_ids == expected
+    assert pages == 5
+
+def test_cursor_from_another_sort_is_rejected(db, project):
+    for i in range(3):
+        create_task(db, {"title": f"t{i}", "project_id": project.id})
+    cursor = get_tasks_page(db, sort_by="priority", limit=1)["next_cursor"]
+    with pytest.raises(TaskValidationError):
+        get_tasks_page(db, sort_by="deadline", limit=1, cursor=cursor)
+
+def test_devlog_feed_pages_newest_first(db, project):
+    start = datetime(2025, 1, 1)
+    db.add_all([
+        DevLogEntry(project_id=project.id, content=f"c{i}", author="bot", created_at=start + timedelta(hours=i // 3))
+        for i in range(17)
+    ])
+    db.commit()
+
+    ids, pages = _all_pages(read_entries_page, db=db, filters={"project_id": project.id}, limit=4)
+    orm_ids, _ = _all_pages(get_entries_page, db=db, filters={"project_id": project.id}, limit=4)
+
+    expected = [e.id for e in db.query(DevLogEntry).order_by(DevLogEntry.created_at.desc(), DevLogEntry.id.desc())]
+    assert ids == orm_ids == expected
+    assert pages == 5
+
+def test_devlog_feed_counts_only_on_request(db, project):
+    db.add_all([DevLogEntry(project_id=project.id, content="c", author="bot") for _ in range(3)])
+    db.commit()
+
+    first = read_entries_page(db, limit=2, count="exact")
+    assert (first["total_count"], first["count"]) == (3, "exact")
+    # Вне Postgres оценка планировщика недоступна — точный подсчёт
+    assert read_entries_page(db, limit=2, count="estimated")["count"] == "exact"
+    assert read_entries_page(db, limit=2)["total_count"] is None
+    assert read_entries_page(db, limit=2, cursor=first["next_cursor"], count="exact")["total_count"] is None
+    with pytest.raises(DevLogValidationError):
+        read_entries_page(db, limit=2, count="sometimes")
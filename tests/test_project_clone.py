@@ -0,0 +1,91 @@
+#tests/test_project_clone.py
+import pytest
+from sqlalchemy import select
+
+from app.models.devlog import DevLogEntry
+from app.models.project import Project
+from app.models.tag import Tag, project_tags, task_tags
+from app.models.task import Task
+from app.models.task_assignee import task_assignees
+from app.models.user import User
+from app.services.project_clone import copy_project
+# Слушатели after_flush, которые ведут связи тегов и исполнителей исходных задач
+import app.services.assignee_index  # noqa: F401
+import app.services.tag_index  # noqa: F401
+
+@pytest.fixture
+def source(db, project):
+    user = User(username="dev", email="dev@example.com", password_hash="x")
+    db.add(user)
+    project.tags = ["alpha"]
+    db.flush()
+    root = Task(title="root", project_id=project.id, status="done", tags=["x"],
+                assignees=[{"user_id": user.id, "role": "owner"}])
+    db.add(root)
+    db.flush()
+    child = Task(title="child", project_id=project.id, status="todo", parent_task_id=root.id)
+    db.add(child)
+    db.flush()
+    db.add_all([
+        Task(title="grandchild", project_id=project.id, status="todo", parent_task_id=child.id),
+        Task(title="archived", project_id=project.id, status="todo", is_deleted=True),
+        DevLogEntry(project_id=project.id, task_id=root.id, entry_type="note", content="on root", author="dev"),
+        DevLogEntry(project_id=project.id, task_id=child.id, entry_type="note", content="on child", author="dev"),
+    ])
+    db.commit()
+    return project, user
+
+def _tasks(db, project_id):
+    return {t.title: t for t in db.query(Task).filter_by(project_id=project_id)}
+
+def _entries(db, project_id):
+    return {e.content: e for e in db.query(DevLogEntry).filter_by(project_id=project_id)}
+
+def test_copy_remaps_ids_and_links(db, source):
+    project, user = source
+    old = _tasks(db, project.id)
+
+    counts = copy_project(db, project.id, "Copy", include_devlog=True)
+    db.commit()
+
+    new = _tasks(db, counts["id"])
+    assert counts["tasks"] == 3 and counts["devlog"] == 2
+    assert set(new) == {"root", "child", "grandchild"}
+    assert not set(t.id for t in new.values()) & set(t.id for t in old.values())
+    assert new["root"].parent_task_id is None
+    assert new["child"].parent_task_id == new["root"].id
+    assert new["grandchild"].parent_task_id == new["child"].id
+
+    entries = _entries(db, counts["id"])
+    assert entries["on root"].task_id == new["root"].id
+    assert entries["on child"].task_id == new["child"].id
+
+    tag_names = db.execute(
+        select(Tag.name).join(task_tags, task_tags.c.tag_id == Tag.id).where(task_tags.c.task_id == new["root"].id)
+    ).scalars().all()
+    assert tag_names == ["x"]
+    assert db.execute(
+        select(Tag.name).join(project_tags, project_tags.c.tag_id == Tag.id)
+        .where(project_tags.c.project_id == counts["id"])
+    ).scalars().all() == ["alpha"]
+    assert db.execute(
+        select(task_assignees.c.user_id, task_assignees.c.role).where(task_assignees.c.task_id == new["root"].id)
+    ).all() == [(user.id, "owner")]
+
+    copy = db.get(Project, counts["id"])
+    assert (copy.tasks_total, copy.tasks_done) == (3, 1)
+
+def test_copy_without_subtasks(db, source):
+    project, _ = source
+
+    counts = copy_project(db, project.id, "Top level only", include_subtasks=False, include_devlog=True)
+    db.commit()
+
+    new = _tasks(db, counts["id"])
+    assert set(new) == {"root"}
+    entries = _entries(db, counts["id"])
+    # Запись о нескопированной подзадаче остаётся записью проекта
+    assert entries["on root"].task_id == new["root"].id
+    assert entries["on child"].task_id is None
+    copy = db.get(Project, counts["id"])
+    assert (copy.tasks_total, copy.tasks_done) == (1, 1)
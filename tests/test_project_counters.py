@@ -0,0 +1,39 @@
+#tests/test_project_counters.py
+from datetime import datetime
+
+from app.crud.task import create_task
+from app.models.project import Project
+from app.services.project_counters import repair_project_counters
+
+STAMP = datetime(2020, 1, 1)
+
+def _stamped(db, project):
+    project.updated_at = STAMP
+    db.commit()
+
+def test_task_changes_keep_project_updated_at(db, project):
+    _stamped(db, project)
+    task = create_task(db, {"title": "A", "project_id": project.id})
+    task.status = "done"
+    db.commit()
+
+    db.refresh(project)
+    assert (project.tasks_total, project.tasks_done) == (1, 1)
+    assert project.updated_at == STAMP
+
+def test_repair_fixes_drift_without_touching_updated_at(db, project):
+    create_task(db, {"title": "A", "project_id": project.id})
+    other = Project(name="Other", tasks_total=5, tasks_done=2)
+    db.add(other)
+    db.commit()
+    for p in (project, other):
+        p.updated_at = STAMP
+    db.commit()
+
+    repair_project_counters(db)
+
+    for p in (project, other):
+        db.refresh(p)
+        assert p.updated_at == STAMP
+    assert (project.tasks_total, project.tasks_done) == (1, 0)
+    assert (other.tasks_total, other.tasks_done) == (0, 0)
@@ -0,0 +1,61 @@
+#tests/test_ranking.py
+import random
+
+from sqlalchemy import func, select
+
+from app.core.lexorank import MAX_RANK_LENGTH, is_valid_rank, rank_between, rank_sequence
+from app.crud.task import bulk_create_tasks, create_task, move_task, update_task
+from app.models.task import Task
+from app.services.task_ranking import COLUMN_ORDER, REBALANCE_LENGTH
+
+def _column(db, project_id, status="todo"):
+    return db.execute(
+        select(Task.title).where(Task.project_id == project_id, Task.status == status).order_by(*COLUMN_ORDER)
+    ).scalars().all()
+
+def test_rank_between_keeps_order_under_random_inserts():
+    rng = random.Random(7)
+    ranks = [rank_between(None, None)]
+    for _ in range(2000):
+        i = rng.randrange(len(ranks) + 1)
+        before = ranks[i - 1] if i > 0 else None
+        after = ranks[i] if i < len(ranks) else None
+        rank = rank_between(before, after)
+        assert is_valid_rank(rank)
+        assert (before is None or before < rank) and (after is None or rank < after)
+        ranks.insert(i, rank)
+    assert ranks == sorted(ranks)
+
+def test_appends_do_not_grow_ranks():
+    rank, lengths = None, []
+    for _ in range(10000):
+        rank = rank_between(rank, None)
+        lengths.append(len(rank))
+    assert max(lengths) <= 6
+    assert rank_sequence(5) == sorted(rank_sequence(5))
+
+def test_thousand_appends_to_one_column(db, project):
+    items = [{"title": f"bulk {i:04d}", "project_id": project.id, "status": "todo"} for i in range(900)]
+    result = bulk_create_tasks(db, items)
+    assert not result["errors"]
+    for i in range(50):
+        create_task(db, {"title": f"single {i:04d}", "project_id": project.id, "status": "todo"})
+    # Смена статуса без места — тоже в конец колонки
+    for i in range(50):
+        task = create_task(db, {"title": f"moved {i:04d}", "project_id": project.id, "status": "doing"})
+        update_task(db, task.id, {"status": "todo"})
+
+    longest = db.execute(select(func.max(func.length(Task.rank)))).scalar()
+    assert longest <= REBALANCE_LENGTH < MAX_RANK_LENGTH
+    expected = [f"bulk {i:04d}" for i in range(900)] + [f"single {i:04d}" for i in range(50)] \
+        + [f"moved {i:04d}" for i in range(50)]
+    assert _column(db, project.id) == expected
+
+def test_move_task_places_card_between_neighbours(db, project):
+    ids = [create_task(db, {"title": t, "project_id": project.id, "status": "todo"}).id for t in "abcd"]
+    move_task(db, ids[3], prev_id=ids[0], next_id=ids[1])
+    assert _column(db, project.id) == ["a", "d", "b", "c"]
+    move_task(db, ids[0])
+    assert _column(db, project.id) == ["d", "b", "c", "a"]
+    move_task(db, ids[2], next_id=ids[3])
+    assert _column(db, project.id) == ["c", "d", "b", "a"]
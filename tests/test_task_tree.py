@@ -0,0 +1,33 @@
+#tests/test_task_tree.py
+from app.crud.task import get_task_tree
+from app.models.task import Task
+
+def _chain(db, project, *titles):
+    tasks, parent = [], None
+    for title in titles:
+        task = Task(title=title, project_id=project.id, status="todo", parent_task_id=parent)
+        db.add(task)
+        db.flush()
+        tasks.append(task)
+        parent = task.id
+    db.commit()
+    return tasks
+
+def _shape(node):
+    return node["title"], [_shape(child) for child in node["subtasks"]]
+
+def test_tree_is_nested_by_depth(db, project):
+    a, b, c = _chain(db, project, "A", "B", "C")
+    db.add(Task(title="B2", project_id=project.id, status="todo", parent_task_id=a.id))
+    db.commit()
+
+    assert _shape(get_task_tree(db, a.id)) == ("A", [("B", [("C", [])]), ("B2", [])])
+    assert _shape(get_task_tree(db, a.id, max_depth=1)) == ("A", [("B", []), ("B2", [])])
+
+def test_parent_cycle_keeps_each_task_once(db, project):
+    a, b, c = _chain(db, project, "A", "B", "C")
+    a.parent_task_id = c.id   # A -> B -> C -> A
+    db.commit()
+
+    assert _shape(get_task_tree(db, a.id)) == ("A", [("B", [("C", [])])])
+    assert _shape(get_task_tree(db, b.id)) == ("B", [("C", [("A", [])])])
@@ -0,0 +1,110 @@
+#tests/test_template_engine.py
+from datetime import datetime
+
+import pytest
+
+from app.models.project import Project
+from app.models.task import Task
+from app.models.template import Template
+from app.services.template_engine import (
+    TemplateStructureError, capture_structure, compile_structure, compiled_template, forget_template, instantiate,
+)
+
+STRUCTURE = {
+    "default_tasks": [
+        {"title": "Design", "priority": 2, "tags": ["ux"], "deadline_in_days": 7, "subtasks": [
+            {"title": "Wireframes", "subtasks": [{"title": "Mobile"}, {"title": "Desktop"}]},
+            {"title": "Review", "status": "done"},
+        ]},
+        {"title": "Release"},
+    ],
+}
+
+def _tree(tasks):
+    """(title, поддерево) по default_tasks/subtasks — без служебных полей."""
+    return [(task["title"], _tree(task.get("subtasks") or [])) for task in tasks]
+
+def _db_tree(db, project_id, parent_id=None):
+    tasks = db.query(Task).filter_by(project_id=project_id, parent_task_id=parent_id).order_by(Task.id)
+    return [(task.title, _db_tree(db, project_id, task.id)) for task in tasks]
+
+@pytest.mark.parametrize("structure, message", [
+    ({"default_tasks": [{"title": "A"}, {"subtasks": [{"title": ""}]}]}, "default_tasks[1].title is required."),
+    (
+        {"default_tasks": [{"title": "A"}, {"title": "B", "subtasks": [{"title": " "}]}]},
+        "default_tasks[1].subtasks[0].title is required.",
+    ),
+    (
+        {"default_tasks": [{"title": "A", "subtasks": [{"title": "B", "priority": 9}]}]},
+        "default_tasks[0].subtasks[0].priority must be an integer between 1 and 5.",
+    ),
+    (
+        {"default_tasks": [{"title": "A", "subtasks": [{"title": "A"}]}]},
+        "default_tasks[0].subtasks[0].title 'A' is used twice",
+    ),
+    ({"default_tasks": [{"title": "A", "tags": "x"}]}, "default_tasks[0].tags must be a list of strings."),
+    ({"plugins": [{"config": {}}]}, "plugins[0] must be a plugin name or an object with a name."),
+])
+def test_compile_reports_path_of_invalid_value(structure, message):
+    with pytest.raises(TemplateStructureError) as error:
+        compile_structure(1, datetime(2025, 1, 1), structure)
+    assert str(error.value).startswith(message)
+
+def test_compile_splits_tree_into_levels():
+    compiled = compile_structure(1, datetime(2025, 1, 1), STRUCTURE)
+
+    assert [[task.values["title"] for task in level] for level in compiled.levels] == [
+        ["Design", "Release"], ["Wireframes", "Review"], ["Mobile", "Desktop"],
+    ]
+    keys = {task.values["title"]: task.key for level in compiled.levels for task in level}
+    parents = {task.values["title"]: task.parent for level in compiled.levels for task in level}
+    assert parents["Wireframes"] == parents["Review"] == keys["Design"]
+    assert parents["Mobile"] == parents["Desktop"] == keys["Wireframes"]
+    assert compiled.levels[0][0].values["priority"] == 2
+
+@pytest.fixture
+def template(db):
+    template = Template(name="Product", structure=STRUCTURE, updated_at=datetime(2025, 1, 1))
+    db.add(template)
+    db.commit()
+    yield template
+    forget_template(template.id)
+
+def test_compiled_template_is_rebuilt_when_updated_at_changes(db, template):
+    first = compiled_template(db, template.id, template.updated_at)
+    assert compiled_template(db, template.id, template.updated_at) is first
+    template.structure = {"default_tasks": [{"title": "Only"}]}
+    template.updated_at = datetime(2025, 2, 1)
+    db.commit()
+
+    second = compiled_template(db, template.id, template.updated_at)
+    assert first.task_count == 6
+    assert second is not first and second.task_count == 1
+    assert compiled_template(db, template.id, template.updated_at) is second
+
+def test_instantiate_wires_parents_level_by_level(db, template):
+    compiled = compiled_template(db, template.id, template.updated_at)
+
+    result = instantiate(db, compiled, {"name": "From template"})
+    db.commit()
+
+    assert result["tasks"] == 6
+    assert _db_tree(db, result["project_id"]) == _tree(STRUCTURE["default_tasks"])
+    project = db.get(Project, result["project_id"])
+    assert (project.tasks_total, project.tasks_done) == (6, 1)
+
+def test_capture_and_instantiate_round_trip(db, template):
+    source = instantiate(db, compiled_template(db, template.id, template.updated_at), {"name": "Source"})
+    db.commit()
+
+    structure = capture_structure(db, source["project_id"])
+    assert _tree(structure["default_tasks"]) == _tree(STRUCTURE["default_tasks"])
+    design = structure["default_tasks"][0]
+    assert (design["priority"], design["tags"], design["deadline_in_days"]) == (2, ["ux"], 7)
+
+    copy = instantiate(db, compile_structure(0, datetime.utcnow(), structure), {"name": "Copy"})
+    db.commit()
+    assert _db_tree(db, copy["project_id"]) == _db_tree(db, source["project_id"])
+    assert [t.status for t in db.query(Task).filter_by(project_id=copy["project_id"]).order_by(Task.id)] == [
+        t.status for t in db.query(Task).filter_by(project_id=source["project_id"]).order_by(Task.id)
+    ]
@@ -0,0 +1,22 @@
+#tests/test_upsert.py
+from datetime import date, timedelta
+
+from app.crud.task import upsert_tasks
+from app.models.task import Task
+
+def test_existing_task_with_past_deadline_is_updated(db, project):
+    past = date.today() - timedelta(days=30)
+    db.add(Task(title="Synced", project_id=project.id, status="todo", deadline=past, external_id="jira-1"))
+    db.commit()
+
+    result = upsert_tasks(db, [
+        {"external_id": "jira-1", "title": "Synced", "project_id": project.id, "deadline": past, "priority": 1},
+        {"external_id": "jira-2", "title": "New", "project_id": project.id, "deadline": past},
+    ])
+
+    # Обновление существующей задачи проходит, новая с прошедшим дедлайном отклоняется
+    assert [e["index"] for e in result["errors"]] == [1]
+    assert result["updated"] == 1
+    db.expire_all()
+    assert db.query(Task).filter_by(external_id="jira-1").one().priority == 1
+    assert db.query(Task).filter_by(external_id="jira-2").count() == 0